@@ -6,6 +6,7 @@ __version__ = "0.1.0"
 __author__ = "Osvaldo Cobacho Aguilera"
 __email__ = "sisocobacho@gmail.com"
 
-from .main import cli
+from .main import Config, TraversalBudget, cli
+from .scanner import ProjectScanner
 
-__all__ = ["cli", "__version__"]
+__all__ = ["cli", "Config", "ProjectScanner", "TraversalBudget", "__version__"]
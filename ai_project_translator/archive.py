@@ -0,0 +1,214 @@
+"""
+Read projects straight from zip and tar archives without extracting them.
+
+The tree is built from the archive's member index and file contents are
+streamed from the members. For zip files the sizes come from the central
+directory, so oversized members are skipped without being decompressed.
+"""
+
+import os
+import tarfile
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from ai_project_translator.notebook import MAX_NOTEBOOK_SIZE, is_notebook, read_notebook
+from ai_project_translator.tree import is_path_excluded, render_path_tree
+
+ZIP_SUFFIXES = (".zip",)
+TAR_SUFFIXES = (
+    ".tar",
+    ".tar.gz",
+    ".tgz",
+    ".tar.bz2",
+    ".tbz2",
+    ".tar.xz",
+    ".txz",
+)
+
+
+class ArchiveError(Exception):
+    """Raised when an archive cannot be read."""
+
+
+@contextmanager
+def _reading_archive() -> Iterator[None]:
+    # A file named like an archive may not be one, or be truncated
+    try:
+        yield
+    except (zipfile.BadZipFile, tarfile.TarError, OSError) as e:
+        raise ArchiveError(str(e)) from e
+
+
+def is_archive(path: Path) -> bool:
+    """
+    Check whether a path is a supported archive file
+    """
+    name = path.name.lower()
+    return path.is_file() and name.endswith(ZIP_SUFFIXES + TAR_SUFFIXES)
+
+
+def archive_root_name(path: Path) -> str:
+    """
+    Name of the archive without its archive suffix
+    """
+    name = path.name
+    for suffix in TAR_SUFFIXES + ZIP_SUFFIXES:
+        if name.lower().endswith(suffix):
+            return name[: -len(suffix)]
+    return name
+
+
+def _normalize(name: str) -> str:
+    while name.startswith("./"):
+        name = name[2:]
+    return name.strip("/")
+
+
+def _iter_members(path: Path) -> Iterator[tuple[str, bool]]:
+    """
+    Yield (name, is_dir) for the directories and regular files in the archive
+
+    Raises ArchiveError if the archive cannot be read.
+    """
+    with _reading_archive():
+        if path.name.lower().endswith(ZIP_SUFFIXES):
+            with zipfile.ZipFile(path) as zf:
+                for info in zf.infolist():
+                    yield _normalize(info.filename), info.is_dir()
+        else:
+            with tarfile.open(path, "r:*") as tf:
+                for member in tf:
+                    if member.isdir() or member.isfile():
+                        yield _normalize(member.name), member.isdir()
+
+
+def get_archive_structure(
+    path: Path,
+    exclude_dirs: set[str],
+    exclude_files: set[str],
+    max_depth: int,
+    style: str = "full",
+) -> list[str]:
+    """
+    Generate a tree-like structure from the archive's member index
+    """
+    files = []
+    directories = []
+    for name, is_dir in _iter_members(path):
+        if not name or is_path_excluded(name, exclude_dirs, exclude_files):
+            continue
+        (directories if is_dir else files).append(name)
+    return render_path_tree(
+        archive_root_name(path),
+        files,
+        max_depth,
+        directories=directories,
+        style=style,
+    )
+
+
+def _file_info(
+    path: Path,
+    name: str,
+    size: int,
+    extension_map: dict[str, str],
+    content: Optional[str],
+    error: Optional[str],
+) -> dict:
+    return {
+        "path": name,
+        "full_path": path / name,
+        "language": extension_map.get(os.path.splitext(name)[1].lower(), "text"),
+        "content": content,
+        "error": error,
+        "size": size,
+    }
+
+
+def get_archive_files_with_content(
+    path: Path,
+    extensions: set[str],
+    max_file_size: int,
+    exclude_dirs: set[str],
+    exclude_files: set[str],
+    extension_map: dict[str, str],
+    notebook_outputs: int = 0,
+) -> list[dict]:
+    """
+    Find all code files in the archive and read their content
+
+    Raises ArchiveError if the archive cannot be read; members that cannot
+    be read get an error instead.
+    """
+    suffixes = tuple(extensions)
+
+    def selected(name: str) -> bool:
+        return (
+            bool(name)
+            and name.endswith(suffixes)
+            and not is_path_excluded(name, exclude_dirs, exclude_files)
+        )
+
+    code_files = []
+    with _reading_archive():
+        if path.name.lower().endswith(ZIP_SUFFIXES):
+            with zipfile.ZipFile(path) as zf:
+                for info in zf.infolist():
+                    name = _normalize(info.filename)
+                    if info.is_dir() or not selected(name):
+                        continue
+                    content = error = None
+                    notebook = is_notebook(name) and info.file_size <= MAX_NOTEBOOK_SIZE
+                    if info.file_size > max_file_size and not notebook:
+                        error = (
+                            f"File too large ({info.file_size} bytes), skipping content"
+                        )
+                    else:
+                        try:
+                            data = zf.read(info)
+                            if notebook:
+                                content, error = read_notebook(
+                                    data, max_file_size, notebook_outputs
+                                )
+                            else:
+                                content = data.decode("utf-8", errors="ignore")
+                        except Exception as e:
+                            error = f"Error reading file: {str(e)}"
+                    code_files.append(
+                        _file_info(
+                            path, name, info.file_size, extension_map, content, error
+                        )
+                    )
+        else:
+            # Iterate in archive order so compressed tars are decompressed once
+            with tarfile.open(path, "r:*") as tf:
+                for member in tf:
+                    name = _normalize(member.name)
+                    if not member.isfile() or not selected(name):
+                        continue
+                    content = error = None
+                    notebook = is_notebook(name) and member.size <= MAX_NOTEBOOK_SIZE
+                    if member.size > max_file_size and not notebook:
+                        error = (
+                            f"File too large ({member.size} bytes), skipping content"
+                        )
+                    else:
+                        try:
+                            data = tf.extractfile(member).read()
+                            if notebook:
+                                content, error = read_notebook(
+                                    data, max_file_size, notebook_outputs
+                                )
+                            else:
+                                content = data.decode("utf-8", errors="ignore")
+                        except Exception as e:
+                            error = f"Error reading file: {str(e)}"
+                    code_files.append(
+                        _file_info(
+                            path, name, member.size, extension_map, content, error
+                        )
+                    )
+
+    return sorted(code_files, key=lambda x: x["path"])
@@ -0,0 +1,258 @@
+"""
+asyncio read pipeline for high-latency filesystems (NFS, sshfs, ...).
+
+Directory listing and stat calls share one concurrency limit and file reads
+another. The blocking calls run in a thread pool of their own, sized so that
+both limits can be in flight at once. The walk hands candidate files to the
+readers through a bounded queue, so the walk cannot run arbitrarily far ahead
+of the reads. The queue only bounds the paths waiting to be read: the
+returned list holds the content of every file.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from ai_project_translator.notebook import MAX_NOTEBOOK_SIZE, is_notebook, read_notebook
+from ai_project_translator.records import SAME_FILE_ERROR, TOTAL_SIZE_LIMIT_ERROR
+
+META_CONCURRENCY = 64
+READ_CONCURRENCY = 16
+QUEUE_SIZE = 256
+
+
+def _read_text(file_path: Path) -> str:
+    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+        return f.read()
+
+
+# (name, is_dir) pairs of the entries to visit, and the number of entries the
+# sync walk counts against summarize_dirs
+Listing = tuple[list[tuple[str, bool]], int]
+
+
+def _list_dir(path: str) -> Listing:
+    """List a directory, treating directory symlinks like os.walk."""
+    entries = []
+    count = 0
+    with os.scandir(path) as it:
+        for entry in it:
+            count += 1
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir and entry.is_symlink():
+                # os.walk lists these as directories but does not descend
+                continue
+            entries.append((entry.name, is_dir))
+    return entries, count
+
+
+def _list_tracked(tracked, path: str, relative: str) -> Listing:
+    """List the tracked entries of a directory."""
+    dirs, files = tracked.listdir(relative)
+    entries = [(name, True) for name in dirs]
+    for name in files:
+        # A tracked symlink may point to a directory, left out like in the
+        # sync walk
+        if os.path.isdir(os.path.join(path, name)):
+            continue
+        entries.append((name, False))
+    return entries, len(dirs) + len(files)
+
+
+async def read_project(
+    startpath: Path,
+    extensions: set[str],
+    max_file_size: int,
+    exclude_dirs: set[str],
+    exclude_files: set[str],
+    extension_map: dict[str, str],
+    meta_concurrency: int = META_CONCURRENCY,
+    read_concurrency: int = READ_CONCURRENCY,
+    queue_size: int = QUEUE_SIZE,
+    notebook_outputs: int = 0,
+    budget=None,
+    tracked=None,
+    summarize_dirs: Optional[int] = None,
+) -> list[dict]:
+    """
+    Walk, stat and read the code files of a project concurrently
+
+    The subdirectories of a directory are listed at once, but they are
+    entered and their files handed to the readers in path order, like the
+    sync walk does. A budget (a main.TraversalBudget) therefore takes the
+    same files: directories below its max_depth are not entered, the walk
+    stops at its file limit, and files past its byte limit are returned
+    with metadata only. With tracked (a git_index.TrackedFiles), only the
+    files git lists are visited. Subdirectories with more than
+    summarize_dirs entries are skipped and added to the budget's
+    summarized_dirs, like in the sync walk. A file reached again through a
+    hardlink or symlink gets a "Same file as" error and is not read.
+    """
+    loop = asyncio.get_running_loop()
+    # The default executor has min(32, CPUs + 4) threads, too few for the limits
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, meta_concurrency) + max(1, read_concurrency),
+        thread_name_prefix="ai-pt-async",
+    )
+
+    def run(func, *args):
+        return loop.run_in_executor(executor, func, *args)
+
+    meta_limit = asyncio.Semaphore(meta_concurrency)
+    # (position in path order, path) of the files to read
+    queue: asyncio.Queue[Optional[tuple[int, Path]]] = asyncio.Queue(maxsize=queue_size)
+    suffixes = tuple(extensions)
+    code_files = []
+    queued = 0
+    stopped = False
+    # Position of the next file to claim
+    turn = 0
+    turn_changed = asyncio.Condition()
+    # (st_dev, st_ino) of the files claimed so far, with their first path
+    seen_files = {}
+
+    async def list_dir(path: Path, relative: str) -> Listing:
+        try:
+            async with meta_limit:
+                if tracked is not None:
+                    return await run(_list_tracked, tracked, str(path), relative)
+                return await run(_list_dir, str(path))
+        except OSError:
+            return [], 0
+
+    async def walk(path: Path, relative: str, listing, depth: int) -> None:
+        nonlocal queued, stopped
+        entries, count = await listing
+        if summarize_dirs and depth and count > summarize_dirs:
+            if budget:
+                budget.summarized_dirs.append(relative)
+            return
+        dirs = sorted(
+            name for name, is_dir in entries if is_dir and name not in exclude_dirs
+        )
+        if budget and not budget.allows_depth(depth + 1):
+            budget.pruned_dirs.extend(os.path.join(relative, d) for d in dirs)
+            dirs = []
+
+        # Subdirectories sort as "name/", like in the sync walk
+        ordered = [(d + os.sep, d, True) for d in dirs]
+        ordered.extend(
+            (name, name, False)
+            for name, is_dir in entries
+            if not is_dir and name not in exclude_files and name.endswith(suffixes)
+        )
+        ordered.sort()
+        listings = {
+            d: asyncio.ensure_future(
+                list_dir(path / d, os.path.join(relative, d) if relative else d)
+            )
+            for d in dirs
+        }
+        try:
+            for _, name, is_dir in ordered:
+                relative_path = os.path.join(relative, name) if relative else name
+                if is_dir:
+                    await walk(
+                        path / name, relative_path, listings.pop(name), depth + 1
+                    )
+                    if stopped:
+                        return
+                elif budget and not budget.take_file(relative_path):
+                    stopped = True
+                    return
+                else:
+                    await queue.put((queued, path / name))
+                    queued += 1
+        finally:
+            for pending in listings.values():
+                pending.cancel()
+
+    async def read_worker() -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            code_files.append(await read_one(*item))
+
+    async def claim(
+        position: int, relative_path: str, size: int, key: Optional[tuple]
+    ) -> Optional[str]:
+        # In path order, whatever order the stat calls finish in, so the
+        # first path of a file and the files past the byte limit are the
+        # ones of the sync walk. Returns the error of a file not to read.
+        nonlocal turn
+        async with turn_changed:
+            await turn_changed.wait_for(lambda: turn == position)
+            turn += 1
+            turn_changed.notify_all()
+            first_path = seen_files.setdefault(key, relative_path) if key else None
+            if first_path is not None and first_path != relative_path:
+                return SAME_FILE_ERROR.format(first_path)
+            # Files over max_file_size are not read, so they do not count
+            if (
+                budget
+                and size <= max_file_size
+                and not budget.take_bytes(relative_path, size)
+            ):
+                return TOTAL_SIZE_LIMIT_ERROR
+            return None
+
+    async def read_one(position: int, file_path: Path) -> dict:
+        relative_path = os.path.relpath(file_path, startpath)
+        content = None
+        error = None
+        size = 0
+        key = None
+        try:
+            async with meta_limit:
+                stat = await run(os.stat, file_path)
+            size = stat.st_size
+            key = (stat.st_dev, stat.st_ino) if stat.st_ino else None
+        except Exception as e:
+            error = f"Error reading file: {str(e)}"
+        # Every file takes its turn, even one that is not read
+        claimed_error = await claim(position, relative_path, size, key)
+        if error is None:
+            error = claimed_error
+        if error is None:
+            try:
+                if is_notebook(file_path.name) and size <= MAX_NOTEBOOK_SIZE:
+                    data = await run(file_path.read_bytes)
+                    content, error = read_notebook(
+                        data, max_file_size, notebook_outputs
+                    )
+                elif size > max_file_size:
+                    error = f"File too large ({size} bytes), skipping content"
+                else:
+                    content = await run(_read_text, file_path)
+            except Exception as e:
+                error = f"Error reading file: {str(e)}"
+
+        return {
+            "path": relative_path,
+            "full_path": file_path,
+            "language": extension_map.get(file_path.suffix.lower(), "text"),
+            "content": content,
+            "error": error,
+            "size": size,
+        }
+
+    workers = [
+        asyncio.create_task(read_worker()) for _ in range(max(1, read_concurrency))
+    ]
+    try:
+        await walk(Path(startpath), "", list_dir(Path(startpath), ""), 0)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for worker in workers:
+            worker.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return sorted(code_files, key=lambda x: x["path"])
@@ -0,0 +1,260 @@
+"""
+Local dependency closure of a file, following Python and JS/TS imports.
+
+Imports are parsed level by level from the starting file, in a process pool
+when a level has many files to parse. Parse results depend only on a file's
+content, so they are cached by content hash across runs and a file is only
+parsed again when it changes. Only imports that resolve to files on disk are
+followed: Python modules under the file's package root and relative
+JavaScript/TypeScript imports and requires.
+"""
+
+import ast
+import hashlib
+import os
+import pickle
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+
+from ai_project_translator.project_config import cache_dir
+
+DEPS_DEPTH = 3
+
+# Below this many files to parse in one level a pool is not worth starting
+MIN_PARALLEL_FILES = 64
+
+CACHE_FILE = "imports.pickle"
+CACHE_VERSION = 1
+MAX_CACHE_ENTRIES = 200_000
+
+PYTHON_EXTENSIONS = (".py",)
+JS_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+
+_JS_IMPORT_RE = re.compile(
+    r"""(?:\bimport\s+(?:[\w*{}\s,$]+?\s+from\s+)?"""
+    r"""|\bexport\s+[\w*{}\s,$]+?\s+from\s+"""
+    r"""|\b(?:require|import)\s*\(\s*)"""
+    r"""(['"])(\.{1,2}/[^'"\n]*)\1"""
+)
+
+# An import: (relative level, module or specifier, imported names)
+Import = tuple[int, str, tuple[str, ...]]
+
+
+def file_kind(path: Path) -> Optional[str]:
+    suffix = path.suffix.lower()
+    if suffix in PYTHON_EXTENSIONS:
+        return "python"
+    if suffix in JS_EXTENSIONS:
+        return "javascript"
+    return None
+
+
+def parse_imports(content: str, kind: str) -> list[Import]:
+    """
+    Extract the imports of a Python or JavaScript/TypeScript source
+    """
+    if kind == "javascript":
+        return [(0, match.group(2), ()) for match in _JS_IMPORT_RE.finditer(content)]
+
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return []
+    imports: list[Import] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.extend((0, alias.name, ()) for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            names = tuple(alias.name for alias in node.names if alias.name != "*")
+            imports.append((node.level, node.module or "", names))
+    return imports
+
+
+def _parse_batch(batch: list[tuple[str, str]]) -> list[list[Import]]:
+    return [parse_imports(content, kind) for content, kind in batch]
+
+
+@lru_cache(maxsize=None)
+def python_root(directory: Path) -> Path:
+    """
+    Return the directory that contains the top-level package of directory
+    """
+    while (directory / "__init__.py").is_file() and directory.parent != directory:
+        directory = directory.parent
+    return directory
+
+
+def _module_files(base: Path, parts: list[str]) -> list[Path]:
+    target = base.joinpath(*parts)
+    if not parts:
+        return [target / "__init__.py"]
+    return [target.with_name(target.name + ".py"), target / "__init__.py"]
+
+
+def resolve_import(path: Path, item: Import) -> list[Path]:
+    """
+    Return the existing local files an import of the file at path refers to
+    """
+    level, module, names = item
+    if file_kind(path) == "javascript":
+        base = path.parent / module
+        candidates = [base]
+        candidates.extend(base.with_name(base.name + ext) for ext in JS_EXTENSIONS)
+        candidates.extend(base / f"index{ext}" for ext in JS_EXTENSIONS)
+        for candidate in candidates:
+            if candidate.is_file():
+                return [Path(os.path.normpath(candidate))]
+        return []
+
+    if level:
+        base = path.parent
+        for _ in range(level - 1):
+            base = base.parent
+    else:
+        base = python_root(path.parent)
+    parts = module.split(".") if module else []
+    candidates = _module_files(base, parts)
+    # "from package import module" imports submodules
+    for name in names:
+        candidates.extend(_module_files(base, parts + [name]))
+    return [candidate for candidate in candidates if candidate.is_file()]
+
+
+class ImportCache:
+    """
+    Parsed imports keyed by file kind and content SHA-256, kept on disk.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self.entries: dict[str, list[Import]] = {}
+        self.changed = False
+        if path is None:
+            return
+        try:
+            with open(path, "rb") as f:
+                version, entries = pickle.load(f)
+            if version == CACHE_VERSION:
+                self.entries = entries
+        except Exception:
+            # A missing or unreadable cache is rebuilt
+            self.entries = {}
+
+    def get(self, digest: str) -> Optional[list[Import]]:
+        return self.entries.get(digest)
+
+    def put(self, digest: str, imports: list[Import]) -> None:
+        self.entries[digest] = imports
+        self.changed = True
+
+    def save(self) -> None:
+        if self.path is None or not self.changed:
+            return
+        # Drop the oldest entries once the cache is full
+        excess = len(self.entries) - MAX_CACHE_ENTRIES
+        if excess > 0:
+            for digest in list(self.entries)[:excess]:
+                del self.entries[digest]
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.path.with_suffix(f".{os.getpid()}.tmp")
+            with open(temporary, "wb") as f:
+                pickle.dump((CACHE_VERSION, self.entries), f)
+            os.replace(temporary, self.path)
+        except OSError:
+            pass
+
+
+def _read_imports(
+    paths: list[Path], cache: ImportCache, workers: Optional[int]
+) -> list[list[Import]]:
+    """
+    Return the imports of each file, parsing only files not in the cache
+    """
+    results: list[Optional[list[Import]]] = []
+    pending = []
+    for i, path in enumerate(paths):
+        try:
+            data = path.read_bytes()
+        except OSError:
+            results.append([])
+            continue
+        kind = file_kind(path)
+        digest = f"{kind}:{hashlib.sha256(data).hexdigest()}"
+        imports = cache.get(digest)
+        if imports is None:
+            content = data.decode("utf-8", errors="ignore")
+            pending.append((i, digest, content, kind))
+        results.append(imports)
+
+    if pending:
+        items = [(content, kind) for _, _, content, kind in pending]
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1 or len(items) < MIN_PARALLEL_FILES:
+            parsed = _parse_batch(items)
+        else:
+            size = -(-len(items) // workers)
+            batches = [items[i : i + size] for i in range(0, len(items), size)]
+            with ProcessPoolExecutor(max_workers=len(batches)) as executor:
+                parsed = [
+                    imports
+                    for batch in executor.map(_parse_batch, batches)
+                    for imports in batch
+                ]
+        for (i, digest, _, _), imports in zip(pending, parsed):
+            cache.put(digest, imports)
+            results[i] = imports
+    return [imports or [] for imports in results]
+
+
+def _is_excluded(start: Path, dependency: Path, exclude_dirs: set[str]) -> bool:
+    # Only directories below the ones shared with the starting file count
+    common = os.path.commonpath([start.parent, dependency.parent])
+    relative = os.path.relpath(dependency.parent, common)
+    return any(part in exclude_dirs for part in Path(relative).parts)
+
+
+def dependency_closure(
+    path: Path,
+    max_depth: int = DEPS_DEPTH,
+    exclude_dirs: Iterable[str] = (),
+    workers: Optional[int] = None,
+    use_cache: bool = True,
+) -> list[Path]:
+    """
+    Return the file and the local files it imports, up to max_depth levels
+
+    Files are in breadth-first order, sorted within each level.
+    """
+    exclude_dirs = set(exclude_dirs)
+    start = Path(os.path.normpath(path.resolve()))
+    cache = ImportCache(cache_dir() / CACHE_FILE if use_cache else None)
+    seen = {start}
+    closure = [start]
+    frontier = [start] if file_kind(start) else []
+
+    for _ in range(max_depth):
+        if not frontier:
+            break
+        found = set()
+        for file_path, imports in zip(
+            frontier, _read_imports(frontier, cache, workers)
+        ):
+            for item in imports:
+                for dependency in resolve_import(file_path, item):
+                    if dependency in seen or _is_excluded(
+                        start, dependency, exclude_dirs
+                    ):
+                        continue
+                    seen.add(dependency)
+                    found.add(dependency)
+        frontier = sorted(found)
+        closure.extend(frontier)
+
+    cache.save()
+    return closure
@@ -0,0 +1,124 @@
+"""
+Machine-readable streaming output formats.
+
+Each writer emits a record as soon as it is given one, so a project can be
+written with constant memory. Content is escaped in a single pass: by the
+C JSON encoder for JSON Lines and by str.translate for XML.
+"""
+
+import json
+from typing import TextIO
+
+# Characters that are not allowed anywhere in an XML 1.0 document
+_XML_INVALID = {c: None for c in range(0x20) if c not in (0x09, 0x0A, 0x0D)}
+_XML_INVALID.update({0xFFFE: None, 0xFFFF: None})
+
+_XML_TEXT = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", **_XML_INVALID})
+_XML_ATTRIBUTE = str.maketrans(
+    {
+        "&": "&amp;",
+        "<": "&lt;",
+        ">": "&gt;",
+        '"': "&quot;",
+        "\n": "&#10;",
+        "\r": "&#13;",
+        "\t": "&#9;",
+        **_XML_INVALID,
+    }
+)
+
+
+def _file_fields(file_info: dict) -> dict:
+    fields = {
+        "path": file_info["path"],
+        "language": file_info["language"],
+        "size": file_info["size"],
+    }
+    for key in ("sha256", "tokens"):
+        if file_info.get(key) is not None:
+            fields[key] = file_info[key]
+    return fields
+
+
+class JsonLinesWriter:
+    """
+    Write one JSON object per line: question, structure and file records.
+    """
+
+    def __init__(self, stream: TextIO, name: str):
+        self.stream = stream
+        self.name = name
+
+    def _write(self, record: dict) -> None:
+        self.stream.write(json.dumps(record, ensure_ascii=False))
+        self.stream.write("\n")
+
+    def question(self, text: str) -> None:
+        self._write({"type": "question", "text": text})
+
+    def framework(self, name: str) -> None:
+        self._write({"type": "framework", "name": name})
+
+    def structure(self, lines: list[str]) -> None:
+        self._write({"type": "structure", "root": self.name, "tree": lines})
+
+    def file(self, file_info: dict) -> None:
+        record = {"type": "file", **_file_fields(file_info)}
+        if file_info["error"]:
+            record["error"] = file_info["error"]
+        else:
+            record["content"] = file_info["content"]
+        self._write(record)
+
+    def note(self, text: str) -> None:
+        self._write({"type": "note", "text": text})
+
+    def close(self) -> None:
+        self.stream.flush()
+
+
+class XmlWriter:
+    """
+    Write a <project> document with one <file> element per file.
+    """
+
+    def __init__(self, stream: TextIO, name: str):
+        self.stream = stream
+        self.stream.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        self.stream.write(f'<project name="{name.translate(_XML_ATTRIBUTE)}">\n')
+
+    def _element(self, tag: str, text: str) -> None:
+        self.stream.write(f"<{tag}>")
+        self.stream.write(text.translate(_XML_TEXT))
+        self.stream.write(f"</{tag}>\n")
+
+    def question(self, text: str) -> None:
+        self._element("question", text)
+
+    def framework(self, name: str) -> None:
+        self._element("framework", name)
+
+    def structure(self, lines: list[str]) -> None:
+        self._element("structure", "\n".join(lines))
+
+    def file(self, file_info: dict) -> None:
+        attributes = " ".join(
+            f'{key}="{str(value).translate(_XML_ATTRIBUTE)}"'
+            for key, value in _file_fields(file_info).items()
+        )
+        self.stream.write(f"<file {attributes}>")
+        if file_info["error"]:
+            self._element("error", file_info["error"])
+        elif file_info["content"] is not None:
+            self._element("content", file_info["content"])
+        self.stream.write("</file>\n")
+
+    def note(self, text: str) -> None:
+        self._element("note", text)
+
+    def close(self) -> None:
+        self.stream.write("</project>\n")
+        self.stream.flush()
+
+
+WRITERS = {"jsonl": JsonLinesWriter, "xml": XmlWriter}
@@ -0,0 +1,156 @@
+"""
+Recognize lockfiles, generated code and minified files, and summarize them.
+
+These files pass the extension and size checks but are of no use as context.
+They are recognized from their names, from a marker in their first lines or
+from the length of the lines in their first block. They stay in the tree, and
+their content is replaced by a note with their kind and number of lines.
+Files recognized by their name are not read at all: their lines are counted
+in chunks, and files above the size limit are left as too large.
+"""
+
+import os
+from typing import Optional
+
+from ai_project_translator.records import FileRecord
+from ai_project_translator.sink import FileBody
+
+LOCKFILE_NAMES = frozenset(
+    {
+        "uv.lock",
+        "poetry.lock",
+        "Pipfile.lock",
+        "pdm.lock",
+        "package-lock.json",
+        "npm-shrinkwrap.json",
+        "yarn.lock",
+        "pnpm-lock.yaml",
+        "bun.lock",
+        "Cargo.lock",
+        "composer.lock",
+        "Gemfile.lock",
+        "go.sum",
+        "flake.lock",
+        "packages.lock.json",
+    }
+)
+GENERATED_SUFFIXES = (
+    "_pb2.py",
+    "_pb2.pyi",
+    "_pb2_grpc.py",
+    ".pb.go",
+    ".pb.h",
+    ".pb.cc",
+    "_pb.js",
+    "_pb.d.ts",
+    ".g.dart",
+    ".freezed.dart",
+    ".designer.cs",
+    ".generated.ts",
+)
+MINIFIED_SUFFIXES = (".min.js", ".min.mjs", ".min.css", ".bundle.js")
+# Lowercase markers that code generators put in the first lines of a file
+GENERATED_MARKERS = (
+    b"@generated",
+    b"do not edit",
+    b"code generated by",
+    b"auto-generated",
+    b"autogenerated",
+    b"generated by the protocol buffer compiler",
+)
+
+HEAD_SIZE = 8192
+MARKER_LINES = 5
+# Hand-written code and prose stay well under these; minified code and data
+# dumps are one long line
+MAX_AVERAGE_LINE = 500
+MAX_LINE = HEAD_SIZE // 2
+
+COUNT_CHUNK_SIZE = 64 * 1024
+
+
+def classify(name: str, head: bytes) -> Optional[str]:
+    """
+    Return "lockfile", "generated" or "minified" for a file name and the
+    start of the file, or None for other files
+    """
+    if name in LOCKFILE_NAMES:
+        return "lockfile"
+    lowered = name.lower()
+    if lowered.endswith(MINIFIED_SUFFIXES):
+        return "minified"
+    if lowered.endswith(GENERATED_SUFFIXES):
+        return "generated"
+
+    head = head[:HEAD_SIZE]
+    top = b"\n".join(head.split(b"\n", MARKER_LINES)[:MARKER_LINES]).lower()
+    if any(marker in top for marker in GENERATED_MARKERS):
+        return "generated"
+    lines = head.split(b"\n")
+    full_block = len(head) == HEAD_SIZE
+    # The last line of a full block may be cut, but counts if it is the only one
+    longest = max(map(len, lines[:-1] if full_block and len(lines) > 1 else lines))
+    if longest > MAX_LINE or (full_block and HEAD_SIZE / len(lines) > MAX_AVERAGE_LINE):
+        return "minified"
+    return None
+
+
+def count_lines(path: str) -> int:
+    """
+    Count the lines of a file in chunks, a last line without newline included
+    """
+    lines = 0
+    last = b"\n"
+    with open(path, "rb") as f:
+        while chunk := f.read(COUNT_CHUNK_SIZE):
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    return lines + (last != b"\n")
+
+
+def summary_note(kind: str, lines: int) -> str:
+    return f"{kind.capitalize()}, {lines:,} line{'' if lines == 1 else 's'}, skipping content"
+
+
+def summarize_file(file_info: dict, max_size: Optional[int] = None) -> Optional[str]:
+    """
+    Replace the content of a lockfile, generated or minified file by a note
+
+    Returns the note, or None when the file is kept. Files recognized by
+    their name are not read if they were not read yet; above max_size they
+    are not counted either, and are left to the reader as too large.
+    """
+    name = os.path.basename(file_info["path"])
+    try:
+        if (
+            isinstance(file_info, FileRecord)
+            and not file_info.loaded
+            and (max_size is None or file_info.size <= max_size)
+        ):
+            kind = classify(name, b"")
+            if kind is not None:
+                lines = count_lines(os.fspath(file_info.full_path))
+                note = summary_note(kind, lines)
+                file_info.set_result(None, note)
+                return note
+
+        content = file_info["content"]
+        if file_info["error"] or content is None:
+            return None
+        if isinstance(content, FileBody):
+            with open(content.path, "rb") as f:
+                kind = classify(name, f.read(HEAD_SIZE))
+            lines = count_lines(os.fspath(content.path)) if kind else 0
+        else:
+            # The first block of the text read anyway
+            kind = classify(name, content[:HEAD_SIZE].encode("utf-8", errors="ignore"))
+            lines = content.count("\n") + (bool(content) and content[-1] != "\n")
+    except OSError:
+        # Left to the reader, which reports the error
+        return None
+    if kind is None:
+        return None
+    note = summary_note(kind, lines)
+    file_info["content"] = None
+    file_info["error"] = note
+    return note
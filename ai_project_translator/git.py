@@ -0,0 +1,374 @@
+"""
+Read a project as it is at a git revision without checking it out.
+
+The file list and blob sizes come from a single `git ls-tree -r -l` call and
+the contents are streamed through one long-lived `git cat-file --batch`
+process instead of forking once per file. Changes relative to a revision are
+read from a single `git diff` stream.
+"""
+
+import codecs
+import os
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+from ai_project_translator.notebook import MAX_NOTEBOOK_SIZE, is_notebook, read_notebook
+from ai_project_translator.tree import is_path_excluded, render_path_tree
+
+
+class GitError(Exception):
+    """Raised when a git command fails."""
+
+
+@dataclass
+class GitEntry:
+    """A blob listed by git ls-tree."""
+
+    path: str
+    object_id: str
+    size: int
+
+
+def run_git(cwd: Path, *args: str) -> bytes:
+    """
+    Run a git command and return its stdout
+    """
+    try:
+        result = subprocess.run(
+            ["git", *args], cwd=cwd, capture_output=True, check=False
+        )
+    except FileNotFoundError as e:
+        raise GitError("git executable not found") from e
+    if result.returncode != 0:
+        message = result.stderr.decode("utf-8", errors="ignore").strip()
+        raise GitError(message or f"git {args[0]} failed")
+    return result.stdout
+
+
+def check_revision(rev: str) -> str:
+    """
+    Return rev, or raise GitError if git would read it as an option
+    """
+    if rev.startswith("-"):
+        raise GitError(f"invalid revision '{rev}'")
+    return rev
+
+
+def list_revision(startpath: Path, rev: str) -> list[GitEntry]:
+    """
+    List the blobs under startpath at a revision, with paths relative to it
+    """
+    output = run_git(startpath, "ls-tree", "-r", "-l", "-z", check_revision(rev))
+    entries = []
+    for record in output.split(b"\0"):
+        if not record:
+            continue
+        meta, _, path = record.partition(b"\t")
+        _, object_type, object_id, size = meta.split()
+        # Submodules show up as commits and have no content here
+        if object_type != b"blob":
+            continue
+        entries.append(
+            GitEntry(
+                path=os.fsdecode(path),
+                object_id=object_id.decode(),
+                size=int(size),
+            )
+        )
+    return entries
+
+
+class CatFileBatch:
+    """
+    A long-lived `git cat-file --batch` process for streaming object contents.
+    """
+
+    def __init__(self, cwd: Path):
+        self.process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def read(self, object_id: str) -> bytes:
+        """
+        Read the contents of an object
+        """
+        self.process.stdin.write(object_id.encode() + b"\n")
+        self.process.stdin.flush()
+
+        header = self.process.stdout.readline()
+        if not header:
+            raise GitError("git cat-file exited unexpectedly")
+        fields = header.split()
+        if len(fields) < 3 or fields[1] == b"missing":
+            raise GitError(f"object {object_id} not found")
+
+        size = int(fields[2])
+        data = self.process.stdout.read(size)
+        # Each object is followed by a newline
+        self.process.stdout.read(1)
+        return data
+
+    def close(self) -> None:
+        if self.process.stdin and not self.process.stdin.closed:
+            self.process.stdin.close()
+        self.process.wait()
+        if self.process.stdout:
+            self.process.stdout.close()
+
+    def __enter__(self) -> "CatFileBatch":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def get_revision_structure(
+    root_name: str,
+    entries: list[GitEntry],
+    exclude_dirs: set[str],
+    exclude_files: set[str],
+    max_depth: int,
+    style: str = "full",
+) -> list[str]:
+    """
+    Generate a tree-like structure of the files at a revision
+    """
+    paths = [
+        entry.path
+        for entry in entries
+        if not is_path_excluded(entry.path, exclude_dirs, exclude_files)
+    ]
+    return render_path_tree(root_name, paths, max_depth, style=style)
+
+
+def get_revision_files_with_content(
+    startpath: Path,
+    entries: list[GitEntry],
+    extensions: set[str],
+    max_file_size: int,
+    exclude_dirs: set[str],
+    exclude_files: set[str],
+    extension_map: dict[str, str],
+    notebook_outputs: int = 0,
+) -> list[dict]:
+    """
+    Find all code files at a revision and read their content from git
+    """
+    suffixes = tuple(extensions)
+    selected = [
+        entry
+        for entry in entries
+        if entry.path.endswith(suffixes)
+        and not is_path_excluded(entry.path, exclude_dirs, exclude_files)
+    ]
+
+    code_files = []
+    batch: Optional[CatFileBatch] = None
+    try:
+        for entry in sorted(selected, key=lambda e: e.path):
+            content = error = None
+            notebook = is_notebook(entry.path) and entry.size <= MAX_NOTEBOOK_SIZE
+            if entry.size > max_file_size and not notebook:
+                error = f"File too large ({entry.size} bytes), skipping content"
+            else:
+                if batch is None:
+                    batch = CatFileBatch(startpath)
+                try:
+                    data = batch.read(entry.object_id)
+                    if notebook:
+                        content, error = read_notebook(
+                            data, max_file_size, notebook_outputs
+                        )
+                    else:
+                        content = data.decode("utf-8", errors="ignore")
+                except Exception as e:
+                    error = f"Error reading file: {str(e)}"
+
+            code_files.append(
+                {
+                    "path": entry.path,
+                    "full_path": startpath / entry.path,
+                    "language": extension_map.get(
+                        os.path.splitext(entry.path)[1].lower(), "text"
+                    ),
+                    "content": content,
+                    "error": error,
+                    "size": entry.size,
+                }
+            )
+    finally:
+        if batch is not None:
+            batch.close()
+
+    return code_files
+
+
+@dataclass
+class DiffFile:
+    """The changes to one file in a git diff."""
+
+    path: str
+    hunks: str
+    old_path: Optional[str] = None
+    binary: bool = False
+
+
+def _unquote_path(path: bytes) -> str:
+    # git quotes paths with special characters C-style, bytes as octal escapes
+    if path.startswith(b'"') and path.endswith(b'"'):
+        path = codecs.escape_decode(path[1:-1])[0]
+    return os.fsdecode(path)
+
+
+def _diff_path(line: bytes, prefix: str) -> Optional[str]:
+    # Names with spaces are followed by a tab
+    path = line.rstrip(b"\n").rstrip(b"\t").split(b" ", 1)[1]
+    if path == b"/dev/null":
+        return None
+    path = _unquote_path(path)
+    return path[len(prefix) :] if path.startswith(prefix) else path
+
+
+def _diff_file(lines: list[bytes]) -> Optional[DiffFile]:
+    old_path = new_path = None
+    binary = False
+    hunks_start = len(lines)
+    for i, line in enumerate(lines):
+        if line.startswith(b"@@"):
+            hunks_start = i
+            break
+        if line.startswith(b"--- "):
+            old_path = _diff_path(line, "a/")
+        elif line.startswith(b"+++ "):
+            new_path = _diff_path(line, "b/")
+        elif line.startswith(b"rename from "):
+            old_path = _unquote_path(line[len(b"rename from ") :].rstrip(b"\n"))
+        elif line.startswith(b"rename to "):
+            new_path = _unquote_path(line[len(b"rename to ") :].rstrip(b"\n"))
+        elif line.startswith(b"Binary files "):
+            binary = True
+    if binary and new_path is None and old_path is None:
+        # Only the header names binary files: diff --git a/path b/path
+        header = lines[0].rstrip(b"\n")
+        new_path = _unquote_path(header[header.rindex(b" b/") + 3 :])
+    path = new_path or old_path
+    if path is None:
+        return None
+    hunks = b"".join(lines[hunks_start:]).decode("utf-8", errors="ignore")
+    return DiffFile(
+        path=path,
+        hunks=hunks.rstrip("\n"),
+        old_path=old_path if old_path != path else None,
+        binary=binary,
+    )
+
+
+def iter_diff(startpath: Path, rev: str, context: int = 3) -> Iterator[DiffFile]:
+    """
+    Stream the changes of the working tree under startpath relative to rev
+
+    Paths are relative to startpath. All files come from one `git diff`
+    process, parsed as it writes them.
+    """
+    check_revision(rev)
+    # A file, not a pipe: warnings for many files (autocrlf) would fill a
+    # pipe nobody reads until stdout ends, and block git
+    errors = tempfile.TemporaryFile()
+    try:
+        process = subprocess.Popen(
+            [
+                "git",
+                "-c",
+                "core.quotePath=false",
+                "diff",
+                "--no-color",
+                "--no-ext-diff",
+                "--relative",
+                "--src-prefix=a/",
+                "--dst-prefix=b/",
+                f"-U{context}",
+                rev,
+                "--",
+            ],
+            cwd=startpath,
+            stdout=subprocess.PIPE,
+            stderr=errors,
+        )
+    except FileNotFoundError as e:
+        errors.close()
+        raise GitError("git executable not found") from e
+
+    try:
+        lines: list[bytes] = []
+        for line in process.stdout:
+            if line.startswith(b"diff --git ") and lines:
+                diff_file = _diff_file(lines)
+                if diff_file is not None:
+                    yield diff_file
+                lines = []
+            lines.append(line)
+        if lines:
+            diff_file = _diff_file(lines)
+            if diff_file is not None:
+                yield diff_file
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+        errors.seek(0)
+        stderr = errors.read()
+        errors.close()
+    if returncode != 0:
+        message = stderr.decode("utf-8", errors="ignore").strip()
+        raise GitError(message or "git diff failed")
+
+
+def get_diff_files_with_content(
+    startpath: Path,
+    rev: str,
+    context: int,
+    extensions: set[str],
+    max_file_size: int,
+    exclude_dirs: set[str],
+    exclude_files: set[str],
+) -> list[dict]:
+    """
+    Find the changed code files relative to rev, with their hunks as content
+
+    Unchanged files are left out. The content of each file is its diff hunks
+    with context lines around the changes, in the "diff" language.
+    """
+    suffixes = tuple(extensions)
+    code_files = []
+    for diff_file in iter_diff(startpath, rev, context):
+        if not diff_file.path.endswith(suffixes) or is_path_excluded(
+            diff_file.path, exclude_dirs, exclude_files
+        ):
+            continue
+        content = error = None
+        size = len(diff_file.hunks.encode("utf-8"))
+        if diff_file.binary:
+            error = "Binary file changed, no diff available"
+        elif size > max_file_size:
+            error = f"Diff too large ({size} bytes), skipping content"
+        elif diff_file.hunks:
+            content = diff_file.hunks
+        elif diff_file.old_path is not None:
+            error = f"Renamed from {diff_file.old_path} without changes"
+        code_files.append(
+            {
+                "path": diff_file.path,
+                "full_path": startpath / diff_file.path,
+                "language": "diff",
+                "content": content,
+                "error": error,
+                "size": size,
+            }
+        )
+    return sorted(code_files, key=lambda f: f["path"])
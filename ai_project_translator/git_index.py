@@ -0,0 +1,245 @@
+"""
+List the files of a working copy from the git index instead of walking it.
+
+Inside a git repository the paths of the tracked files are read straight
+from .git/index, and the untracked files that are not ignored come from one
+`git ls-files --others --exclude-standard` call, so ignored build output is
+never visited. Index formats that cannot be read here (split or sparse
+indexes, unknown versions) fall back to a single `git ls-files` call for
+both. Sizes and mtimes are always taken from the files themselves: the ones
+cached in the index are stale for files edited since they were added.
+"""
+
+import os
+import stat
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from ai_project_translator.git import GitError, run_git
+
+_HEADER = struct.Struct(">4sLL")
+# ctime, ctime ns, mtime, mtime ns, dev, ino, mode, uid, gid, size
+_ENTRY = struct.Struct(">10L")
+_EXTENDED = 0x4000
+_SKIP_WORKTREE = 0x4000
+_STAGE_MASK = 0x3000
+_NAME_MASK = 0x0FFF
+_GITLINK = 0o160000
+
+
+def find_repository(path: Path) -> Optional[tuple[Path, Path]]:
+    """
+    Return the working tree and git directory of the repository containing path
+    """
+    for directory in (path, *path.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return directory, dot_git
+        if dot_git.is_file():
+            # Linked worktrees and submodules point to their git directory
+            try:
+                text = dot_git.read_text(encoding="utf-8").strip()
+            except OSError:
+                return None
+            if not text.startswith("gitdir:"):
+                return None
+            return directory, directory / text[len("gitdir:") :].strip()
+    return None
+
+
+def _hash_size(git_dir: Path) -> int:
+    # Repositories can use SHA-256 object names instead of SHA-1; linked
+    # worktrees keep their config in the common git directory
+    common_dir = git_dir
+    try:
+        common_dir = git_dir / (git_dir / "commondir").read_text().strip()
+    except OSError:
+        pass
+    try:
+        text = (common_dir / "config").read_text(encoding="utf-8")
+    except OSError:
+        return 20
+    return 32 if "objectformat = sha256" in text.lower() else 20
+
+
+def read_index(git_dir: Path) -> list[str]:
+    """
+    Read the paths of the stage-0 files in the index
+
+    Raises GitError for indexes that cannot be read without git.
+    """
+    try:
+        data = (git_dir / "index").read_bytes()
+    except OSError as e:
+        raise GitError(f"cannot read the index: {e}") from e
+
+    signature, version, count = _HEADER.unpack_from(data)
+    if signature != b"DIRC" or version not in (2, 3, 4):
+        raise GitError(f"unsupported index version {version}")
+    hash_size = _hash_size(git_dir)
+
+    files = []
+    offset = _HEADER.size
+    previous = b""
+    for _ in range(count):
+        start = offset
+        fields = _ENTRY.unpack_from(data, offset)
+        offset += _ENTRY.size + hash_size
+        (flags,) = struct.unpack_from(">H", data, offset)
+        offset += 2
+        extended = 0
+        if flags & _EXTENDED and version >= 3:
+            (extended,) = struct.unpack_from(">H", data, offset)
+            offset += 2
+
+        if version == 4:
+            # The path is the previous one, minus a number of bytes, plus a suffix
+            strip = data[offset] & 0x7F
+            while data[offset] & 0x80:
+                offset += 1
+                strip = ((strip + 1) << 7) | (data[offset] & 0x7F)
+            offset += 1
+            end = data.index(b"\0", offset)
+            name = previous[: len(previous) - strip] + data[offset:end]
+            offset = end + 1
+        else:
+            length = flags & _NAME_MASK
+            if length == _NAME_MASK:
+                length = data.index(b"\0", offset) - offset
+            name = data[offset : offset + length]
+            # Entries are NUL-padded to a multiple of eight bytes
+            offset = start + ((offset - start + length + 8) & ~7)
+        previous = name
+
+        mode = fields[6]
+        if stat.S_ISDIR(mode):
+            raise GitError("sparse index")
+        # Skip conflict stages, files missing from sparse checkouts and
+        # submodules, whose files are not in this index
+        if (
+            flags & _STAGE_MASK
+            or extended & _SKIP_WORKTREE
+            or stat.S_IFMT(mode) == _GITLINK
+        ):
+            continue
+        files.append(os.fsdecode(name))
+
+    # A split index only holds the changes to a shared index
+    while offset + 8 <= len(data) - hash_size:
+        signature, size = struct.unpack_from(">4sL", data, offset)
+        if signature == b"link":
+            raise GitError("split index")
+        offset += 8 + size
+    return files
+
+
+class TrackedFiles:
+    """
+    The files git lists below a directory, arranged like the directory tree.
+
+    Paths are relative to the directory and use "/" as separator. Listings
+    leave out the files deleted from root since git listed them.
+    """
+
+    def __init__(self, root: Path, files: Iterable[str]):
+        self.root = root
+        self.files = set(files)
+        # Relative directory -> subdirectory names and file names
+        self.dirs: dict[str, tuple[set[str], list[str]]] = {"": (set(), [])}
+        for path in files:
+            parent, _, name = path.rpartition("/")
+            self._add_dir(parent)[1].append(name)
+
+    def _add_dir(self, path: str) -> tuple[set[str], list[str]]:
+        entry = self.dirs.get(path)
+        if entry is None:
+            entry = self.dirs[path] = (set(), [])
+            parent, _, name = path.rpartition("/")
+            self._add_dir(parent)[0].add(name)
+        return entry
+
+    def listdir(self, relative: str) -> tuple[list[str], list[str]]:
+        """
+        Return the sorted subdirectories and files of a relative directory
+        """
+        key = "" if relative in ("", ".") else relative.replace(os.sep, "/")
+        dirs, files = self.dirs.get(key, ((), ()))
+        directory = os.path.join(self.root, *key.split("/"))
+        return (
+            sorted(d for d in dirs if os.path.lexists(os.path.join(directory, d))),
+            sorted(f for f in files if os.path.lexists(os.path.join(directory, f))),
+        )
+
+    def walk(self, top: str) -> Iterator[tuple[str, list[str], list[str]]]:
+        """
+        Walk the tracked files top-down like os.walk(top)
+
+        Like with os.walk, removing names from the yielded directory list
+        prunes them.
+        """
+        stack = [""]
+        while stack:
+            relative = stack.pop()
+            dirs, files = self.listdir(relative)
+            root = os.path.join(top, *relative.split("/")) if relative else top
+            yield root, dirs, files
+            stack.extend(f"{relative}/{d}" if relative else d for d in reversed(dirs))
+
+
+def read_tracked_files(startpath: Path) -> Optional[list[str]]:
+    """
+    Read the tracked files below startpath from the index, relative to it
+
+    Returns None outside a repository and for indexes that cannot be read
+    without git.
+    """
+    repository = find_repository(startpath)
+    if repository is None:
+        return None
+    worktree, git_dir = repository
+    prefix = os.path.relpath(startpath, worktree).replace(os.sep, "/")
+    prefix = "" if prefix == "." else prefix + "/"
+
+    try:
+        index = read_index(git_dir)
+    except (GitError, struct.error, IndexError, ValueError):
+        return None
+    return [path[len(prefix) :] for path in index if path.startswith(prefix)]
+
+
+def _ls_files(startpath: Path, *args: str) -> list[str]:
+    # ls-files lists the paths relative to the directory it runs in; nested
+    # repositories are listed as directories, with a trailing slash
+    output = run_git(startpath, "ls-files", "-z", *args)
+    return [
+        os.fsdecode(path)
+        for path in output.split(b"\0")
+        if path and not path.endswith(b"/")
+    ]
+
+
+def list_tracked_files(
+    startpath: Path, index_files: Optional[list[str]] = None
+) -> Optional[TrackedFiles]:
+    """
+    Return the files below startpath that git does not ignore, or None when
+    it is to be walked
+
+    These are the tracked files, read from the index directly when possible
+    (index_files, from read_tracked_files, saves reading it again), and the
+    untracked files that are not ignored. When git cannot list them, or there
+    are none (an ignored directory, for instance), the directory is walked.
+    """
+    if find_repository(startpath) is None:
+        return None
+    if index_files is None:
+        index_files = read_tracked_files(startpath)
+    try:
+        if index_files is None:
+            files = _ls_files(startpath, "--cached", "--others", "--exclude-standard")
+        else:
+            files = index_files + _ls_files(startpath, "--others", "--exclude-standard")
+    except GitError:
+        return None
+    return TrackedFiles(startpath, files) if files else None
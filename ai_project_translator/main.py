@@ -1,14 +1,67 @@
+import asyncio
+import functools
+import glob
+import heapq
 import os
+import re
+import sys
 import click
+from contextvars import Context, ContextVar, copy_context
+from collections import Counter
 from pathlib import Path
+from stat import S_ISDIR
 import pyperclip
-from typing import Set, Dict, Optional
+from typing import BinaryIO, Set, Dict, Iterable, Iterator, Literal, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, field_validator
 
+from ai_project_translator import async_reader
+from ai_project_translator.archive import (
+    ArchiveError,
+    archive_root_name,
+    get_archive_files_with_content,
+    get_archive_structure,
+    is_archive,
+)
+from ai_project_translator.project_config import (
+    ProjectConfigError,
+    load_project_config,
+)
+from ai_project_translator.notebook import MAX_NOTEBOOK_SIZE, is_notebook, read_notebook
+from ai_project_translator.records import (
+    SAME_FILE_ERROR,
+    TOTAL_SIZE_LIMIT_ERROR,
+    FileRecord,
+)
+from ai_project_translator.redact import RedactionStats, redact_file
+from ai_project_translator.sink import (
+    COPY_CHUNK_SIZE,
+    FileBody,
+    join_lines,
+    write_parts,
+)
+from ai_project_translator.deps import DEPS_DEPTH, dependency_closure
+from ai_project_translator.formats import WRITERS
+from ai_project_translator.generated import summarize_file
+from ai_project_translator.git_index import TrackedFiles, list_tracked_files
+from ai_project_translator.git import (
+    GitError,
+    get_diff_files_with_content,
+    get_revision_files_with_content,
+    get_revision_structure,
+    list_revision,
+)
+from ai_project_translator.stats import ProjectStats, count_file
+from ai_project_translator.transforms import TRANSFORMS, run_transforms
+from ai_project_translator.tree import TREE_STYLES, iter_tree_lines, render_path_tree
+
 EXCLUDE_DIRS = ".git,__pycache__,node_modules,.vscode,.idea,venv,env,.venv,.ruff_cache,htmlcov,.pytest_cache"
-EXTENSIONS = ".py,.js,.jsx,.ts,.tsx,.html,.css,.json,.xml,.yaml,.yml,.toml,.md,.txt"
+EXTENSIONS = (
+    ".py,.js,.jsx,.ts,.tsx,.html,.css,.json,.xml,.yaml,.yml,.toml,.md,.txt,.ipynb"
+)
 MAX_SIZE = 600000
+SUMMARIZE_DIRS = 1000
+SUMMARY_NAMES = 5
 
 
 class Config(BaseSettings):
@@ -53,6 +106,7 @@ class Config(BaseSettings):
             ".toml": "toml",
             ".yml": "yaml",
             ".md": "markdown",
+            ".ipynb": "markdown",
             ".txt": "text",
             ".sh": "bash",
             ".bash": "bash",
@@ -75,21 +129,77 @@ class Config(BaseSettings):
         description="Maximum depth for directory tree",
     )
 
+    max_files: Optional[int] = Field(
+        default=None,
+        description="Maximum number of files to list and read (unlimited if unset)",
+    )
+
+    max_total_bytes: Optional[int] = Field(
+        default=None,
+        description="Maximum total bytes of file content to read (unlimited if unset)",
+    )
+
+    follow_symlinks: bool = Field(
+        default=False,
+        description="Descend into symlinked directories (each directory is visited once)",
+    )
+
+    tree_style: Literal["full", "compact"] = Field(
+        default="full",
+        description="Tree rendering: full, or compact with single-directory chains collapsed",
+    )
+
+    deps_depth: int = Field(
+        default=DEPS_DEPTH,
+        description="How many levels of imports --with-deps follows",
+    )
+
+    use_git: bool = Field(
+        default=True,
+        description="List the files git does not ignore, from the git index, instead of walking git working copies",
+    )
+
+    summarize_generated: bool = Field(
+        default=True,
+        description="Replace the content of lockfiles, generated and minified files with a one-line summary",
+    )
+
+    notebook_outputs: int = Field(
+        default=0,
+        description="Lines kept of each output of a notebook code cell (0 drops the outputs)",
+    )
+
+    redact: bool = Field(
+        default=True,
+        description="Replace secrets (API keys, tokens, passwords) in file contents before output",
+    )
+
+    summarize_dirs: Optional[int] = Field(
+        default=SUMMARIZE_DIRS,
+        description="Summarize directories with more entries than this instead of listing and reading them (0 disables)",
+    )
+
     @field_validator("exclude_dirs", mode="before")
     @classmethod
-    def decode_exclude_dirs(cls, v: str) -> set[str]:
+    def decode_exclude_dirs(cls, v: str | list[str]) -> set[str]:
+        if not isinstance(v, str):
+            return {x.strip() for x in v}
         if not v.strip():
             v = EXCLUDE_DIRS
         return {x.strip() for x in v.split(",")}
 
     @field_validator("exclude_files", mode="before")
     @classmethod
-    def decode_exclude_files(cls, v: str) -> set[str]:
+    def decode_exclude_files(cls, v: str | list[str]) -> set[str]:
+        if not isinstance(v, str):
+            return {x.strip() for x in v}
         return {x.strip() for x in v.split(",")}
 
     @field_validator("extensions", mode="before")
     @classmethod
-    def decode_extensions(cls, v: str) -> set[str]:
+    def decode_extensions(cls, v: str | list[str]) -> set[str]:
+        if not isinstance(v, str):
+            return {x.strip() for x in v}
         if not v.strip():
             v = EXTENSIONS
         return {x.strip() for x in v.split(",")}
@@ -103,10 +213,145 @@ class Config(BaseSettings):
             return MAX_SIZE
         return int(v)
 
+    @field_validator("max_files", "max_total_bytes", "summarize_dirs", mode="before")
+    @classmethod
+    def decode_optional_limit(cls, v: Optional[str | int]) -> Optional[int]:
+        if v is None or type(v) is int:
+            return v
+        if not v.strip():
+            return None
+        return int(v)
+
 
 # Global config instance
 config = Config()
 
+# Configuration of the ProjectScanner or cli run working in this context
+_context_config: ContextVar[Optional[Config]] = ContextVar(
+    "ai_pt_context_config", default=None
+)
+
+
+def active_config() -> Config:
+    """
+    Return the configuration in effect: the running ProjectScanner's or cli
+    run's, or the global config
+    """
+    settings = _context_config.get()
+    return config if settings is None else settings
+
+
+def config_context(settings: Config) -> Context:
+    """
+    Return a copy of the current context in which settings is in effect
+    """
+    context = copy_context()
+    context.run(_context_config.set, settings)
+    return context
+
+
+class TraversalBudget:
+    """
+    Depth, file-count and byte limits for a single traversal.
+
+    Hitting the depth or file limit stops the traversal. Hitting the byte
+    limit stops reading: later files are still listed, but with metadata
+    only. The budget keeps track of what was left out so it can be reported.
+    """
+
+    def __init__(
+        self,
+        max_depth: Optional[int] = None,
+        max_files: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.max_depth = max_depth
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.files = 0
+        self.bytes = 0
+        self.exhausted: Optional[str] = None
+        # The first file left out by the file limit
+        self.stopped_at: Optional[str] = None
+        self.bytes_exhausted: Optional[str] = None
+        self.unread_files = 0
+        self.pruned_dirs: list[str] = []
+        self.summarized_dirs: list[str] = []
+
+    def allows_depth(self, depth: int) -> bool:
+        return self.max_depth is None or depth <= self.max_depth
+
+    def take_file(self, relative_path: str) -> bool:
+        """
+        Account for one more file, or mark the budget exhausted
+        """
+        if self.exhausted:
+            return False
+        if self.max_files is not None and self.files >= self.max_files:
+            self.exhausted = (
+                f"file limit of {self.max_files} reached at {relative_path}"
+            )
+            self.stopped_at = relative_path
+            return False
+        self.files += 1
+        return True
+
+    def take_bytes(self, relative_path: str, size: int) -> bool:
+        """
+        Account for reading a file's content; False once the byte limit is hit
+        """
+        if not self.bytes_exhausted and (
+            self.max_bytes is None or self.bytes + size <= self.max_bytes
+        ):
+            self.bytes += size
+            return True
+        if not self.bytes_exhausted:
+            self.bytes_exhausted = (
+                f"Total size limit of {self.max_bytes} bytes reached at "
+                f"{relative_path} ({size} bytes)"
+            )
+        self.unread_files += 1
+        return False
+
+    def report(self) -> list[str]:
+        """
+        Describe what the traversal left out
+        """
+        lines = []
+        if self.exhausted:
+            lines.append(
+                f"Traversal stopped early: {self.exhausted}; "
+                "the remaining entries were not visited."
+            )
+        if self.bytes_exhausted:
+            lines.append(
+                f"{self.bytes_exhausted}; the content of {self.unread_files} "
+                "files was not read."
+            )
+        if self.pruned_dirs:
+            shown = ", ".join(self.pruned_dirs[:5])
+            more = (
+                f" and {len(self.pruned_dirs) - 5} more"
+                if len(self.pruned_dirs) > 5
+                else ""
+            )
+            lines.append(
+                f"{len(self.pruned_dirs)} directories below depth {self.max_depth} "
+                f"were not visited: {shown}{more}"
+            )
+        if self.summarized_dirs:
+            shown = ", ".join(self.summarized_dirs[:5])
+            more = (
+                f" and {len(self.summarized_dirs) - 5} more"
+                if len(self.summarized_dirs) > 5
+                else ""
+            )
+            lines.append(
+                f"{len(self.summarized_dirs)} large directories were summarized "
+                f"and their files not read: {shown}{more}"
+            )
+        return lines
+
 
 def format_question_for_output(question: Optional[str]) -> str:
     """Format the question for inclusion in the output."""
@@ -123,35 +368,177 @@ def format_question_for_output(question: Optional[str]) -> str:
     return question
 
 
-def get_directory_structure(
+def inode_key(path: str | Path) -> Optional[tuple[int, int]]:
+    """
+    Identify the file or directory a path resolves to by (st_dev, st_ino)
+
+    Returns None if the path cannot be stat-ed or the filesystem does not
+    report inode numbers.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_dev, stat.st_ino) if stat.st_ino else None
+
+
+def summarize_directory(
+    entries: list[tuple[str, bool, int]], names: int = SUMMARY_NAMES
+) -> dict:
+    """
+    Count the files, directories, bytes and extensions of (name, is_dir, size)
+    entries
+
+    Only the first names (in sorted order) are kept, without sorting them all.
+    """
+    files = dirs = total_bytes = 0
+    extensions: Counter = Counter()
+    first = heapq.nsmallest(names, entries)
+    for name, is_dir, size in entries:
+        if is_dir:
+            dirs += 1
+            continue
+        files += 1
+        extensions[os.path.splitext(name)[1].lower() or "(none)"] += 1
+        total_bytes += size
+    return {
+        "entries": len(entries),
+        "files": files,
+        "dirs": dirs,
+        "bytes": total_bytes,
+        "extensions": extensions.most_common(),
+        "first": [name + "/" if is_dir else name for name, is_dir, _ in first],
+    }
+
+
+def _summary_entry(entry: os.DirEntry) -> tuple[str, bool, int]:
+    try:
+        if entry.is_dir():
+            return entry.name, True, 0
+        return entry.name, False, entry.stat().st_size
+    except OSError:
+        return entry.name, False, 0
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def format_directory_summary(summary: dict) -> str:
+    """
+    Describe the entries of a summarized directory that are not listed
+    """
+    histogram = ", ".join(
+        f"{extension} {count}" for extension, count in summary["extensions"][:5]
+    )
+    if len(summary["extensions"]) > 5:
+        histogram += ", ..."
+    remaining = summary["entries"] - len(summary["first"])
+    text = (
+        f"... {remaining} more entries ({summary['files']} files, "
+        f"{summary['dirs']} directories, {summary['bytes']} bytes"
+    )
+    return text + (f"; {histogram})" if histogram else ")")
+
+
+def iter_directory_structure(
     startpath: Path,
     exclude_dirs: Optional[set[str]] = None,
     exclude_files: Optional[set[str]] = None,
     max_depth: Optional[int] = None,
-) -> list[str]:
+    budget: Optional[TraversalBudget] = None,
+    follow_symlinks: Optional[bool] = None,
+    summarize_dirs: Optional[int] = None,
+    tree_style: Optional[str] = None,
+    tracked: Optional[TrackedFiles] = None,
+    extensions: Optional[Set[str]] = None,
+) -> Iterator[str]:
     """
-    Generate a tree-like structure of the directory
+    Generate a tree-like structure of the directory, one line at a time
+
+    If a budget is given, its file limit takes the same code files as
+    iter_file_records, in the same order and within its max_depth, and the
+    tree lists the entries that come before the first file left out.
+    Symlinked directories are listed but only descended into with
+    follow_symlinks; a directory reached a second time (a symlink loop or
+    another link to it) is shown once and then points to its first listing.
+    Subdirectories with more than summarize_dirs entries show their first
+    names and a summary line instead of every entry; unlike with the other
+    options, the settings are not used for it, so nothing is summarized
+    unless it is given. The compact tree_style
+    collapses chains of single-directory directories into one line.
+    With tracked, only the files git lists are shown: the tracked files and
+    the untracked files that are not ignored.
     """
+    settings = active_config()
     if exclude_dirs is None:
-        exclude_dirs = config.exclude_dirs
+        exclude_dirs = settings.exclude_dirs
     if exclude_files is None:
-        exclude_files = config.exclude_files
+        exclude_files = settings.exclude_files
     if max_depth is None:
-        max_depth = config.max_depth
-
-    structure = []
-
-    def build_tree(path: Path, prefix: str = "", depth: int = 0):
-        if depth > max_depth:
-            return
-
+        max_depth = settings.max_depth
+    if follow_symlinks is None:
+        follow_symlinks = settings.follow_symlinks
+    if tree_style is None:
+        tree_style = settings.tree_style
+    if extensions is None:
+        extensions = settings.extensions
+
+    # Entries are compared to the first file left out with the keys that
+    # order the file walk, directories as "name/"
+    stop = None
+    if budget and budget.max_files is not None:
+        walk = TraversalBudget(max_depth=budget.max_depth, max_files=budget.max_files)
+        for _ in iter_file_records(
+            startpath,
+            extensions=extensions,
+            exclude_dirs=exclude_dirs,
+            exclude_files=exclude_files,
+            budget=walk,
+            follow_symlinks=follow_symlinks,
+            summarize_dirs=summarize_dirs,
+            tracked=tracked,
+        ):
+            pass
+        budget.files, budget.exhausted = walk.files, walk.exhausted
+        if walk.stopped_at is not None:
+            *parents, name = walk.stopped_at.split(os.sep)
+            stop = tuple(d + os.sep for d in parents) + (name,)
+
+    # (st_dev, st_ino) of the directories listed so far, with their path
+    visited = {}
+    if follow_symlinks:
+        visited[inode_key(startpath)] = "."
+
+    def list_entries(path: Path, depth: int) -> list[tuple[str, Optional[Path]]]:
         try:
-            contents = sorted(os.listdir(path))
+            with os.scandir(path) as it:
+                entries = list(it)
         except PermissionError:
-            return
+            return []
+
+        if summarize_dirs and depth > 0 and len(entries) > summarize_dirs:
+            summary = summarize_directory(
+                [
+                    _summary_entry(entry)
+                    for entry in entries
+                    if entry.name not in exclude_dirs
+                    and entry.name not in exclude_files
+                ]
+            )
+            return [(name, None) for name in summary["first"]] + [
+                (format_directory_summary(summary), None)
+            ]
+
+        contents = sorted(entry.name for entry in entries)
 
         files = []
         dirs = []
+        # Directories that are listed without descending into them
+        labels = {}
 
         for item in contents:
             if item in exclude_dirs:
@@ -159,35 +546,103 @@ def get_directory_structure(
             item_path = os.path.join(path, item)
             if os.path.isdir(item_path):
                 dirs.append(item)
+                if not follow_symlinks:
+                    if os.path.islink(item_path):
+                        labels[item] = "(symlink, not followed)"
+                    continue
+                # Claim every subdirectory before descending, like os.walk
+                key = inode_key(item_path)
+                if key is None:
+                    continue
+                relative = os.path.relpath(item_path, startpath)
+                seen = visited.setdefault(key, relative)
+                if seen != relative:
+                    labels[item] = f"(same directory as {seen}/)"
             else:
                 if item not in exclude_files:
                     files.append(item)
 
-        # Add directories
-        for i, directory in enumerate(dirs):
-            is_last_dir = (i == len(dirs) - 1) and (len(files) == 0)
-            connector = "└── " if is_last_dir else "├── "
-            structure.append(f"{prefix}{connector}{directory}/")
+        return budgeted_entries(path, dirs, files, labels)
+
+    def list_tracked(path: Path, depth: int) -> list[tuple[str, Optional[Path]]]:
+        relative = os.path.relpath(path, startpath)
+        dirs, files = tracked.listdir(relative)
+        dirs = [d for d in dirs if d not in exclude_dirs]
+        files = [f for f in files if f not in exclude_files]
+
+        if summarize_dirs and depth > 0 and len(dirs) + len(files) > summarize_dirs:
+            summary = summarize_directory(
+                [(d, True, 0) for d in dirs]
+                + [(f, False, _file_size(os.path.join(path, f))) for f in files]
+            )
+            return [(name, None) for name in summary["first"]] + [
+                (format_directory_summary(summary), None)
+            ]
+
+        return budgeted_entries(path, dirs, files, {})
+
+    def budgeted_entries(
+        path: Path, dirs: list[str], files: list[str], labels: dict[str, str]
+    ) -> list[tuple[str, Optional[Path]]]:
+        if stop is not None:
+            relative = os.path.relpath(path, startpath)
+            parent = (
+                ()
+                if relative == "."
+                else tuple(d + os.sep for d in relative.split(os.sep))
+            )
+            dirs = [d for d in dirs if parent + (d + os.sep,) < stop]
+            files = [f for f in files if parent + (f,) < stop]
+
+        return [
+            (f"{d}/ {labels[d]}", None) if d in labels else (d, path / d) for d in dirs
+        ] + [(f, None) for f in files]
+
+    yield from iter_tree_lines(
+        os.path.basename(startpath),
+        startpath,
+        list_entries if tracked is None else list_tracked,
+        max_depth,
+        style=tree_style,
+    )
 
-            new_prefix = prefix + ("    " if is_last_dir else "│   ")
-            build_tree(path / directory, new_prefix, depth + 1)
 
-        # Add files
-        for i, file in enumerate(files):
-            is_last = i == len(files) - 1
-            connector = "└── " if is_last else "├── "
-            structure.append(f"{prefix}{connector}{file}")
+def get_directory_structure(
+    startpath: Path,
+    exclude_dirs: Optional[set[str]] = None,
+    exclude_files: Optional[set[str]] = None,
+    max_depth: Optional[int] = None,
+    budget: Optional[TraversalBudget] = None,
+    follow_symlinks: Optional[bool] = None,
+    summarize_dirs: Optional[int] = None,
+    tree_style: Optional[str] = None,
+    tracked: Optional[TrackedFiles] = None,
+) -> list[str]:
+    """
+    Generate a tree-like structure of the directory
 
-    structure.append(os.path.basename(startpath) + "/")
-    build_tree(startpath)
-    return structure
+    See iter_directory_structure for the options.
+    """
+    return list(
+        iter_directory_structure(
+            startpath,
+            exclude_dirs=exclude_dirs,
+            exclude_files=exclude_files,
+            max_depth=max_depth,
+            budget=budget,
+            follow_symlinks=follow_symlinks,
+            summarize_dirs=summarize_dirs,
+            tree_style=tree_style,
+            tracked=tracked,
+        )
+    )
 
 
 def get_file_extension_language(file_path: Path) -> str:
     """
     Map file extensions to language names for code blocks
     """
-    extension_map = config.extension_map
+    extension_map = active_config().extension_map
     ext = file_path.suffix.lower()
     return extension_map.get(ext, "text")
 
@@ -198,11 +653,16 @@ def read_file_content(
     """
     Read file content with size limitation
     """
+    settings = active_config()
     if max_size is None:
-        max_size = config.max_size
+        max_size = settings.max_size
 
     try:
         file_size = os.path.getsize(file_path)
+        if is_notebook(str(file_path)) and file_size <= MAX_NOTEBOOK_SIZE:
+            # Only the cells are kept, so the limit applies to them
+            with open(file_path, "rb") as f:
+                return read_notebook(f.read(), max_size, settings.notebook_outputs)
         if file_size > max_size:
             return None, f"File too large ({file_size} bytes), skipping content"
 
@@ -213,66 +673,326 @@ def read_file_content(
         return None, f"Error reading file: {str(e)}"
 
 
+def read_file_body(
+    file_path: Path, max_size: Optional[int] = None
+) -> tuple[Optional[FileBody], Optional[str]]:
+    """
+    Like read_file_content, but return a reference to the file's bytes
+    instead of reading and decoding them
+
+    Notebooks are read and returned as the text of their cells.
+    """
+    if max_size is None:
+        max_size = active_config().max_size
+    if is_notebook(str(file_path)):
+        return read_file_content(file_path, max_size)
+
+    try:
+        file_size = os.path.getsize(file_path)
+        if file_size > max_size:
+            return None, f"File too large ({file_size} bytes), skipping content"
+        if not os.access(file_path, os.R_OK):
+            raise PermissionError(f"Permission denied: '{file_path}'")
+        return FileBody(file_path, file_size), None
+    except Exception as e:
+        return None, f"Error reading file: {str(e)}"
+
+
+def iter_file_records(
+    startpath: Path,
+    extensions: Optional[Set[str]] = None,
+    max_file_size: Optional[int] = None,
+    exclude_dirs: Optional[Set[str]] = None,
+    exclude_files: Optional[Set[str]] = None,
+    budget: Optional[TraversalBudget] = None,
+    as_bytes: bool = False,
+    follow_symlinks: Optional[bool] = None,
+    summarize_dirs: Optional[int] = None,
+    tracked: Optional[TrackedFiles] = None,
+) -> Iterator[FileRecord]:
+    """
+    Find all code files in the directory and yield compact records for them
+
+    The records hold the path, size and mtime; content is read when it is
+    first accessed. Each directory is listed and sorted when it is entered,
+    and its subdirectories are entered in turn, so records come out sorted
+    by relative path as the walk goes.
+
+    Symlinked directories are only entered with follow_symlinks, and then
+    each physical directory once. A file reached again through a hardlink
+    or symlink is returned with a "Same file as" error and is not read.
+    Subdirectories with more than summarize_dirs entries are skipped, as
+    they are summarized in the tree; by default no directory is skipped.
+    With tracked, only the files git lists
+    are visited (tracked, or untracked and not ignored), and nothing is
+    walked; their sizes and mtimes still come from disk.
+
+    If a budget is given, directories below its max_depth are not visited
+    and the walk stops as soon as its file limit is reached. Once its byte
+    limit is reached, the remaining files are returned with metadata only.
+    With as_bytes, content is a FileBody referencing the file instead of text.
+    """
+    settings = active_config()
+    if extensions is None:
+        extensions = settings.extensions
+    if max_file_size is None:
+        max_file_size = settings.max_size
+    if exclude_dirs is None:
+        exclude_dirs = settings.exclude_dirs
+    if exclude_files is None:
+        exclude_files = settings.exclude_dirs
+    if follow_symlinks is None:
+        follow_symlinks = settings.follow_symlinks
+
+    suffixes = tuple(extensions)
+    extension_map = settings.extension_map
+    root_path = os.fspath(startpath)
+    # One reader shared by all the records of this walk
+    if as_bytes:
+        reader = functools.partial(read_file_body, max_size=max_file_size)
+    else:
+        reader = functools.partial(read_file_content, max_size=max_file_size)
+
+    # (st_dev, st_ino) of the directories entered and files found so far
+    visited_dirs = {inode_key(root_path)} if follow_symlinks else set()
+    seen_files = {}
+    stopped = False
+
+    def list_dir(root: str, relative_root: str) -> tuple[list, list, set]:
+        # Subdirectories, files, and the subdirectories not to enter, like
+        # os.walk lists them
+        if tracked is not None:
+            dirs, files = tracked.listdir(relative_root)
+            return dirs, files, set()
+        dirs, files, links = [], [], set()
+        try:
+            with os.scandir(root) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        files.append(entry.name)
+                        continue
+                    dirs.append(entry.name)
+                    if not follow_symlinks and entry.is_symlink():
+                        links.add(entry.name)
+        except OSError:
+            pass
+        return dirs, files, links
+
+    def visit(root: str, relative_root: str, depth: int) -> Iterator[FileRecord]:
+        nonlocal stopped
+        dirs, files, links = list_dir(root, relative_root)
+        if summarize_dirs and depth and len(dirs) + len(files) > summarize_dirs:
+            if budget:
+                budget.summarized_dirs.append(relative_root)
+            return
+        dirs = sorted(d for d in dirs if d not in exclude_dirs)
+        if follow_symlinks:
+            unvisited = []
+            for d in dirs:
+                key = inode_key(os.path.join(root, d))
+                if key is None or key not in visited_dirs:
+                    visited_dirs.add(key)
+                    unvisited.append(d)
+            dirs = unvisited
+        if budget and not budget.allows_depth(depth + 1):
+            budget.pruned_dirs.extend(
+                os.path.normpath(os.path.join(relative_root, d)) for d in dirs
+            )
+            dirs = []
+
+        # Subdirectories sort as "name/", so that files come out in the
+        # order of their relative paths and never need a sort afterwards
+        entries = [(d + os.sep, d, True) for d in dirs if d not in links]
+        entries.extend(
+            (file, file, False)
+            for file in files
+            if file not in exclude_files and file.endswith(suffixes)
+        )
+        entries.sort()
+
+        for _, name, is_dir in entries:
+            relative_path = (
+                name if relative_root == "." else os.path.join(relative_root, name)
+            )
+            if is_dir:
+                yield from visit(os.path.join(root, name), relative_path, depth + 1)
+                if stopped:
+                    return
+                continue
+            try:
+                stat = os.stat(os.path.join(root, name))
+                size, mtime = stat.st_size, stat.st_mtime
+                key = (stat.st_dev, stat.st_ino) if stat.st_ino else None
+            except OSError:
+                stat = None
+                size, mtime, key = 0, 0.0, None
+            # A tracked symlink may point to a directory
+            if tracked is not None and stat is not None and S_ISDIR(stat.st_mode):
+                continue
+            if budget and not budget.take_file(relative_path):
+                stopped = True
+                return
+
+            record = FileRecord(
+                root_path,
+                relative_path,
+                extension_map.get(os.path.splitext(name)[1].lower(), "text"),
+                size,
+                mtime,
+                reader,
+            )
+            first_path = seen_files.setdefault(key, relative_path) if key else None
+            if first_path is not None and first_path != relative_path:
+                record.set_result(None, SAME_FILE_ERROR.format(first_path))
+            # Files over max_size are listed but never read, so they do
+            # not count against the total size limit
+            elif (
+                budget
+                and size <= max_file_size
+                and not budget.take_bytes(relative_path, size)
+            ):
+                record.set_result(None, TOTAL_SIZE_LIMIT_ERROR)
+            yield record
+
+    yield from visit(root_path, ".", 0)
+
+
+def iter_code_files(
+    startpath: Path,
+    extensions: Optional[Set[str]] = None,
+    max_file_size: Optional[int] = None,
+    exclude_dirs: Optional[Set[str]] = None,
+    exclude_files: Optional[Set[str]] = None,
+    budget: Optional[TraversalBudget] = None,
+    as_bytes: bool = False,
+    follow_symlinks: Optional[bool] = None,
+    summarize_dirs: Optional[int] = None,
+    tracked: Optional[TrackedFiles] = None,
+) -> Iterator[dict]:
+    """
+    Find all code files in the directory and yield them as they are read
+
+    See iter_file_records for the order of the files and the options.
+    """
+    records = iter_file_records(
+        startpath,
+        extensions=extensions,
+        max_file_size=max_file_size,
+        exclude_dirs=exclude_dirs,
+        exclude_files=exclude_files,
+        budget=budget,
+        as_bytes=as_bytes,
+        follow_symlinks=follow_symlinks,
+        summarize_dirs=summarize_dirs,
+        tracked=tracked,
+    )
+    for record in records:
+        yield record.to_dict()
+
+
 def get_code_files_with_content(
     startpath: Path,
     extensions: Optional[Set[str]] = None,
     max_file_size: Optional[int] = None,
     exclude_dirs: Optional[Set[str]] = None,
     exclude_files: Optional[Set[str]] = None,
+    budget: Optional[TraversalBudget] = None,
+    as_bytes: bool = False,
+    follow_symlinks: Optional[bool] = None,
+    summarize_dirs: Optional[int] = None,
+    tracked: Optional[TrackedFiles] = None,
 ) -> list[dict]:
     """
     Find all code files in the directory and read their content
+
+    See iter_file_records for the other options.
     """
+    records = iter_file_records(
+        startpath,
+        extensions=extensions,
+        max_file_size=max_file_size,
+        exclude_dirs=exclude_dirs,
+        exclude_files=exclude_files,
+        budget=budget,
+        as_bytes=as_bytes,
+        follow_symlinks=follow_symlinks,
+        summarize_dirs=summarize_dirs,
+        tracked=tracked,
+    )
+    return [record.to_dict() for record in records]
+
+
+async def aget_code_files_with_content(
+    startpath: Path,
+    extensions: Optional[Set[str]] = None,
+    max_file_size: Optional[int] = None,
+    exclude_dirs: Optional[Set[str]] = None,
+    exclude_files: Optional[Set[str]] = None,
+    meta_concurrency: int = async_reader.META_CONCURRENCY,
+    read_concurrency: int = async_reader.READ_CONCURRENCY,
+    queue_size: int = async_reader.QUEUE_SIZE,
+    budget: Optional[TraversalBudget] = None,
+    tracked: Optional[TrackedFiles] = None,
+    summarize_dirs: Optional[int] = None,
+) -> list[dict]:
+    """
+    Coroutine version of get_code_files_with_content for high-latency filesystems.
+
+    Directory listing and stat calls are limited to meta_concurrency at a time,
+    reads to read_concurrency, and at most queue_size files wait between them.
+    A budget, tracked files and summarize_dirs take the same files as in
+    get_code_files_with_content.
+    """
+    settings = active_config()
     if extensions is None:
-        extensions = config.extensions
+        extensions = settings.extensions
     if max_file_size is None:
-        max_file_size = config.max_size
+        max_file_size = settings.max_size
     if exclude_dirs is None:
-        exclude_dirs = config.exclude_dirs
+        exclude_dirs = settings.exclude_dirs
     if exclude_files is None:
-        exclude_files = config.exclude_dirs
-
-    code_files = []
-    for root, dirs, files in os.walk(startpath):
-        # Skip common excluded directories
-        dirs[:] = [d for d in dirs if d not in exclude_dirs]
-        for file in files:
-            if file in exclude_files:
-                continue
-            file_path = Path(root) / file
-            if any(file.endswith(ext) for ext in extensions):
-                relative_path = os.path.relpath(file_path, startpath)
-                language = get_file_extension_language(file_path)
-                content, error = read_file_content(file_path, max_file_size)
-
-                code_files.append(
-                    {
-                        "path": relative_path,
-                        "full_path": file_path,
-                        "language": language,
-                        "content": content,
-                        "error": error,
-                        "size": file_path.stat().st_size if file_path.exists() else 0,
-                    }
-                )
-    return sorted(code_files, key=lambda x: x["path"])
+        exclude_files = settings.exclude_files
+
+    return await async_reader.read_project(
+        startpath,
+        extensions=extensions,
+        max_file_size=max_file_size,
+        exclude_dirs=exclude_dirs,
+        exclude_files=exclude_files,
+        extension_map=settings.extension_map,
+        notebook_outputs=settings.notebook_outputs,
+        meta_concurrency=meta_concurrency,
+        read_concurrency=read_concurrency,
+        queue_size=queue_size,
+        budget=budget,
+        tracked=tracked,
+        summarize_dirs=summarize_dirs,
+    )
 
 
 def get_single_file_info(
-    file_path: Path, max_file_size: Optional[int] = None
+    file_path: Path, max_file_size: Optional[int] = None, as_bytes: bool = False
 ) -> Optional[dict]:
     """
     Get information for a single file.
     """
+    settings = active_config()
     if max_file_size is None:
-        max_file_size = config.max_size
+        max_file_size = settings.max_size
 
-    if not any(str(file_path).endswith(ext) for ext in config.extensions):
+    if not any(str(file_path).endswith(ext) for ext in settings.extensions):
         return None
 
     relative_path = file_path.name
     language = get_file_extension_language(file_path)
-    content, error = read_file_content(file_path, max_file_size)
+    if as_bytes:
+        content, error = read_file_body(file_path, max_file_size)
+    else:
+        content, error = read_file_content(file_path, max_file_size)
 
     return {
         "path": relative_path,
@@ -284,9 +1004,189 @@ def get_single_file_info(
     }
 
 
-def format_file_for_ai(file_info: dict, framework: Optional[str] = None) -> str:
+def is_glob(pattern: str) -> bool:
+    return any(c in pattern for c in "*?[")
+
+
+def is_pattern(path: str) -> bool:
     """
-    Format a single file in the recommended AI context format
+    Whether path is a glob pattern: it has wildcards and is not an existing
+    path, like the route directory app/[id]/ of a Next.js project
+    """
+    return is_glob(path) and not os.path.exists(path)
+
+
+def expand_paths(
+    patterns: Iterable[str],
+    exclude_dirs: Optional[set[str]] = None,
+    exclude_files: Optional[set[str]] = None,
+) -> tuple[list[Path], list[str]]:
+    """
+    Expand files, directories and glob patterns into the code files they select
+
+    Globs are expanded by Python (** matches any number of directories), so
+    they work the same in every shell. Directories contribute all their code
+    files. Returns the absolute, deduplicated files in sorted order and the
+    patterns that matched nothing.
+    """
+    settings = active_config()
+    if exclude_dirs is None:
+        exclude_dirs = settings.exclude_dirs
+    if exclude_files is None:
+        exclude_files = settings.exclude_files
+
+    suffixes = tuple(settings.extensions)
+    selected: dict[str, Path] = {}
+    unmatched = []
+
+    def select(file_path: str) -> bool:
+        name = os.path.basename(file_path)
+        if name in exclude_files or not name.endswith(suffixes):
+            return False
+        # Deduplicate by the file the path points to
+        selected.setdefault(
+            os.path.realpath(file_path), Path(os.path.abspath(file_path))
+        )
+        return True
+
+    for pattern in patterns:
+        if is_pattern(pattern):
+            parts = Path(pattern).parts
+            fixed = next(i for i, part in enumerate(parts) if is_glob(part))
+            matches = glob.glob(pattern, recursive=True)
+        else:
+            fixed = None
+            matches = [pattern] if os.path.exists(pattern) else []
+
+        found = False
+        for match in matches:
+            # Directories matched by a glob are subject to the exclusions
+            if fixed is not None and any(
+                part in exclude_dirs for part in Path(match).parts[fixed:]
+            ):
+                continue
+            if os.path.isdir(match):
+                for record in iter_file_records(
+                    Path(match), exclude_dirs=exclude_dirs, exclude_files=exclude_files
+                ):
+                    found = select(os.path.join(record.root, record.path)) or found
+            else:
+                found = select(match) or found
+        if not found:
+            unmatched.append(pattern)
+
+    return sorted(selected.values()), unmatched
+
+
+def read_file_list(stream: BinaryIO, null_separated: bool = False) -> list[str]:
+    """
+    Read a list of paths, one per line or NUL-separated (git ls-files -z,
+    fd -0, rg -l0)
+    """
+    data = stream.read()
+    if null_separated:
+        names = data.split(b"\0")
+    else:
+        names = [name.rstrip(b"\r") for name in data.split(b"\n")]
+    return [os.fsdecode(name) for name in names if name]
+
+
+def select_listed_files(
+    names: Iterable[str], exclude_files: Optional[set[str]] = None
+) -> tuple[list[Path], list[str]]:
+    """
+    Select the code files of a list of file paths without walking any directory
+
+    Only the listed paths are looked at, so the cost depends on the length of
+    the list, not on the size of the tree. Returns the absolute, deduplicated
+    files in sorted order and the names that are not existing files.
+    """
+    settings = active_config()
+    if exclude_files is None:
+        exclude_files = settings.exclude_files
+
+    suffixes = tuple(settings.extensions)
+    selected: dict[str, Path] = {}
+    missing = []
+    for name in names:
+        if not os.path.isfile(name):
+            missing.append(name)
+            continue
+        base = os.path.basename(name)
+        if base in exclude_files or not base.endswith(suffixes):
+            continue
+        selected.setdefault(os.path.realpath(name), Path(os.path.abspath(name)))
+    return sorted(selected.values()), missing
+
+
+def get_dependency_files(
+    file_path: Path,
+    max_depth: Optional[int] = None,
+    max_file_size: Optional[int] = None,
+    as_bytes: bool = False,
+    workers: Optional[int] = None,
+) -> tuple[Path, list[dict]]:
+    """
+    Get information for a file and the local files it imports.
+
+    Returns the closest directory containing all of them and their file
+    infos, with paths relative to it, the file itself first.
+    """
+    settings = active_config()
+    if max_depth is None:
+        max_depth = settings.deps_depth
+
+    paths = dependency_closure(
+        file_path, max_depth, exclude_dirs=settings.exclude_dirs, workers=workers
+    )
+    root = Path(os.path.commonpath([path.parent for path in paths]))
+    file_infos = []
+    for path in paths:
+        file_info = get_single_file_info(path, max_file_size, as_bytes=as_bytes)
+        if file_info:
+            file_info["path"] = os.path.relpath(path, root)
+            file_infos.append(file_info)
+    return root, file_infos
+
+
+_BACKTICKS = re.compile("`+")
+_BACKTICK_BYTES = re.compile(b"`+")
+
+
+def code_fence(content: str | bytes | FileBody) -> str:
+    """
+    Return a code fence longer than any run of backticks in content, so that
+    fences inside it (markdown, notebooks) do not end the block
+
+    A FileBody is scanned in chunks, without decoding it.
+    """
+    if isinstance(content, str):
+        longest = max(map(len, _BACKTICKS.findall(content)), default=0)
+    elif isinstance(content, bytes):
+        longest = max(map(len, _BACKTICK_BYTES.findall(content)), default=0)
+    else:
+        # A run can go on from one chunk into the next
+        longest = run = 0
+        try:
+            with open(content.path, "rb") as f:
+                while chunk := f.read(COPY_CHUNK_SIZE):
+                    for match in _BACKTICK_BYTES.finditer(chunk):
+                        length = match.end() - match.start()
+                        longest = max(
+                            longest, length + (run if match.start() == 0 else 0)
+                        )
+                    trailing = len(chunk) - len(chunk.rstrip(b"`"))
+                    run = run + trailing if trailing == len(chunk) else trailing
+        except OSError:
+            # Reported when the body is written
+            pass
+    return "`" * max(3, longest + 1)
+
+
+def format_file_lines(file_info: dict, framework: Optional[str] = None) -> list:
+    """
+    Output lines of format_file_for_ai; the content line is kept as is, so it
+    may be a FileBody or, once redacted, the bytes of one
     """
     output = []
 
@@ -294,20 +1194,42 @@ def format_file_for_ai(file_info: dict, framework: Optional[str] = None) -> str:
         output.append(f"**Framework:** {framework}")
 
     output.append(f"**File:** {file_info['path']}")
+    if file_info.get("sha256"):
+        output.append(f"**SHA-256:** {file_info['sha256']}")
+    if file_info.get("tokens") is not None:
+        output.append(f"**Estimated tokens:** {file_info['tokens']}")
     output.append("")
 
     if file_info["error"]:
         output.append(f"*Note: {file_info['error']}*")
         output.append("")
     elif file_info["content"] is not None:
-        output.append(f"```{file_info['language']}")
-        output.append(file_info["content"])
-        output.append("```")
+        content = file_info["content"]
+        fence = code_fence(content)
+        output.append(f"{fence}{file_info['language']}")
+        output.append(content)
+        output.append(fence)
         output.append("")
     else:
         output.append("*No content available*")
 
-    return "\n".join(output)
+    return output
+
+
+def format_file_for_ai(file_info: dict, framework: Optional[str] = None) -> str:
+    """
+    Format a single file in the recommended AI context format
+    """
+    return "\n".join(format_file_lines(file_info, framework))
+
+
+def decode_file_bodies(file_infos: list[dict]) -> None:
+    """
+    Replace FileBody contents with decoded text, for stages that need text
+    """
+    for file_info in file_infos:
+        if isinstance(file_info["content"], FileBody):
+            file_info["content"] = file_info["content"].text()
 
 
 def copy_to_clipboard(content: str, verbose: bool = True) -> bool:
@@ -326,8 +1248,21 @@ def copy_to_clipboard(content: str, verbose: bool = True) -> bool:
         return False
 
 
+def _in_own_context(func):
+    """
+    Run func in a copy of the current context, so that the context variables
+    it sets are dropped when it returns
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return copy_context().run(func, *args, **kwargs)
+
+    return wrapper
+
+
 @click.command()
-@click.argument("path", required=False, default=os.getcwd())
+@click.argument("paths", nargs=-1)
 @click.option(
     "--framework", "-f", help="Specify the framework (e.g., Fastapi, React, Django)"
 )
@@ -363,8 +1298,165 @@ def copy_to_clipboard(content: str, verbose: bool = True) -> bool:
     help="Show current configuration and exit",
 )
 @click.option("--exclude-files", multiple=True, help="Exclude files from analysis")
+@click.option(
+    "--transform",
+    "-t",
+    "transforms",
+    multiple=True,
+    type=click.Choice(sorted(TRANSFORMS)),
+    help="Transform applied to each file's content (can be repeated)",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Number of worker processes for transforms (default: CPU count)",
+)
+@click.option(
+    "--async",
+    "use_async",
+    is_flag=True,
+    help="Read files with concurrent asyncio tasks (for NFS, sshfs and other slow filesystems)",
+)
+@click.option(
+    "--rev",
+    default=None,
+    help="Analyze the project at a git commit or branch without checking it out",
+)
+@click.option(
+    "--diff",
+    "diff_rev",
+    default=None,
+    help="Only show the changed files relative to a git commit or branch, as diff hunks",
+)
+@click.option(
+    "--context",
+    "diff_context",
+    default=3,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Lines of context around each change with --diff",
+)
+@click.option(
+    "--max-depth",
+    default=None,
+    type=click.IntRange(min=0),
+    help="Maximum directory depth for both the tree and the files. Overrides AI_PT_MAX_DEPTH env var.",
+)
+@click.option(
+    "--max-files",
+    default=None,
+    type=click.IntRange(min=0),
+    help="Stop after this many files. Overrides AI_PT_MAX_FILES env var.",
+)
+@click.option(
+    "--max-bytes",
+    default=None,
+    type=click.IntRange(min=0),
+    help="Stop reading once file contents reach this many bytes; later files are only listed. Overrides AI_PT_MAX_TOTAL_BYTES env var.",
+)
+@click.option(
+    "--follow-symlinks/--no-follow-symlinks",
+    default=None,
+    help="Descend into symlinked directories, visiting each directory once. Overrides AI_PT_FOLLOW_SYMLINKS env var.",
+)
+@click.option(
+    "--git/--no-git",
+    "use_git",
+    default=None,
+    help="Inside a git repository, list only the files git does not ignore, from the git index, instead of walking the directory. Overrides AI_PT_USE_GIT env var.",
+)
+@click.option(
+    "--summarize-generated/--no-summarize-generated",
+    default=None,
+    help="Show lockfiles, generated and minified files as a one-line summary instead of their content. Overrides AI_PT_SUMMARIZE_GENERATED env var.",
+)
+@click.option(
+    "--notebook-outputs",
+    default=None,
+    type=click.IntRange(min=0),
+    help="Keep up to this many lines of each output of notebook code cells (default 0: drop outputs). Overrides AI_PT_NOTEBOOK_OUTPUTS env var.",
+)
+@click.option(
+    "--redact/--no-redact",
+    default=None,
+    help="Replace API keys, tokens, passwords and other secrets in file contents with [REDACTED]. Overrides AI_PT_REDACT env var.",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Print the time spent redacting secrets to stderr",
+)
+@click.option(
+    "--summarize-dirs",
+    default=None,
+    type=click.IntRange(min=0),
+    help="Summarize directories with more than this many entries instead of listing and reading them (0 disables). Overrides AI_PT_SUMMARIZE_DIRS env var.",
+)
+@click.option(
+    "--tree-style",
+    type=click.Choice(TREE_STYLES),
+    default=None,
+    help="full lists every directory; compact collapses chains of single-directory directories (src/main/java/). Overrides AI_PT_TREE_STYLE env var.",
+)
+@click.option(
+    "--with-deps",
+    is_flag=True,
+    help="With a file PATH, also include the local files it imports (Python, JS/TS relative imports)",
+)
+@click.option(
+    "--deps-depth",
+    default=None,
+    type=click.IntRange(min=0),
+    help="How many levels of imports --with-deps follows. Overrides AI_PT_DEPS_DEPTH env var.",
+)
+@click.option(
+    "--stats",
+    "show_stats",
+    is_flag=True,
+    help="Print files, bytes, lines and estimated tokens per language and the largest files instead of the contents",
+)
+@click.option(
+    "--stat-only",
+    is_flag=True,
+    help="Like --stats, but only stat files without reading them (no line counts, tokens estimated from size)",
+)
+@click.option(
+    "--files-from",
+    type=click.File("rb"),
+    default=None,
+    help="Read the files to analyze from this file, one per line ('-' for stdin), instead of walking the tree",
+)
+@click.option(
+    "--null",
+    "-0",
+    "null_separated",
+    is_flag=True,
+    help="Paths read with --files-from are NUL-separated (git ls-files -z, fd -0)",
+)
+@click.option(
+    "--zero-copy",
+    is_flag=True,
+    help="Copy file contents to the output as raw bytes (sendfile/writev) without decoding them; with redaction on, the bytes scanned for secrets are written. Implies --no-copy.",
+)
+@click.option(
+    "--output-file",
+    "-O",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write the output to this file instead of printing it",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["markdown", "jsonl", "xml"]),
+    default="markdown",
+    help="Output format. jsonl and xml stream one record per file and are never copied to the clipboard.",
+)
+@_in_own_context
 def cli(
-    path: str,
+    paths: tuple[str, ...],
     framework: Optional[str],
     question: Optional[str],
     max_size: Optional[int],
@@ -373,127 +1465,790 @@ def cli(
     no_copy: bool,
     show_config: bool,
     exclude_files: Optional[set[str]],
+    transforms: tuple[str, ...],
+    jobs: Optional[int],
+    use_async: bool,
+    rev: Optional[str],
+    diff_rev: Optional[str],
+    diff_context: int,
+    max_depth: Optional[int],
+    max_files: Optional[int],
+    max_bytes: Optional[int],
+    follow_symlinks: Optional[bool],
+    use_git: Optional[bool],
+    summarize_generated: Optional[bool],
+    notebook_outputs: Optional[int],
+    redact: Optional[bool],
+    profile: bool,
+    summarize_dirs: Optional[int],
+    tree_style: Optional[str],
+    with_deps: bool,
+    deps_depth: Optional[int],
+    show_stats: bool,
+    stat_only: bool,
+    files_from: Optional[BinaryIO],
+    null_separated: bool,
+    zero_copy: bool,
+    output_file: Optional[str],
+    output_format: str,
 ):
     """
     Analyze a project directory and return its structure with code content in AI-friendly format.
 
-    PATH: Project directory path or file path (default: current directory)
+    PATHS: Project directory path or file path (default: current directory)
 
     If PATH is a file, only that file will be analyzed.
     If PATH is a directory, the entire directory will be analyzed.
-
-    Configuration can be set via environment variables:
+    If PATH is a .zip or .tar(.gz/.bz2/.xz) archive, it is analyzed like a
+    directory without being extracted.
+    Several files, directories and glob patterns (quoted, e.g. 'src/**/*.py')
+    select exactly the matching code files, shown under their common directory.
+    With --files-from, the files are read from a list instead, e.g.
+    git ls-files -z | ai-pt --files-from - -0, and no directory is walked.
+
+    Configuration is read from [tool.ai-pt] in pyproject.toml or from
+    .ai-pt.toml in the nearest directory at or above PATH, and can be
+    overridden via environment variables:
       - AI_PT_EXCLUDE_DIRS: Comma-separated list of directories to exclude
       - AI_PT_EXCLUDE_FILES: Comma-separated list of files to exclude
       - AI_PT_MAX_SIZE: Maximum file size in bytes
       - AI_PT_EXTENSIONS: Comma-separated list of file extensions to include
       - AI_PT_MAX_DEPTH: Maximum depth for directory tree
+      - AI_PT_MAX_FILES: Maximum number of files to list and read
+      - AI_PT_MAX_TOTAL_BYTES: Maximum total bytes of file content to read
+      - AI_PT_FOLLOW_SYMLINKS: Descend into symlinked directories (true/false)
+      - AI_PT_USE_GIT: List the files git does not ignore from the git index (true/false)
+      - AI_PT_SUMMARIZE_GENERATED: Summarize lockfiles, generated and minified files
+      - AI_PT_NOTEBOOK_OUTPUTS: Lines kept of each notebook cell output
+      - AI_PT_REDACT: Redact secrets in file contents (true/false)
+      - AI_PT_SUMMARIZE_DIRS: Summarize directories with more entries than this
+      - AI_PT_TREE_STYLE: Tree rendering, full or compact
+      - AI_PT_DEPS_DEPTH: How many levels of imports --with-deps follows
     """
+    if files_from is not None and paths:
+        click.echo("Error: PATHS cannot be combined with --files-from")
+        return
+    if not paths:
+        paths = (os.getcwd(),)
+    # Several paths, any glob or a file list select files instead of a project
+    is_selection = (
+        files_from is not None or len(paths) > 1 or any(is_pattern(p) for p in paths)
+    )
+    path = os.getcwd() if is_selection else paths[0]
+
+    try:
+        settings, config_files = load_project_config(Path(path).resolve(), Config)
+    except ProjectConfigError as e:
+        click.echo(f"Error: invalid configuration: {e}")
+        return
+    if notebook_outputs is not None:
+        # Read by every reader, so it is set on the configuration
+        settings = settings.model_copy(update={"notebook_outputs": notebook_outputs})
+    # In effect for the rest of this run only, the global config is left as is
+    _context_config.set(settings)
+    # --exclude-files adds to the files the settings exclude
+    exclude_files = set(exclude_files) | settings.exclude_files
+
     if show_config:
         click.echo("📋 Current Configuration:")
-        click.echo(f"  Exclude directories: {', '.join(sorted(config.exclude_dirs))}")
-        click.echo(f"  Max file size: {config.max_size} bytes")
-        click.echo(f"  File extensions: {', '.join(sorted(config.extensions))}")
-        click.echo(f"  Max directory depth: {config.max_depth}")
+        click.echo(
+            "  Config files: "
+            + (", ".join(str(f) for f in config_files) or "none (defaults)")
+        )
+        click.echo(f"  Exclude directories: {', '.join(sorted(settings.exclude_dirs))}")
+        click.echo(f"  Exclude files: {', '.join(sorted(exclude_files)) or 'none'}")
+        click.echo(f"  Max file size: {settings.max_size} bytes")
+        click.echo(f"  File extensions: {', '.join(sorted(settings.extensions))}")
+        click.echo(f"  Max directory depth: {settings.max_depth}")
+        click.echo(f"  Max files: {settings.max_files or 'unlimited'}")
+        click.echo(f"  Max total bytes: {settings.max_total_bytes or 'unlimited'}")
+        click.echo(f"  Follow symlinks: {settings.follow_symlinks}")
+        click.echo(f"  Use git index: {settings.use_git}")
+        click.echo(f"  Summarize generated files: {settings.summarize_generated}")
+        click.echo(f"  Notebook output lines: {settings.notebook_outputs}")
+        click.echo(f"  Redact secrets: {settings.redact}")
+        click.echo(f"  Tree style: {settings.tree_style}")
+        click.echo(f"  Dependency depth: {settings.deps_depth}")
+        click.echo(
+            f"  Summarize directories over: {settings.summarize_dirs or 'disabled'} entries"
+        )
         click.echo("\nEnvironment variables used: AI_PT_*")
         click.echo(
             "Example: AI_PT_EXCLUDE_DIRS='dist,build,coverage' ai-pt /path/to/project"
         )
         return
 
+    selection = None
+    if is_selection:
+        if files_from is not None:
+            names = read_file_list(files_from, null_separated)
+            selection, missing = select_listed_files(
+                names, exclude_files=set(exclude_files)
+            )
+            for name in missing:
+                click.echo(f"Warning: '{name}' is not a file", err=True)
+        else:
+            selection, unmatched = expand_paths(paths, exclude_files=set(exclude_files))
+            for pattern in unmatched:
+                click.echo(f"Warning: '{pattern}' matched no code files", err=True)
+        if not selection:
+            click.echo("Error: no code files matched the given paths")
+            return
+        if rev or diff_rev or with_deps:
+            click.echo("Error: --rev, --diff and --with-deps require a single PATH")
+            return
+        path = os.path.commonpath([file_path.parent for file_path in selection])
+
     startpath = Path(path).resolve()
 
     if not startpath.exists():
         click.echo(f"Error: Path '{path}' does not exist")
         return
 
-    # Use CLI max-size if provided, otherwise use config
-    effective_max_size = max_size if max_size is not None else config.max_size
-
     # all what is going to be printed
     all_output = []
 
+    from_archive = is_archive(startpath)
+    is_single_file = startpath.is_file() and not from_archive
+
+    show_stats = show_stats or stat_only
+    if show_stats and output_format != "markdown":
+        click.echo("Error: --stats and --stat-only only support the markdown format")
+        return
+    if diff_rev and (rev or with_deps or show_stats):
+        click.echo(
+            "Error: --diff cannot be combined with --rev, --with-deps or --stats"
+        )
+        return
+
+    # Structured formats are streamed record by record instead of collected
+    writer = None
+    writer_stream = None
+    if output_format != "markdown":
+        writer_stream = (
+            open(output_file, "w", encoding="utf-8") if output_file else sys.stdout
+        )
+        if is_single_file:
+            writer_name = startpath.name
+        elif from_archive:
+            writer_name = archive_root_name(startpath)
+        else:
+            writer_name = startpath.name
+        writer = WRITERS[output_format](writer_stream, writer_name)
+        # File bodies have to be decoded to be escaped
+        zero_copy = False
+
+    redaction = (
+        RedactionStats()
+        if (redact if redact is not None else settings.redact)
+        else None
+    )
+
+    try:
+        _run_analysis(
+            all_output,
+            writer,
+            path=path,
+            startpath=startpath,
+            from_archive=from_archive,
+            is_single_file=is_single_file,
+            framework=framework,
+            question=question,
+            output=output,
+            include_large=include_large,
+            exclude_files=exclude_files,
+            transforms=transforms,
+            jobs=jobs,
+            use_async=use_async,
+            rev=rev,
+            diff_rev=diff_rev,
+            diff_context=diff_context,
+            max_size=max_size,
+            max_depth=max_depth,
+            max_files=max_files,
+            max_bytes=max_bytes,
+            follow_symlinks=follow_symlinks,
+            use_git=use_git,
+            summarize_generated=summarize_generated,
+            summarize_dirs=summarize_dirs,
+            tree_style=tree_style,
+            selection=selection,
+            with_deps=with_deps,
+            deps_depth=deps_depth,
+            show_stats=show_stats,
+            stat_only=stat_only,
+            zero_copy=zero_copy,
+            redaction=redaction,
+        )
+    except ArchiveError as e:
+        all_output.clear()
+        click.echo(f"Error: could not read archive '{path}': {e}")
+        return
+    finally:
+        if writer is not None:
+            writer.close()
+            if output_file:
+                writer_stream.close()
+
+    if profile and redaction is not None:
+        click.echo(redaction.report(), err=True)
+
+    if writer is not None or not all_output:
+        return
+
+    if zero_copy:
+        parts = join_lines(all_output)
+        parts.append(b"\n")
+        if output_file:
+            with open(output_file, "wb") as f:
+                write_parts(f, parts)
+        else:
+            write_parts(sys.stdout.buffer, parts)
+        return
+
+    if output_file:
+        # Line by line, the joined text is only built for the clipboard
+        with open(output_file, "w", encoding="utf-8") as f:
+            for line in all_output:
+                f.write(line)
+                f.write("\n")
+        if no_copy:
+            return
+    ouput_text = "\n".join(all_output)
+    if not output_file:
+        click.echo(ouput_text)
+    if not no_copy and ouput_text:
+        copy_to_clipboard(ouput_text, verbose=True)
+
+
+def _run_analysis(
+    all_output: list,
+    writer,
+    path: str,
+    startpath: Path,
+    from_archive: bool,
+    is_single_file: bool,
+    framework: Optional[str],
+    question: Optional[str],
+    output: str,
+    include_large: bool,
+    exclude_files: Optional[set[str]],
+    transforms: tuple[str, ...],
+    jobs: Optional[int],
+    use_async: bool,
+    rev: Optional[str],
+    diff_rev: Optional[str],
+    diff_context: int,
+    max_size: Optional[int],
+    max_depth: Optional[int],
+    max_files: Optional[int],
+    max_bytes: Optional[int],
+    follow_symlinks: Optional[bool],
+    use_git: Optional[bool],
+    summarize_generated: Optional[bool],
+    summarize_dirs: Optional[int],
+    tree_style: Optional[str],
+    selection: Optional[list[Path]],
+    with_deps: bool,
+    deps_depth: Optional[int],
+    show_stats: bool,
+    stat_only: bool,
+    zero_copy: bool,
+    redaction: Optional[RedactionStats] = None,
+) -> None:
+    """
+    Collect the output of cli in all_output, or stream it to writer.
+
+    all_output is left empty when there is nothing to print. Secrets are
+    redacted from each file right before it is output, unless redaction is
+    None.
+    """
+    settings = active_config()
+    # Library callers do not summarize directories unless asked, the CLI does
+    if summarize_dirs is None:
+        summarize_dirs = settings.summarize_dirs
+    # Use CLI max-size if provided, otherwise use config
+    effective_max_size = max_size if max_size is not None else settings.max_size
+    effective_max_depth = max_depth if max_depth is not None else settings.max_depth
+    effective_max_files = max_files if max_files is not None else settings.max_files
+    effective_max_bytes = (
+        max_bytes if max_bytes is not None else settings.max_total_bytes
+    )
+    effective_tree_style = tree_style or settings.tree_style
+    if summarize_generated is None:
+        summarize_generated = settings.summarize_generated
+    # The file walk only honors the depth limit when it was asked for, the
+    # default depth is meant for the tree
+    files_max_depth = (
+        effective_max_depth
+        if max_depth is not None or "max_depth" in settings.model_fields_set
+        else None
+    )
+
+    revision_entries = None
+    if rev:
+        if not startpath.is_dir():
+            click.echo(
+                "Error: --rev requires PATH to be a directory in a git repository"
+            )
+            return
+        try:
+            revision_entries = list_revision(startpath, rev)
+        except GitError as e:
+            click.echo(f"Error: could not read revision '{rev}': {e}")
+            return
+
+    # The files of a git working copy are listed by git, tracked ones from the index
+    tracked = None
+    if (
+        (use_git if use_git is not None else settings.use_git)
+        and not (
+            follow_symlinks if follow_symlinks is not None else settings.follow_symlinks
+        )
+        and revision_entries is None
+        and not diff_rev
+        and selection is None
+        and startpath.is_dir()
+        and not from_archive
+    ):
+        tracked = list_tracked_files(startpath)
+
     # Add the question at the beginning if provided
     if question:
         formatted_question = format_question_for_output(question)
-        all_output.append("**Question:**")
-        all_output.append(f"{formatted_question}")
-        all_output.append("")
+        if writer:
+            writer.question(formatted_question)
+        else:
+            all_output.append("**Question:**")
+            all_output.append(f"{formatted_question}")
+            all_output.append("")
 
-    if startpath.is_file():
-        # Single file analysis
-        all_output.append("**Single File Analysis:**")
-        all_output.append(f"File: {startpath.name}")
-        all_output.append(f"Path: {startpath.parent}")
-        all_output.append("")
+    if writer and framework:
+        writer.framework(framework)
+
+    if show_stats:
+        _collect_stats(
+            all_output,
+            startpath=startpath,
+            name=Path(path).name,
+            from_archive=from_archive,
+            is_single_file=is_single_file,
+            selection=selection,
+            revision_entries=revision_entries,
+            exclude_files=exclude_files,
+            max_file_size=effective_max_size,
+            budget=TraversalBudget(
+                max_depth=files_max_depth,
+                max_files=effective_max_files,
+                max_bytes=effective_max_bytes,
+            ),
+            follow_symlinks=follow_symlinks,
+            tracked=tracked,
+            summarize_dirs=summarize_dirs,
+            stat_only=stat_only,
+        )
+        return
+
+    selected_files = None
+    if selection is not None:
+        # Exactly the selected files, each read once
+        selected_root = startpath
+        selected_files = []
+        for file_path in selection:
+            file_info = get_single_file_info(
+                file_path, max_file_size=effective_max_size, as_bytes=zero_copy
+            )
+            file_info["path"] = os.path.relpath(file_path, startpath)
+            selected_files.append(file_info)
+    elif with_deps:
+        if not is_single_file:
+            all_output.clear()
+            click.echo("Error: --with-deps requires PATH to be a file")
+            return
+        if not any(str(startpath).endswith(ext) for ext in settings.extensions):
+            all_output.clear()
+            click.echo(f"Error: '{startpath}' is not a supported code file type.")
+            click.echo(
+                f"Supported extensions: {', '.join(sorted(settings.extensions))}"
+            )
+            return
+        # The file and its imports are shown like a small project
+        selected_root, selected_files = get_dependency_files(
+            startpath,
+            max_depth=deps_depth,
+            max_file_size=effective_max_size,
+            as_bytes=zero_copy,
+            workers=jobs,
+        )
+        is_single_file = False
+    elif diff_rev:
+        if not startpath.is_dir():
+            all_output.clear()
+            click.echo(
+                "Error: --diff requires PATH to be a directory in a git repository"
+            )
+            return
+        # Only the changed files, with their hunks as content
+        try:
+            selected_files = get_diff_files_with_content(
+                startpath,
+                diff_rev,
+                context=diff_context,
+                extensions=settings.extensions,
+                max_file_size=effective_max_size,
+                exclude_dirs=settings.exclude_dirs,
+                exclude_files=set(exclude_files),
+            )
+        except GitError as e:
+            all_output.clear()
+            click.echo(f"Error: could not diff against '{diff_rev}': {e}")
+            return
+        if not selected_files:
+            all_output.clear()
+            click.echo(f"No code files changed relative to '{diff_rev}'.")
+            return
+        selected_root = startpath
 
-        file_info = get_single_file_info(startpath, max_file_size=effective_max_size)
+    if is_single_file:
+        # Single file analysis
+        file_info = get_single_file_info(
+            startpath, max_file_size=effective_max_size, as_bytes=zero_copy
+        )
 
         if not file_info:
+            all_output.clear()
             click.echo(f"Error: '{startpath}' is not a supported code file type.")
-            click.echo(f"Supported extensions: {', '.join(sorted(config.extensions))}")
+            click.echo(
+                f"Supported extensions: {', '.join(sorted(settings.extensions))}"
+            )
             return
 
-        all_output.append("=" * 80)
-        all_output.append("FILE CONTENT:")
-        all_output.append("=" * 80)
-        all_output.append("")
-
         if (
             not include_large
             and file_info["error"]
             and "too large" in file_info["error"]
         ):
+            all_output.clear()
             click.echo(f"Skipping large file: {file_info['error']}")
             return
 
-        formatted_output = format_file_for_ai(file_info, framework)
-        all_output.append(formatted_output)
+        if transforms:
+            decode_file_bodies([file_info])
+        run_transforms([file_info], transforms, workers=1)
+        if redaction is not None:
+            redact_file(file_info, redaction)
 
-    else:
-        # Directory analysis
-        startpath_name = Path(path).name
+        if writer:
+            writer.file(file_info)
+            return
 
-        if output in ["structure", "both"]:
+        all_output.append("**Single File Analysis:**")
+        all_output.append(f"File: {startpath.name}")
+        all_output.append(f"Path: {startpath.parent}")
+        all_output.append("")
+        all_output.append("=" * 80)
+        all_output.append("FILE CONTENT:")
+        all_output.append("=" * 80)
+        all_output.append("")
+        all_output.extend(format_file_lines(file_info, framework))
+        return
+
+    # Directory (or archive) analysis
+    startpath_name = archive_root_name(startpath) if from_archive else Path(path).name
+    if selected_files is not None:
+        startpath_name = selected_root.name
+
+    if output in ["structure", "both"]:
+        if selected_files is not None:
+            paths = [Path(info["path"]).as_posix() for info in selected_files]
+            structure = render_path_tree(
+                startpath_name,
+                paths,
+                max(path.count("/") for path in paths),
+                style=effective_tree_style,
+            )
+        elif revision_entries is not None:
+            structure = get_revision_structure(
+                startpath.name,
+                revision_entries,
+                exclude_dirs=settings.exclude_dirs,
+                exclude_files=set(exclude_files),
+                max_depth=effective_max_depth,
+                style=effective_tree_style,
+            )
+        elif from_archive:
+            structure = get_archive_structure(
+                startpath,
+                exclude_dirs=settings.exclude_dirs,
+                exclude_files=set(exclude_files),
+                max_depth=effective_max_depth,
+                style=effective_tree_style,
+            )
+        else:
+            tree_budget = TraversalBudget(
+                max_depth=files_max_depth, max_files=effective_max_files
+            )
+
+            def directory_tree() -> Iterator[str]:
+                yield from iter_directory_structure(
+                    startpath,
+                    exclude_files=exclude_files,
+                    max_depth=effective_max_depth,
+                    budget=tree_budget,
+                    follow_symlinks=follow_symlinks,
+                    summarize_dirs=summarize_dirs,
+                    tree_style=effective_tree_style,
+                    tracked=tracked,
+                )
+                for line in tree_budget.report():
+                    yield f"*Note: {line}*"
+
+            # Lines are rendered straight into the output
+            structure = directory_tree()
+
+        if writer:
+            writer.structure(list(structure))
+        else:
             all_output.append("**Project Structure:**")
             all_output.append(f"Path: {startpath_name}")
             all_output.append("")
-
-            structure = get_directory_structure(startpath, exclude_files=exclude_files)
             all_output.extend(structure)
             all_output.append("")
 
-        if output in ["files", "both"]:
-            code_files = get_code_files_with_content(
-                startpath, max_file_size=effective_max_size, exclude_files=exclude_files
+    if output not in ["files", "both"]:
+        return
+
+    files_budget = None
+    if selected_files is not None:
+        code_files = selected_files
+    elif revision_entries is not None:
+        code_files = get_revision_files_with_content(
+            startpath,
+            revision_entries,
+            extensions=settings.extensions,
+            max_file_size=effective_max_size,
+            exclude_dirs=settings.exclude_dirs,
+            exclude_files=set(exclude_files),
+            extension_map=settings.extension_map,
+            notebook_outputs=settings.notebook_outputs,
+        )
+    elif from_archive:
+        code_files = get_archive_files_with_content(
+            startpath,
+            extensions=settings.extensions,
+            max_file_size=effective_max_size,
+            exclude_dirs=settings.exclude_dirs,
+            exclude_files=set(exclude_files),
+            extension_map=settings.extension_map,
+            notebook_outputs=settings.notebook_outputs,
+        )
+    elif use_async:
+        files_budget = TraversalBudget(
+            max_depth=files_max_depth,
+            max_files=effective_max_files,
+            max_bytes=effective_max_bytes,
+        )
+        code_files = asyncio.run(
+            aget_code_files_with_content(
+                startpath,
+                max_file_size=effective_max_size,
+                exclude_files=exclude_files,
+                budget=files_budget,
+                tracked=tracked,
+                summarize_dirs=summarize_dirs,
+            )
+        )
+    else:
+        files_budget = TraversalBudget(
+            max_depth=files_max_depth,
+            max_files=effective_max_files,
+            max_bytes=effective_max_bytes,
+        )
+        if writer:
+            code_files = iter_code_files(
+                startpath,
+                max_file_size=effective_max_size,
+                exclude_files=exclude_files,
+                budget=files_budget,
+                follow_symlinks=follow_symlinks,
+                summarize_dirs=summarize_dirs,
+                tracked=tracked,
+            )
+        else:
+            # Records are only read when they are formatted
+            code_files = list(
+                iter_file_records(
+                    startpath,
+                    max_file_size=effective_max_size,
+                    exclude_files=exclude_files,
+                    budget=files_budget,
+                    as_bytes=zero_copy,
+                    follow_symlinks=follow_symlinks,
+                    summarize_dirs=summarize_dirs,
+                    tracked=tracked,
+                )
             )
 
-            if not code_files:
-                click.echo("No code files found in the specified directory.")
-                return
+    if writer:
+        for file_info in code_files:
+            if summarize_generated:
+                summarize_file(file_info, effective_max_size)
+            run_transforms([file_info], transforms, workers=1)
+            if redaction is not None:
+                redact_file(file_info, redaction)
+            writer.file(file_info)
+        for line in files_budget.report() if files_budget else []:
+            writer.note(line)
+        return
 
-            all_output.append("=" * 80)
-            all_output.append("CODE FILES:")
-            all_output.append("=" * 80)
-            all_output.append("")
+    if not code_files:
+        all_output.clear()
+        click.echo("No code files found in the specified directory.")
+        return
 
+    if transforms:
+        if summarize_generated:
+            # Before the transforms, which would otherwise work on them
             for file_info in code_files:
-                if (
-                    not include_large
-                    and file_info["error"]
-                    and "too large" in file_info["error"]
-                ):
-                    continue
+                summarize_file(file_info, effective_max_size)
+        decode_file_bodies(code_files)
+        run_transforms(code_files, transforms, workers=jobs)
+
+    all_output.append("=" * 80)
+    all_output.append("CODE FILES:")
+    all_output.append("=" * 80)
+    all_output.append("")
+
+    for file_info in code_files:
+        if file_info["error"] == TOTAL_SIZE_LIMIT_ERROR:
+            continue
+        if summarize_generated and not transforms:
+            # Records are read here, one at a time, as they are formatted
+            summarize_file(file_info, effective_max_size)
+        if (
+            not include_large
+            and file_info["error"]
+            and "too large" in file_info["error"]
+        ):
+            continue
 
-                formatted_output = format_file_for_ai(file_info, framework)
-                all_output.append(formatted_output)
-                all_output.append("-" * 80)
-                all_output.append("")
+        if redaction is not None:
+            redact_file(file_info, redaction)
+        all_output.extend(format_file_lines(file_info, framework))
+        all_output.append("-" * 80)
+        all_output.append("")
 
-    ouput_text = "\n".join(all_output)
-    click.echo(ouput_text)
-    if not no_copy and ouput_text:
-        copy_to_clipboard(ouput_text, verbose=True)
+    for line in files_budget.report() if files_budget else []:
+        all_output.append(f"*Note: {line}*")
+
+
+def _collect_stats(
+    all_output: list,
+    startpath: Path,
+    name: str,
+    from_archive: bool,
+    is_single_file: bool,
+    selection: Optional[list[Path]],
+    revision_entries: Optional[list],
+    exclude_files: Optional[set[str]],
+    max_file_size: int,
+    budget: TraversalBudget,
+    follow_symlinks: Optional[bool],
+    tracked: Optional[TrackedFiles],
+    stat_only: bool,
+    summarize_dirs: Optional[int],
+) -> None:
+    """
+    Append the --stats report for the project to all_output.
+    """
+    settings = active_config()
+    report = ProjectStats()
+    if revision_entries is not None or from_archive:
+        # These sources are read in full anyway
+        if revision_entries is not None:
+            code_files = get_revision_files_with_content(
+                startpath,
+                revision_entries,
+                extensions=settings.extensions,
+                max_file_size=max_file_size,
+                exclude_dirs=settings.exclude_dirs,
+                exclude_files=set(exclude_files),
+                extension_map=settings.extension_map,
+                notebook_outputs=settings.notebook_outputs,
+            )
+        else:
+            code_files = get_archive_files_with_content(
+                startpath,
+                extensions=settings.extensions,
+                max_file_size=max_file_size,
+                exclude_dirs=settings.exclude_dirs,
+                exclude_files=set(exclude_files),
+                extension_map=settings.extension_map,
+                notebook_outputs=settings.notebook_outputs,
+            )
+        for file_info in code_files:
+            if file_info["content"] is None or stat_only:
+                report.add(file_info["path"], file_info["language"], file_info["size"])
+            else:
+                report.add_text(
+                    file_info["path"],
+                    file_info["language"],
+                    file_info["size"],
+                    file_info["content"],
+                )
+    else:
+        if is_single_file or selection is not None:
+            if is_single_file:
+                if startpath.suffix not in settings.extensions:
+                    click.echo(
+                        f"Error: '{startpath}' is not a supported code file type."
+                    )
+                    return
+                root, selection = startpath.parent, [startpath]
+            else:
+                root = startpath
+            records = [
+                FileRecord(
+                    str(root),
+                    os.path.relpath(file_path, root),
+                    get_file_extension_language(file_path),
+                    file_path.stat().st_size,
+                    0.0,
+                    read_file_content,
+                )
+                for file_path in selection
+            ]
+        else:
+            records = iter_file_records(
+                startpath,
+                max_file_size=max_file_size,
+                exclude_files=exclude_files,
+                budget=budget,
+                follow_symlinks=follow_symlinks,
+                summarize_dirs=summarize_dirs,
+                tracked=tracked,
+            )
+        for record in records:
+            # Records are only loaded here when they must not be read
+            if record.loaded and record["error"] != TOTAL_SIZE_LIMIT_ERROR:
+                continue
+            if stat_only or record.loaded:
+                report.add(record.path, record.language, record.size)
+                continue
+            try:
+                lines, tokens = count_file(record.full_path)
+            except OSError:
+                report.add(record.path, record.language, record.size)
+            else:
+                report.add(record.path, record.language, record.size, lines, tokens)
+
+    all_output.append("**Project Statistics:**")
+    all_output.append(f"Path: {name}")
+    all_output.append("")
+    all_output.extend(report.render(stat_only=stat_only))
+    for line in budget.report():
+        all_output.append("")
+        all_output.append(f"*Note: {line}*")
 
 
 if __name__ == "__main__":
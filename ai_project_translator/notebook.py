@@ -0,0 +1,98 @@
+"""
+Extract the cells of Jupyter notebooks instead of sending their raw JSON.
+
+A notebook is mostly outputs: base64 images, HTML tables and long logs. Only
+the markdown cells and the code cells are kept, in order, as markdown text
+with the code in fenced blocks of the notebook's language. Text outputs can
+be kept too, truncated to a few lines each; other outputs are only named.
+"""
+
+import json
+from typing import Optional, Union
+
+NOTEBOOK_SUFFIX = ".ipynb"
+# Notebooks are parsed even when they are over the size limit, which then
+# applies to the extracted cells; larger ones are not read at all
+MAX_NOTEBOOK_SIZE = 100 * 1024 * 1024
+# Longest kept output line; progress bars and data dumps are single lines
+MAX_OUTPUT_LINE = 200
+
+
+def is_notebook(name: str) -> bool:
+    return name.lower().endswith(NOTEBOOK_SUFFIX)
+
+
+def _text(source: Union[str, list[str]]) -> str:
+    # nbformat stores multiline strings as lists of lines
+    return source if isinstance(source, str) else "".join(source)
+
+
+def _output_lines(output: dict) -> list[str]:
+    output_type = output.get("output_type")
+    if output_type == "stream":
+        return _text(output.get("text", "")).splitlines()
+    if output_type == "error":
+        return [f"{output.get('ename', 'Error')}: {output.get('evalue', '')}"]
+    data = output.get("data", {})
+    if "text/plain" in data:
+        return _text(data["text/plain"]).splitlines()
+    return [f"[{mime} output]" for mime in data]
+
+
+def _truncate(lines: list[str], max_lines: int) -> list[str]:
+    kept = [
+        line if len(line) <= MAX_OUTPUT_LINE else line[:MAX_OUTPUT_LINE] + "..."
+        for line in lines[:max_lines]
+    ]
+    if len(lines) > max_lines:
+        kept.append(f"... ({len(lines) - max_lines} more lines)")
+    return kept
+
+
+def render_notebook(notebook: dict, output_lines: int = 0) -> str:
+    """
+    Render the markdown and code cells of a parsed notebook as markdown
+
+    Each output of a code cell is kept with up to output_lines lines; with 0,
+    outputs are dropped.
+    """
+    metadata = notebook.get("metadata", {})
+    language = (
+        metadata.get("kernelspec", {}).get("language")
+        or metadata.get("language_info", {}).get("name")
+        or "python"
+    )
+
+    blocks = []
+    for cell in notebook.get("cells", []):
+        source = _text(cell.get("source", "")).strip("\n")
+        cell_type = cell.get("cell_type")
+        if cell_type == "markdown" and source:
+            blocks.append(source)
+        elif cell_type == "code":
+            if source:
+                blocks.append(f"```{language}\n{source}\n```")
+            if not output_lines:
+                continue
+            for output in cell.get("outputs", []):
+                lines = _truncate(_output_lines(output), output_lines)
+                if lines:
+                    blocks.append("Output:\n```text\n" + "\n".join(lines) + "\n```")
+    return "\n\n".join(blocks) + "\n" if blocks else ""
+
+
+def read_notebook(
+    data: Union[bytes, str], max_size: int, output_lines: int = 0
+) -> tuple[Optional[str], Optional[str]]:
+    """
+    Return the rendered cells of a notebook, or an error, like read_file_content
+    """
+    try:
+        notebook = json.loads(data)
+        content = render_notebook(notebook, output_lines)
+    except (ValueError, AttributeError, TypeError) as e:
+        return None, f"Error reading notebook: {e}"
+    size = len(content.encode("utf-8"))
+    if size > max_size:
+        return None, f"Notebook cells too large ({size} bytes), skipping content"
+    return content, None
@@ -0,0 +1,159 @@
+"""
+Project-local configuration from pyproject.toml and .ai-pt.toml.
+
+The nearest directory at or above PATH with a .ai-pt.toml, or a
+pyproject.toml with a [tool.ai-pt] table, provides the settings; values in
+.ai-pt.toml win over pyproject.toml, environment variables win over both.
+The validated settings are pickled in the user cache directory, keyed on the
+mtimes of the candidate files and the AI_PT_* environment, so later runs with
+the same files skip parsing and validation.
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Any, TypeVar
+
+from pydantic_settings import BaseSettings
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+from ai_project_translator import __version__
+
+CONFIG_FILE = ".ai-pt.toml"
+PYPROJECT_FILE = "pyproject.toml"
+TOOL_TABLE = "ai-pt"
+ENV_PREFIX = "AI_PT_"
+
+SettingsT = TypeVar("SettingsT", bound=BaseSettings)
+
+
+class ProjectConfigError(Exception):
+    """Raised when a config file cannot be read or has invalid settings."""
+
+
+def cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return Path(base, "ai-pt")
+
+
+def _read_toml(path: Path) -> dict:
+    try:
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        raise ProjectConfigError(f"{path}: {e}") from e
+
+
+def candidate_files(directory: Path) -> list[Path]:
+    """
+    List the pyproject.toml and .ai-pt.toml files at or above directory
+    """
+    return [
+        candidate / name
+        for candidate in (directory, *directory.parents)
+        for name in (PYPROJECT_FILE, CONFIG_FILE)
+        if (candidate / name).is_file()
+    ]
+
+
+def find_config_files(directory: Path) -> list[Path]:
+    """
+    Find the config files that apply to directory, in increasing priority
+    """
+    for candidate in (directory, *directory.parents):
+        files = []
+        pyproject = candidate / PYPROJECT_FILE
+        if pyproject.is_file() and TOOL_TABLE in _read_toml(pyproject).get("tool", {}):
+            files.append(pyproject)
+        local = candidate / CONFIG_FILE
+        if local.is_file():
+            files.append(local)
+        if files:
+            return files
+    return []
+
+
+def read_settings(files: list[Path]) -> dict[str, Any]:
+    """
+    Merge the settings of the config files; keys may use dashes
+    """
+    settings: dict[str, Any] = {}
+    for path in files:
+        data = _read_toml(path)
+        if path.name == PYPROJECT_FILE:
+            data = data["tool"][TOOL_TABLE]
+        settings.update({key.replace("-", "_"): value for key, value in data.items()})
+    return settings
+
+
+def _cache_key(settings_cls: type, files: list[Path]) -> str:
+    digest = hashlib.sha256()
+    digest.update(f"{__version__}\0{sorted(settings_cls.model_fields)}".encode())
+    for path in files:
+        stat = path.stat()
+        digest.update(f"\0{path}\0{stat.st_mtime_ns}\0{stat.st_size}".encode())
+    for key in sorted(os.environ):
+        if key.upper().startswith(ENV_PREFIX):
+            digest.update(f"\0{key}={os.environ[key]}".encode())
+    return digest.hexdigest()
+
+
+def load_project_config(
+    start: Path, settings_cls: type[SettingsT]
+) -> tuple[SettingsT, list[Path]]:
+    """
+    Build the settings for a project at start and return them with their files
+
+    Without config files, this is just settings_cls().
+    """
+    directory = start if start.is_dir() else start.parent
+    candidates = candidate_files(directory)
+    if not candidates:
+        return settings_cls(), []
+
+    # A hit only needs the stat calls above: no TOML parsing or validation
+    key = _cache_key(settings_cls, candidates)
+    location = hashlib.sha256(str(directory).encode()).hexdigest()[:16]
+    cache_file = cache_dir() / f"config-{location}.pickle"
+    try:
+        with open(cache_file, "rb") as f:
+            cached_key, cached, files = pickle.load(f)
+        if cached_key == key and isinstance(cached, settings_cls):
+            return cached, files
+    except Exception:
+        # Missing, stale or unreadable cache entries are rebuilt
+        pass
+
+    files = find_config_files(directory)
+    if not files:
+        return settings_cls(), files
+
+    environment = settings_cls()
+    settings = read_settings(files)
+    # Environment variables take precedence over the files
+    settings.update(
+        {name: getattr(environment, name) for name in environment.model_fields_set}
+    )
+    try:
+        config = settings_cls(**settings)
+    except ValueError as e:
+        names = ", ".join(str(path) for path in files)
+        raise ProjectConfigError(f"{names}: {e}") from e
+
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temporary = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(temporary, "wb") as f:
+            pickle.dump((key, config, files), f)
+        os.replace(temporary, cache_file)
+    except OSError:
+        pass
+    return config, files
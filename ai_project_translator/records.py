@@ -0,0 +1,149 @@
+"""
+Compact file records whose content is loaded on first access.
+
+A walk over a large project keeps one FileRecord per file instead of a dict,
+a Path object and the file's content. Records behave like the file info dicts
+used everywhere else, so they can be formatted and transformed directly.
+"""
+
+import os
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+# Keys of the file info dicts returned by the public functions
+DICT_KEYS = ("path", "full_path", "language", "content", "error", "size")
+_KEYS = DICT_KEYS + ("mtime",)
+
+# Errors of the records whose content a walk leaves out
+TOTAL_SIZE_LIMIT_ERROR = "Total size limit reached, skipping content"
+SAME_FILE_ERROR = "Same file as {}, skipping content"
+
+
+class FileRecord(MutableMapping):
+    """
+    A file found by a walk: path, size and mtime, with content loaded lazily.
+
+    reader is called with the full path and returns (content, error), like
+    read_file_content. It is usually shared by all the records of a walk.
+    """
+
+    __slots__ = (
+        "path",
+        "root",
+        "language",
+        "size",
+        "mtime",
+        "_reader",
+        "_content",
+        "_error",
+        "_loaded",
+        "_extra",
+    )
+
+    def __init__(
+        self,
+        root: str,
+        path: str,
+        language: str,
+        size: int,
+        mtime: float,
+        reader: Callable[[str], tuple[Any, Optional[str]]],
+    ):
+        self.root = root
+        self.path = path
+        self.language = language
+        self.size = size
+        self.mtime = mtime
+        self._reader = reader
+        self._content = None
+        self._error = None
+        self._loaded = False
+        self._extra = None
+
+    @property
+    def full_path(self) -> Path:
+        return Path(self.root, self.path)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self) -> None:
+        """
+        Read the content if it has not been read yet
+        """
+        if not self._loaded:
+            self._content, self._error = self._reader(
+                os.path.join(self.root, self.path)
+            )
+            self._loaded = True
+
+    def set_result(self, content: Any, error: Optional[str]) -> None:
+        """
+        Set the content or error without reading the file
+        """
+        self._content = content
+        self._error = error
+        self._loaded = True
+
+    def release(self) -> None:
+        """
+        Drop the loaded content so it can be freed; it is read again on access
+        """
+        self._content = None
+        self._error = None
+        self._loaded = False
+
+    def to_dict(self) -> dict:
+        """
+        Load the content and return a plain file info dict
+        """
+        return {key: self[key] for key in self}
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "content":
+            self.load()
+            return self._content
+        if key == "error":
+            self.load()
+            return self._error
+        if key == "full_path":
+            return self.full_path
+        if key in _KEYS:
+            return getattr(self, key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == "content":
+            self.load()
+            self._content = value
+        elif key == "error":
+            self.load()
+            self._error = value
+        elif key in ("path", "language", "size", "mtime"):
+            setattr(self, key, value)
+        elif key == "full_path":
+            raise KeyError("full_path is derived from root and path")
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if self._extra is None or key not in self._extra:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from DICT_KEYS
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return len(DICT_KEYS) + (len(self._extra) if self._extra else 0)
+
+    def __repr__(self) -> str:
+        return f"FileRecord({self.path!r}, size={self.size})"
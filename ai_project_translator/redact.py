@@ -0,0 +1,289 @@
+"""
+Redaction of secrets in file contents before they are output or copied.
+
+Files are scanned as UTF-8 bytes, in a few passes that each run at C speed:
+
+- One translation marks the characters that can make up a token; every run
+  of such characters long enough to be a key is then checked against all the
+  known secret formats (one combined pattern) and for high entropy.
+- Secret-looking names (password, token, api_key, ...) are found with
+  substring searches on the lowercased bytes and their assigned values are
+  replaced.
+- URLs with credentials and private key blocks are found from their fixed
+  markers.
+
+Only the secret itself is replaced; key names and the surrounding text are
+kept. Files without secrets are left untouched, and are not even decoded.
+"""
+
+import math
+import re
+import time
+from collections import Counter
+from typing import Optional, Union
+
+from ai_project_translator.sink import FileBody
+
+REDACTED = "[REDACTED]"
+
+# Shortest run of token characters that can hold a known secret format
+MIN_SECRET_LENGTH = 16
+# Tokens at least this long are checked for entropy; longer ones are data
+# (embedded images, fonts) rather than credentials
+MIN_ENTROPY_LENGTH = 32
+MAX_ENTROPY_LENGTH = 200
+# Bits per character; random base64 is above, most identifiers and words below
+ENTROPY_THRESHOLD = 4.0
+# Share of a token covered by words (Name, name): most of an identifier,
+# little of a random token
+MAX_WORD_SHARE = 0.5
+
+# Languages in which unquoted values are literals rather than expressions
+CONFIG_LANGUAGES = {"yaml", "toml", "text", "markdown", "json", "bash"}
+
+# Known secret formats, matched at the start of runs of token characters
+SECRET_PATTERNS = {
+    "aws_access_key": rb"(?:AKIA|ASIA|ABIA|ACCA)[0-9A-Z]{16}",
+    "github_token": rb"gh[pousr]_[A-Za-z0-9]{36,255}|github_pat_\w{22,255}",
+    "gitlab_token": rb"glpat-[\w-]{20,}",
+    "slack_token": rb"xox[abposr]-[A-Za-z0-9-]{10,}",
+    "stripe_key": rb"[rs]k_(?:live|test)_[A-Za-z0-9]{16,}",
+    "google_api_key": rb"AIza[\w-]{35}",
+    "openai_key": rb"sk-(?:ant-|proj-)?[\w-]{20,}",
+    "npm_token": rb"npm_[A-Za-z0-9]{36}",
+    "pypi_token": rb"pypi-AgE[\w-]{50,}",
+    "jwt": rb"eyJ[\w-]{10,}\.eyJ[\w-]{10,}\.[\w-]{10,}",
+}
+
+_TOKEN_CHARS = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/_-"
+_TOKEN_TABLE = bytes(1 if i in _TOKEN_CHARS else 0 for i in range(256))
+_RUN_MARKER = b"\x01" * MIN_SECRET_LENGTH
+_RUN_RE = re.compile(b"\x01+")
+
+_KNOWN_RE = re.compile(b"(?:" + b"|".join(SECRET_PATTERNS.values()) + rb")(?![\w+/-])")
+# Words in names: random tokens are not made of them
+_WORD_RE = re.compile(rb"[A-Z]?[a-z]{3,}|[A-Z]{3,}")
+# Alphabets spelled out in code have high entropy too
+_ALPHABETS = (b"ABCDEFGH", b"abcdefgh", b"01234567")
+# Hashes that are published on purpose (subresource integrity, lockfiles)
+_HASH_PREFIXES = (b"sha1-", b"sha256-", b"sha384-", b"sha512-", b"base64,")
+
+# Lowercase markers of secret-looking names, and the name and value after them
+SECRET_NAMES = (b"passw", b"pwd", b"secret", b"token", b"credential", b"key")
+_ASSIGNMENT_RE = re.compile(
+    rb"(?:passw(?:or)?d|pwd|secret|token|credential|key)s?"
+    rb"(?:[_.-]?(?:access|key|value|secret|token|hash|base))*"
+    rb"[\"']?[ \t]*[:=][ \t]*(?P<quote>[\"']?)"
+    rb"(?P<value>[^\s\"'`#,;(){}\[\]<>$]{8,})",
+    re.IGNORECASE,
+)
+# "key" alone is too common; only these kinds of keys are secrets
+_KEY_PREFIX_RE = re.compile(
+    rb"(?:api|access|private|secret|auth|signing|encryption|master)[_-]?\Z"
+)
+
+_SENDGRID_RE = re.compile(rb"SG\.[\w-]{22}\.[\w-]{43}(?![\w+/-])")
+_URL_CREDENTIALS_RE = re.compile(rb"[^/\s:@\"']+:([^/\s@\"']{3,})@")
+_PRIVATE_KEY_RE = re.compile(
+    rb"-----BEGIN[A-Z ]*PRIVATE KEY-----[\s\S]*?-----END[A-Z ]*PRIVATE KEY-----"
+)
+
+
+def shannon_entropy(token: Union[str, bytes]) -> float:
+    """
+    Bits of information per character of token
+    """
+    length = len(token)
+    return -sum(
+        count / length * math.log2(count / length) for count in Counter(token).values()
+    )
+
+
+def is_random_token(token: bytes) -> bool:
+    """
+    Check whether a token looks like a random key rather than a name or word
+    """
+    if any(alphabet in token for alphabet in _ALPHABETS):
+        return False
+    words = sum(len(word) for word in _WORD_RE.findall(token))
+    if words >= MAX_WORD_SHARE * len(token):
+        return False
+    return shannon_entropy(token) >= ENTROPY_THRESHOLD
+
+
+def _in_url(data: bytes, position: int) -> bool:
+    # Commit hashes and ids in the path of a link are not secrets
+    line_start = data.rfind(b"\n", 0, position) + 1
+    url = data.rfind(b"://", line_start, position)
+    return url != -1 and not any(
+        space in data[url:position] for space in (b" ", b"\t", b'"', b"'")
+    )
+
+
+def _is_encoded_line(data: bytes, start: int, end: int) -> bool:
+    # MIME and PEM bodies wrap base64 into whole lines of 60, 64 or 76 chars
+    line_end = data.find(b"\n", end)
+    line_end = len(data) if line_end == -1 else line_end
+    line = data[data.rfind(b"\n", 0, start) + 1 : line_end].rstrip(b"\r=")
+    return len(line) in (60, 64, 76) and end - start >= len(line) - 4
+
+
+def _token_spans(data: bytes) -> list[tuple[int, int]]:
+    spans = []
+    # Runs of token characters are found by byte searches over a marked copy
+    marked = data.translate(_TOKEN_TABLE)
+    position = marked.find(_RUN_MARKER)
+    while position != -1:
+        end = _RUN_RE.match(marked, position).end()
+        match = _KNOWN_RE.match(data, position)
+        if match:
+            spans.append(match.span())
+            end = max(end, match.end())
+        elif MIN_ENTROPY_LENGTH <= end - position <= MAX_ENTROPY_LENGTH:
+            token = data[position:end]
+            if not (
+                token.startswith(_HASH_PREFIXES)
+                or data[max(0, position - 7) : position].endswith(_HASH_PREFIXES)
+                or (b"/" in token and _in_url(data, position))
+                or _is_encoded_line(data, position, end)
+            ) and is_random_token(token):
+                spans.append((position, end))
+        position = marked.find(_RUN_MARKER, end)
+    return spans
+
+
+def _assignment_spans(data: bytes, language: str) -> list[tuple[int, int]]:
+    spans = []
+    lowered = data.lower()
+    literal_values = language in CONFIG_LANGUAGES
+    for name in SECRET_NAMES:
+        position = lowered.find(name)
+        while position != -1:
+            match = _ASSIGNMENT_RE.match(data, position)
+            if (
+                match
+                and (
+                    name != b"key"
+                    or _KEY_PREFIX_RE.search(lowered, max(0, position - 12), position)
+                )
+                and (
+                    match.group("quote")
+                    # Unquoted config values are literals. References
+                    # ($VAR, ${...}, {{ }}) stop the value pattern, and YAML
+                    # tags (!ENV) say where the value comes from
+                    or (literal_values and not match.group("value").startswith(b"!"))
+                )
+                and not match.group("value").isdigit()
+            ):
+                spans.append(match.span("value"))
+            position = lowered.find(name, position + len(name))
+    return spans
+
+
+def _marker_spans(data: bytes) -> list[tuple[int, int]]:
+    spans = []
+    position = data.find(b"://")
+    while position != -1:
+        match = _URL_CREDENTIALS_RE.match(data, position + 3)
+        if match:
+            spans.append(match.span(1))
+        position = data.find(b"://", position + 3)
+    spans.extend(match.span() for match in _SENDGRID_RE.finditer(data))
+    if b"PRIVATE KEY-----" in data:
+        spans.extend(match.span() for match in _PRIVATE_KEY_RE.finditer(data))
+    return spans
+
+
+def find_secrets(data: bytes, language: str = "text") -> list[tuple[int, int]]:
+    """
+    Return the sorted, non-overlapping byte ranges of the secrets in data
+    """
+    spans = sorted(
+        _token_spans(data) + _assignment_spans(data, language) + _marker_spans(data)
+    )
+    merged: list[tuple[int, int]] = []
+    for start, end in spans:
+        if merged and start < merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def redact_bytes(data: bytes, spans: list[tuple[int, int]]) -> bytes:
+    """
+    Replace the given byte ranges of data
+    """
+    parts = []
+    previous = 0
+    for start, end in spans:
+        parts.append(data[previous:start])
+        parts.append(REDACTED.encode())
+        previous = end
+    parts.append(data[previous:])
+    return b"".join(parts)
+
+
+def redact(content: str, language: str = "text") -> tuple[str, int]:
+    """
+    Replace the secrets in content and return the result and their number
+    """
+    data = content.encode("utf-8", errors="surrogatepass")
+    spans = find_secrets(data, language)
+    if not spans:
+        return content, 0
+    redacted = redact_bytes(data, spans).decode("utf-8", errors="surrogatepass")
+    return redacted, len(spans)
+
+
+class RedactionStats:
+    """
+    Files, bytes and secrets seen by the redaction pass, and the time it took.
+    """
+
+    def __init__(self):
+        self.files = 0
+        self.bytes = 0
+        self.secrets = 0
+        self.redacted_files: list[str] = []
+        self.seconds = 0.0
+
+    def report(self) -> str:
+        rate = self.bytes / self.seconds / 1e6 if self.seconds else 0.0
+        return (
+            f"redaction: {self.seconds:.3f}s for {self.files} files, "
+            f"{self.bytes} bytes ({rate:.0f} MB/s), {self.secrets} secrets redacted"
+        )
+
+
+def redact_file(file_info: dict, stats: Optional[RedactionStats] = None) -> int:
+    """
+    Redact the content of a file info in place and return the number of secrets
+
+    A FileBody is read to be scanned and replaced by the bytes that were
+    scanned, redacted if needed, so that the output neither reads the file a
+    second time nor sends what changed in it since the scan.
+    """
+    content = file_info["content"]
+    if content is None:
+        return 0
+    start = time.perf_counter()
+    if isinstance(content, FileBody):
+        data = content.read()
+    else:
+        data = content.encode("utf-8", errors="surrogatepass")
+    spans = find_secrets(data, file_info["language"])
+    if isinstance(content, FileBody):
+        file_info["content"] = redact_bytes(data, spans) if spans else data
+    elif spans:
+        file_info["content"] = redact_bytes(data, spans).decode(
+            "utf-8", errors="ignore"
+        )
+    if stats is not None:
+        stats.files += 1
+        stats.bytes += len(data)
+        stats.secrets += len(spans)
+        if spans:
+            stats.redacted_files.append(str(file_info["path"]))
+        stats.seconds += time.perf_counter() - start
+    return len(spans)
@@ -0,0 +1,250 @@
+"""
+Library API for programs that scan projects in-process.
+
+The module-level functions in main read the Config in effect in the current
+context, and the global config outside of one. A ProjectScanner holds its own
+Config and runs the same walks in a context where that Config is in effect,
+like each CLI run does with the project's settings, so scanners with
+different settings can be used side by side without touching the global one.
+A scanner also keeps warm state between calls, so scanning the same project
+again only reads what changed:
+
+    scanner = ProjectScanner("path/project")
+    for info in scanner.iter_files():
+        index(info["path"], info["content"])
+    scanner.render(sys.stdout)
+"""
+
+import os
+from collections import OrderedDict
+from contextvars import Context
+from pathlib import Path
+from typing import Iterator, Optional, TextIO, TypeVar, Union
+
+from ai_project_translator.formats import WRITERS
+from ai_project_translator.generated import summarize_file
+from ai_project_translator.git_index import (
+    TrackedFiles,
+    find_repository,
+    list_tracked_files,
+    read_tracked_files,
+)
+from ai_project_translator.main import (
+    TOTAL_SIZE_LIMIT_ERROR,
+    Config,
+    TraversalBudget,
+    config_context,
+    format_file_lines,
+    format_question_for_output,
+    iter_directory_structure,
+    iter_file_records,
+)
+from ai_project_translator.project_config import load_project_config
+from ai_project_translator.records import FileRecord
+from ai_project_translator.redact import redact_file
+
+# Total size of the file contents kept between calls
+CACHE_BYTES = 64 * 1024 * 1024
+
+T = TypeVar("T")
+
+
+def _in_context(context: Context, iterator: Iterator[T]) -> Iterator[T]:
+    # Each step of the walk runs in the scanner's context, and the caller's
+    # context is left as it was between steps
+    while True:
+        try:
+            item = context.run(next, iterator)
+        except StopIteration:
+            return
+        yield item
+
+
+class ProjectScanner:
+    """
+    Scan a project directory with its own configuration and caches.
+
+    config defaults to the settings the CLI would use for path: the project's
+    config file and the AI_PT_* environment variables. Between calls the
+    scanner keeps the tracked files of a git working copy, until the index
+    changes (untracked files are listed every time), and up to cache_bytes of file contents, each until its file
+    changes. Different scanners can be used from different threads; one
+    scanner is used by one thread at a time.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        config: Optional[Config] = None,
+        cache_bytes: int = CACHE_BYTES,
+    ):
+        self.path = Path(path).resolve()
+        if not self.path.is_dir():
+            raise NotADirectoryError(f"'{path}' is not a directory")
+        if config is None:
+            config, _ = load_project_config(self.path, Config)
+        self.config = config
+        self.cache_bytes = cache_bytes
+        self._index_key: Optional[tuple[int, int]] = None
+        self._index_files: Optional[list[str]] = None
+        # Relative path -> (st_size, st_mtime_ns, content, error), oldest first
+        self._contents: OrderedDict[str, tuple] = OrderedDict()
+        self._cached_bytes = 0
+
+    def tracked_files(self) -> Optional[TrackedFiles]:
+        """
+        Return the files git lists, or None when the directory is walked
+
+        The index is only read again once it has changed; the untracked files
+        are listed on every call.
+        """
+        if not self.config.use_git or self.config.follow_symlinks:
+            return None
+        repository = find_repository(self.path)
+        if repository is None:
+            return None
+        try:
+            stat = os.stat(repository[1] / "index")
+            key = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            key = None
+        if key is None or key != self._index_key:
+            self._index_files = read_tracked_files(self.path)
+            self._index_key = key
+        return list_tracked_files(self.path, self._index_files)
+
+    def iter_tree(self, budget: Optional[TraversalBudget] = None) -> Iterator[str]:
+        """
+        Yield the lines of the directory tree
+
+        budget defaults to the limits of the config, like in iter_files.
+        """
+        if budget is None:
+            budget = self._files_budget()
+        lines = iter_directory_structure(
+            self.path,
+            budget=budget,
+            summarize_dirs=self.config.summarize_dirs,
+            tracked=self.tracked_files(),
+        )
+        yield from _in_context(config_context(self.config), lines)
+
+    def iter_files(self, budget: Optional[TraversalBudget] = None) -> Iterator[dict]:
+        """
+        Yield the file info of every code file, in path order, as it is read
+
+        Contents are summarized and redacted as the config says. budget
+        defaults to the depth, file and byte limits of the config.
+        """
+        if budget is None:
+            budget = self._files_budget()
+        records = iter_file_records(
+            self.path,
+            budget=budget,
+            summarize_dirs=self.config.summarize_dirs,
+            tracked=self.tracked_files(),
+        )
+        context = config_context(self.config)
+        for record in _in_context(context, records):
+            yield context.run(self._file_info, record)
+
+    def render(
+        self,
+        sink: TextIO,
+        output_format: str = "markdown",
+        question: Optional[str] = None,
+        framework: Optional[str] = None,
+    ) -> None:
+        """
+        Write the tree and the files to sink, like the CLI does
+
+        output_format is markdown, jsonl or xml. Files are written as they
+        are read; nothing is collected first.
+        """
+        name = self.path.name
+        files_budget = self._files_budget()
+        # The tree takes the files the file walk takes, like in the CLI
+        tree_budget = TraversalBudget(
+            max_depth=files_budget.max_depth, max_files=self.config.max_files
+        )
+        if output_format != "markdown":
+            writer = WRITERS[output_format](sink, name)
+            if question:
+                writer.question(format_question_for_output(question))
+            if framework:
+                writer.framework(framework)
+            writer.structure(list(self.iter_tree(tree_budget)))
+            for file_info in self.iter_files(files_budget):
+                writer.file(file_info)
+            for line in files_budget.report():
+                writer.note(line)
+            writer.close()
+            return
+
+        if question:
+            sink.write(f"**Question:**\n{format_question_for_output(question)}\n\n")
+        sink.write(f"**Project Structure:**\nPath: {name}\n\n")
+        for line in self.iter_tree(tree_budget):
+            sink.write(line + "\n")
+        for line in tree_budget.report():
+            sink.write(f"*Note: {line}*\n")
+        sink.write("\n" + "=" * 80 + "\nCODE FILES:\n" + "=" * 80 + "\n\n")
+        for file_info in self.iter_files(files_budget):
+            error = file_info["error"]
+            if error == TOTAL_SIZE_LIMIT_ERROR or (error and "too large" in error):
+                continue
+            sink.write("\n".join(format_file_lines(file_info, framework)) + "\n")
+            sink.write("-" * 80 + "\n\n")
+        for line in files_budget.report():
+            sink.write(f"*Note: {line}*\n")
+
+    def _files_budget(self) -> TraversalBudget:
+        # Like in the CLI, the depth only limits the files when it was set
+        return TraversalBudget(
+            max_depth=(
+                self.config.max_depth
+                if "max_depth" in self.config.model_fields_set
+                else None
+            ),
+            max_files=self.config.max_files,
+            max_bytes=self.config.max_total_bytes,
+        )
+
+    def _file_info(self, record: FileRecord) -> dict:
+        if record.loaded:
+            # Left out by the walk (byte limit, same file), nothing to read
+            return record.to_dict()
+        try:
+            stat = os.stat(record.full_path)
+            key = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            key = None
+
+        cached = self._contents.get(record.path)
+        if key is not None and cached is not None and cached[:2] == key:
+            self._contents.move_to_end(record.path)
+            record.set_result(cached[2], cached[3])
+            return record.to_dict()
+
+        if self.config.summarize_generated:
+            summarize_file(record, self.config.max_size)
+        file_info = record.to_dict()
+        if self.config.redact:
+            redact_file(file_info)
+        if key is not None:
+            self._store(record.path, key, file_info["content"], file_info["error"])
+        return file_info
+
+    def _store(self, path: str, key: tuple, content, error) -> None:
+        size = len(content) if isinstance(content, str) else 0
+        if size > self.cache_bytes:
+            return
+        previous = self._contents.pop(path, None)
+        if previous is not None and isinstance(previous[2], str):
+            self._cached_bytes -= len(previous[2])
+        self._contents[path] = (*key, content, error)
+        self._cached_bytes += size
+        while self._cached_bytes > self.cache_bytes:
+            _, evicted = self._contents.popitem(last=False)
+            if isinstance(evicted[2], str):
+                self._cached_bytes -= len(evicted[2])
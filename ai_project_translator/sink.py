@@ -0,0 +1,169 @@
+"""
+Bytes-level output path that avoids copying file contents through Python.
+
+Output is a sequence of parts: encoded text and FileBody references. Text is
+written with os.writev and file bodies are copied by the kernel with
+os.sendfile, so file contents are never decoded, joined or re-encoded.
+"""
+
+import errno
+import io
+import os
+from pathlib import Path
+from typing import BinaryIO, Iterable, Union
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Conservative limit on buffers per writev call (IOV_MAX is 1024 on Linux)
+MAX_IOVECS = 512
+
+_SENDFILE_UNSUPPORTED = {
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTSOCK,
+    errno.EOPNOTSUPP,
+}
+
+
+class FileBody:
+    """
+    Reference to a file's bytes, written to the sink without being loaded.
+    """
+
+    __slots__ = ("path", "size")
+
+    def __init__(self, path: Path, size: int):
+        self.path = path
+        self.size = size
+
+    def read(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def text(self) -> str:
+        """
+        Decode the file for stages that need text
+        """
+        return self.read().decode("utf-8", errors="ignore")
+
+    def __repr__(self) -> str:
+        return f"FileBody({str(self.path)!r}, {self.size})"
+
+
+Part = Union[bytes, memoryview, FileBody]
+
+
+def join_lines(lines: Iterable[Union[str, bytes, FileBody]]) -> list[Part]:
+    """
+    Encode output lines like "\\n".join(lines), keeping file bodies as references
+
+    Lines that are bytes already (file contents read for redaction) are
+    written as they are.
+    """
+    parts: list[Part] = []
+    text: list[str] = []
+    first = True
+    for line in lines:
+        if not first:
+            text.append("\n")
+        first = False
+        if isinstance(line, (FileBody, bytes)):
+            if text:
+                parts.append("".join(text).encode("utf-8"))
+                text = []
+            parts.append(line)
+        else:
+            text.append(line)
+    if text:
+        parts.append("".join(text).encode("utf-8"))
+    return parts
+
+
+def _get_fileno(stream: BinaryIO):
+    try:
+        return stream.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+def _write_all(fd: int, buffers: list) -> None:
+    views = [memoryview(b).cast("B") for b in buffers if len(b)]
+    while views:
+        if hasattr(os, "writev"):
+            written = os.writev(fd, views[:MAX_IOVECS])
+        else:
+            written = os.write(fd, views[0])
+        while views and written >= len(views[0]):
+            written -= len(views[0])
+            views.pop(0)
+        if written:
+            views[0] = views[0][written:]
+
+
+def _copy_body(body: FileBody, write) -> None:
+    buffer = bytearray(COPY_CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(body.path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            write(view[:n])
+
+
+class PartsWriter:
+    """
+    Write parts to a binary stream, using the kernel where possible.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.fd = _get_fileno(stream)
+        self.use_sendfile = self.fd is not None and hasattr(os, "sendfile")
+
+    def _write_fd(self, data) -> None:
+        _write_all(self.fd, [data])
+
+    def _send_body(self, body: FileBody) -> None:
+        if self.use_sendfile:
+            with open(body.path, "rb") as f:
+                offset = 0
+                try:
+                    while True:
+                        sent = os.sendfile(self.fd, f.fileno(), offset, COPY_CHUNK_SIZE)
+                        if sent == 0:
+                            return
+                        offset += sent
+                except OSError as e:
+                    if e.errno not in _SENDFILE_UNSUPPORTED or offset:
+                        raise
+                    self.use_sendfile = False
+        _copy_body(body, self._write_fd)
+
+    def write(self, parts: Iterable[Part]) -> None:
+        if self.fd is None:
+            for part in parts:
+                if isinstance(part, FileBody):
+                    _copy_body(part, self.stream.write)
+                else:
+                    self.stream.write(part)
+            self.stream.flush()
+            return
+
+        self.stream.flush()
+        pending = []
+        for part in parts:
+            if isinstance(part, FileBody):
+                _write_all(self.fd, pending)
+                pending = []
+                self._send_body(part)
+            else:
+                pending.append(part)
+        _write_all(self.fd, pending)
+
+
+def write_parts(stream: BinaryIO, parts: Iterable[Part]) -> None:
+    """
+    Write encoded text and file bodies to a binary stream
+    """
+    PartsWriter(stream).write(parts)
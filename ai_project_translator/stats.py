@@ -0,0 +1,146 @@
+"""
+cloc-style statistics: files, bytes, lines and estimated tokens per language.
+
+Files are counted as they are found by the walk. Lines are counted with
+bytes.count over fixed-size chunks, so a file is never held in memory or
+split into lines; in stat-only mode only the sizes from os.stat are used.
+"""
+
+import codecs
+import heapq
+from pathlib import Path
+from typing import Optional
+
+from ai_project_translator.transforms import estimate_tokens
+
+COUNT_CHUNK_SIZE = 64 * 1024
+LARGEST_FILES = 10
+
+# Rough size of a token, used when contents are not read
+BYTES_PER_TOKEN = 4
+
+
+def count_file(path: str | Path, chunk_size: int = COUNT_CHUNK_SIZE) -> tuple[int, int]:
+    """
+    Count the lines and estimated tokens of a file in one buffered pass
+
+    A last line without a trailing newline is counted as a line.
+    """
+    lines = 0
+    tokens = 0
+    last = b"\n"
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            lines += chunk.count(b"\n")
+            tokens += estimate_tokens(decoder.decode(chunk))
+            last = chunk[-1:]
+    tokens += estimate_tokens(decoder.decode(b"", final=True))
+    if last != b"\n":
+        lines += 1
+    return lines, tokens
+
+
+class ProjectStats:
+    """
+    Totals per language and the largest files of a project.
+
+    lines and tokens are None for files whose content was not counted.
+    """
+
+    def __init__(self, largest: int = LARGEST_FILES):
+        self.languages: dict[str, dict[str, int]] = {}
+        self.largest = largest
+        self.uncounted = 0
+        self._largest: list[tuple[int, str]] = []
+
+    def add(
+        self,
+        path: str,
+        language: str,
+        size: int,
+        lines: Optional[int] = None,
+        tokens: Optional[int] = None,
+    ) -> None:
+        totals = self.languages.get(language)
+        if totals is None:
+            totals = self.languages[language] = {
+                "files": 0,
+                "bytes": 0,
+                "lines": 0,
+                "tokens": 0,
+            }
+        totals["files"] += 1
+        totals["bytes"] += size
+        if lines is None:
+            self.uncounted += 1
+        else:
+            totals["lines"] += lines
+            totals["tokens"] += tokens or 0
+
+        # Keep only the largest files in a bounded min-heap
+        if len(self._largest) < self.largest:
+            heapq.heappush(self._largest, (size, path))
+        elif self.largest:
+            heapq.heappushpop(self._largest, (size, path))
+
+    def add_text(self, path: str, language: str, size: int, content: str) -> None:
+        """
+        Count a file whose content is already decoded
+        """
+        lines = content.count("\n") + (
+            0 if content.endswith("\n") or not content else 1
+        )
+        self.add(path, language, size, lines, estimate_tokens(content))
+
+    def largest_files(self) -> list[tuple[int, str]]:
+        return sorted(self._largest, key=lambda item: (-item[0], item[1]))
+
+    def render(self, stat_only: bool = False) -> list[str]:
+        """
+        Render the statistics as a markdown table and a list of files
+        """
+        rows = sorted(
+            self.languages.items(), key=lambda item: (-item[1]["bytes"], item[0])
+        )
+        total = {
+            key: sum(totals[key] for _, totals in rows)
+            for key in ("files", "bytes", "lines", "tokens")
+        }
+
+        def cells(totals: dict[str, int]) -> str:
+            if stat_only:
+                lines = "-"
+                tokens = f"~{totals['bytes'] // BYTES_PER_TOKEN}"
+            else:
+                lines = str(totals["lines"])
+                tokens = str(totals["tokens"])
+            return f"| {totals['files']} | {totals['bytes']} | {lines} | {tokens} |"
+
+        output = [
+            "| Language | Files | Bytes | Lines | Tokens |",
+            "|----------|------:|------:|------:|-------:|",
+        ]
+        for language, totals in rows:
+            output.append(f"| {language} {cells(totals)}")
+        output.append(f"| **Total** {cells(total)}")
+
+        if stat_only:
+            output.append("")
+            output.append(
+                "*Note: contents were not read; tokens are estimated from size.*"
+            )
+        elif self.uncounted:
+            output.append("")
+            output.append(
+                f"*Note: {self.uncounted} files were not read; "
+                "their lines and tokens are not counted.*"
+            )
+
+        largest = self.largest_files()
+        if largest:
+            output.append("")
+            output.append("**Largest files:**")
+            for i, (size, path) in enumerate(largest, 1):
+                output.append(f"{i}. {path} ({size} bytes)")
+        return output
@@ -0,0 +1,269 @@
+"""
+CPU-bound per-file transforms that can run in a process pool.
+
+Each transform takes the decoded file content and its language name and
+returns a dict of updates to merge into the file info.
+"""
+
+import ast
+import hashlib
+import io
+import os
+import re
+import tokenize
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Optional
+
+# Target amount of content shipped to a worker per task
+BATCH_BYTES = 4 * 1024 * 1024
+
+# Below this total amount of content a pool is not worth starting
+MIN_PARALLEL_BYTES = 1024 * 1024
+
+C_STYLE_LANGUAGES = {
+    "javascript",
+    "jsx",
+    "typescript",
+    "tsx",
+    "java",
+    "c",
+    "cpp",
+    "csharp",
+    "go",
+    "rust",
+    "php",
+}
+HASH_STYLE_LANGUAGES = {"bash", "ruby", "yaml", "toml"}
+MARKUP_LANGUAGES = {"html", "xml", "markdown"}
+
+_C_COMMENT_RE = re.compile(
+    r"(\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`)"
+    r"|(/\*.*?\*/|//[^\n]*)",
+    re.DOTALL,
+)
+_BLOCK_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_MARKUP_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(content: str) -> int:
+    """
+    Estimate the number of model tokens in a piece of text
+    """
+    words = 0
+    for match in _TOKEN_RE.finditer(content):
+        # Long identifiers are usually split into several tokens
+        words += 1 + (match.end() - match.start()) // 8
+    return words
+
+
+def _strip_python_comments(content: str) -> str:
+    lines = content.splitlines(keepends=True)
+    try:
+        tokens = list(tokenize.generate_tokens(io.StringIO(content).readline))
+    except (tokenize.TokenError, IndentationError, SyntaxError):
+        return content
+
+    removed = set()
+    for token in tokens:
+        if token.type != tokenize.COMMENT:
+            continue
+        row, col = token.start
+        line = lines[row - 1]
+        if row == 1 and line.startswith("#!"):
+            continue
+        ending = line[len(line.rstrip("\r\n")) :]
+        code = line[:col].rstrip()
+        if code:
+            lines[row - 1] = code + ending
+        else:
+            removed.add(row - 1)
+
+    return "".join(line for i, line in enumerate(lines) if i not in removed)
+
+
+def _strip_c_comments(content: str) -> str:
+    def replace(match: re.Match) -> str:
+        return match.group(1) if match.group(1) is not None else ""
+
+    return _C_COMMENT_RE.sub(replace, content)
+
+
+def _strip_hash_comments(content: str) -> str:
+    lines = content.splitlines(keepends=True)
+    return "".join(line for line in lines if not line.lstrip().startswith("#"))
+
+
+def strip_comments(content: str, language: str) -> dict:
+    """
+    Remove comments from source code, keeping string literals intact
+    """
+    if language == "python":
+        stripped = _strip_python_comments(content)
+    elif language in C_STYLE_LANGUAGES:
+        stripped = _strip_c_comments(content)
+    elif language == "css":
+        stripped = _BLOCK_COMMENT_RE.sub("", content)
+    elif language in HASH_STYLE_LANGUAGES:
+        stripped = _strip_hash_comments(content)
+    elif language in MARKUP_LANGUAGES:
+        stripped = _MARKUP_COMMENT_RE.sub("", content)
+    else:
+        return {}
+    return {"content": stripped}
+
+
+def _outline_python(content: str) -> Optional[str]:
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return None
+
+    lines = []
+
+    def visit(nodes: list, indent: str) -> None:
+        for node in nodes:
+            if isinstance(node, ast.ClassDef):
+                bases = ", ".join(ast.unparse(base) for base in node.bases)
+                lines.append(
+                    f"{indent}class {node.name}({bases}):"
+                    if bases
+                    else f"{indent}class {node.name}:"
+                )
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                prefix = (
+                    "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+                )
+                returns = f" -> {ast.unparse(node.returns)}" if node.returns else ""
+                lines.append(
+                    f"{indent}{prefix} {node.name}({ast.unparse(node.args)}){returns}:"
+                )
+            else:
+                continue
+
+            docstring = ast.get_docstring(node)
+            if docstring:
+                lines.append(f'{indent}    """{docstring.strip().splitlines()[0]}"""')
+            if isinstance(node, ast.ClassDef):
+                visit(node.body, indent + "    ")
+            lines.append(f"{indent}    ...")
+
+    visit(tree.body, "")
+    return "\n".join(lines)
+
+
+def outline(content: str, language: str) -> dict:
+    """
+    Replace source code with an outline of its classes and functions
+    """
+    if language != "python":
+        return {}
+    result = _outline_python(content)
+    if result is None:
+        return {}
+    return {"content": result}
+
+
+def hash_content(content: str, language: str) -> dict:
+    """
+    Compute the SHA-256 digest of the content
+    """
+    return {"sha256": hashlib.sha256(content.encode("utf-8")).hexdigest()}
+
+
+def tokens(content: str, language: str) -> dict:
+    """
+    Attach an estimated token count to the file
+    """
+    return {"tokens": estimate_tokens(content)}
+
+
+TRANSFORMS: dict[str, Callable[[str, str], dict]] = {
+    "strip-comments": strip_comments,
+    "outline": outline,
+    "hash": hash_content,
+    "tokens": tokens,
+}
+
+
+def apply_transforms(content: str, language: str, names: Iterable[str]) -> dict:
+    """
+    Apply the named transforms in order and return the merged updates
+    """
+    updates: dict = {}
+    for name in names:
+        result = TRANSFORMS[name](content, language)
+        content = result.get("content", content)
+        updates.update(result)
+    return updates
+
+
+def _apply_batch(batch: list[tuple[str, str]], names: list[str]) -> list[dict]:
+    return [apply_transforms(content, language, names) for content, language in batch]
+
+
+def make_batches(sizes: list[int], batch_bytes: int = BATCH_BYTES) -> list[range]:
+    """
+    Split consecutive items into ranges whose total size is at most batch_bytes
+    """
+    batches = []
+    start = 0
+    total = 0
+    for i, size in enumerate(sizes):
+        if i > start and total + size > batch_bytes:
+            batches.append(range(start, i))
+            start = i
+            total = 0
+        total += size
+    if start < len(sizes):
+        batches.append(range(start, len(sizes)))
+    return batches
+
+
+def run_transforms(
+    file_infos: list[dict],
+    names: Iterable[str],
+    workers: Optional[int] = None,
+    batch_bytes: int = BATCH_BYTES,
+) -> list[dict]:
+    """
+    Run transforms over the files' content, in a process pool when worthwhile.
+
+    Files are shipped to workers in batches of roughly batch_bytes of content
+    and the results are merged back in the original order.
+    """
+    names = list(names)
+    for name in names:
+        if name not in TRANSFORMS:
+            raise ValueError(f"Unknown transform: {name}")
+
+    if not names:
+        # Without touching the content, which records would load
+        return file_infos
+    pending = [info for info in file_infos if info["content"] is not None]
+    if not pending:
+        return file_infos
+
+    items = [(info["content"], info["language"]) for info in pending]
+    sizes = [len(content) for content, _ in items]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or sum(sizes) < MIN_PARALLEL_BYTES:
+        results = _apply_batch(items, names)
+    else:
+        batches = [items[r.start : r.stop] for r in make_batches(sizes, batch_bytes)]
+        workers = min(workers, len(batches))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = [
+                updates
+                for batch_result in executor.map(
+                    _apply_batch, batches, [names] * len(batches)
+                )
+                for updates in batch_result
+            ]
+
+    for info, updates in zip(pending, results):
+        info.update(updates)
+    return file_infos
@@ -0,0 +1,128 @@
+"""
+Tree rendering shared by directories, archives and git revisions.
+
+The renderer walks the tree with an explicit stack and yields one line at a
+time, so neither deep nor wide trees are limited by recursion or have to be
+rendered in full before output starts. Archives and other sources only
+provide a flat list of relative paths; this module also applies the usual
+exclusion rules to those paths and renders them in the same format as
+get_directory_structure.
+"""
+
+from typing import Any, Callable, Iterable, Iterator
+
+TREE_STYLES = ("full", "compact")
+
+# A directory listing: (name, child) pairs in display order. child is the
+# node to list for a directory and None for a line rendered as is.
+Entries = list[tuple[str, Any]]
+
+
+def is_path_excluded(
+    relative_path: str, exclude_dirs: set[str], exclude_files: set[str]
+) -> bool:
+    """
+    Check a POSIX relative path against the directory and file exclusions
+    """
+    *dirs, name = relative_path.split("/")
+    if name in exclude_files or name in exclude_dirs:
+        return True
+    return any(part in exclude_dirs for part in dirs)
+
+
+def build_path_tree(paths: Iterable[str]) -> dict:
+    """
+    Build a nested dict from relative paths; files map to None
+    """
+    root: dict = {}
+    for path in paths:
+        node = root
+        *dirs, name = [part for part in path.split("/") if part]
+        for part in dirs:
+            child = node.get(part)
+            if child is None:
+                child = node[part] = {}
+            node = child
+        if name not in node:
+            node[name] = None
+    return root
+
+
+def iter_tree_lines(
+    root_name: str,
+    root: Any,
+    list_entries: Callable[[Any, int], Entries],
+    max_depth: int,
+    style: str = "full",
+) -> Iterator[str]:
+    """
+    Render a tree one line at a time.
+
+    list_entries(node, depth) lists a directory; it is called once per
+    directory, only for directories within max_depth. With the compact
+    style, chains of directories that only contain one directory are
+    collapsed into a single line such as "src/main/java/".
+    """
+    yield f"{root_name}/"
+    entries = list_entries(root, 0)
+    # Each frame is the rest of a listing, its size, its prefix and depth
+    stack = [(enumerate(entries), len(entries), "", 0)]
+    while stack:
+        items, count, prefix, depth = stack[-1]
+        item = next(items, None)
+        if item is None:
+            stack.pop()
+            continue
+
+        i, (name, child) = item
+        is_last = i == count - 1
+        connector = "└── " if is_last else "├── "
+        if child is None:
+            yield f"{prefix}{connector}{name}"
+            continue
+        child_depth = depth + 1
+        children = list_entries(child, child_depth) if child_depth <= max_depth else []
+        if style == "compact":
+            while (
+                len(children) == 1
+                and children[0][1] is not None
+                and child_depth < max_depth
+            ):
+                sub_name, node = children[0]
+                name = f"{name}/{sub_name}"
+                child_depth += 1
+                children = list_entries(node, child_depth)
+
+        yield f"{prefix}{connector}{name}/"
+        if children:
+            new_prefix = prefix + ("    " if is_last else "│   ")
+            stack.append((enumerate(children), len(children), new_prefix, child_depth))
+
+
+def render_path_tree(
+    root_name: str,
+    paths: Iterable[str],
+    max_depth: int,
+    directories: Iterable[str] = (),
+    style: str = "full",
+) -> list[str]:
+    """
+    Render relative paths as a tree like get_directory_structure.
+
+    directories lists extra (possibly empty) directories to show.
+    """
+    tree = build_path_tree(paths)
+    for directory in directories:
+        node = tree
+        for part in [p for p in directory.split("/") if p]:
+            child = node.get(part)
+            if child is None:
+                child = node[part] = {}
+            node = child
+
+    def list_entries(node: dict, depth: int) -> Entries:
+        dirs = sorted(name for name, child in node.items() if child is not None)
+        files = sorted(name for name, child in node.items() if child is None)
+        return [(name, node[name]) for name in dirs] + [(name, None) for name in files]
+
+    return list(iter_tree_lines(root_name, tree, list_entries, max_depth, style))
@@ -0,0 +1,158 @@
+import io
+import sys
+import tarfile
+import zipfile
+from pathlib import Path
+import click.testing
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_project_translator import archive, main
+from ai_project_translator.tree import render_path_tree
+
+
+MEMBERS = {
+    "project/README.md": "# Archived\n",
+    "project/src/main.py": "def hello():\n    return 'world'\n",
+    "project/src/big.py": "x" * 10000,
+    "project/node_modules/lib.js": "module.exports = 1;\n",
+    "project/notes.xyz": "not code",
+}
+
+
+@pytest.fixture
+def zip_project(temp_dir):
+    """Create a zip archive of a small project."""
+    path = temp_dir / "project.zip"
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, content in MEMBERS.items():
+            zf.writestr(name, content)
+    return path
+
+
+@pytest.fixture
+def tar_project(temp_dir):
+    """Create a gzipped tar archive of a small project."""
+    path = temp_dir / "project.tar.gz"
+    with tarfile.open(path, "w:gz") as tf:
+        for name, content in MEMBERS.items():
+            data = content.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return path
+
+
+def test_is_archive(zip_project, tar_project, temp_dir):
+    """Test detecting supported archives."""
+    (temp_dir / "main.py").write_text("print(1)")
+
+    assert archive.is_archive(zip_project)
+    assert archive.is_archive(tar_project)
+    assert not archive.is_archive(temp_dir / "main.py")
+    assert archive.archive_root_name(tar_project) == "project"
+
+
+@pytest.mark.parametrize("fixture", ["zip_project", "tar_project"])
+def test_archive_structure(fixture, request):
+    """Test building the tree from the member index."""
+    path = request.getfixturevalue(fixture)
+    structure = archive.get_archive_structure(
+        path, exclude_dirs={"node_modules"}, exclude_files={"notes.xyz"}, max_depth=3
+    )
+
+    assert structure[0] == "project/"
+    structure_text = "\n".join(structure)
+    assert "src/" in structure_text
+    assert "main.py" in structure_text
+    assert "node_modules" not in structure_text
+    assert "notes.xyz" not in structure_text
+
+
+@pytest.mark.parametrize("fixture", ["zip_project", "tar_project"])
+def test_archive_files_with_content(fixture, request):
+    """Test reading code files from archive members."""
+    path = request.getfixturevalue(fixture)
+    code_files = archive.get_archive_files_with_content(
+        path,
+        extensions={".py", ".md", ".js"},
+        max_file_size=5000,
+        exclude_dirs={"node_modules"},
+        exclude_files=set(),
+        extension_map=main.config.extension_map,
+    )
+
+    by_path = {f["path"]: f for f in code_files}
+    assert list(by_path) == sorted(by_path)
+    assert set(by_path) == {
+        "project/README.md",
+        "project/src/big.py",
+        "project/src/main.py",
+    }
+    assert by_path["project/src/main.py"]["language"] == "python"
+    assert "def hello():" in by_path["project/src/main.py"]["content"]
+    assert by_path["project/src/big.py"]["content"] is None
+    assert "too large" in by_path["project/src/big.py"]["error"]
+    assert by_path["project/src/big.py"]["size"] == 10000
+
+
+def test_zip_oversized_member_not_decompressed(zip_project, mocker):
+    """Test that oversized zip members are skipped from central directory sizes."""
+    read = mocker.spy(zipfile.ZipFile, "read")
+
+    archive.get_archive_files_with_content(
+        zip_project,
+        extensions={".py"},
+        max_file_size=5000,
+        exclude_dirs=set(),
+        exclude_files=set(),
+        extension_map=main.config.extension_map,
+    )
+
+    read_names = [call.args[1].filename for call in read.call_args_list]
+    assert read_names == ["project/src/main.py"]
+
+
+def test_cli_with_archive(zip_project, mock_clipboard):
+    """Test CLI with an archive as PATH."""
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, [str(zip_project)])
+
+    assert result.exit_code == 0
+    assert "**Project Structure:**" in result.output
+    assert "Path: project" in result.output
+    assert "**File:** project/src/main.py" in result.output
+    assert "Single File Analysis:" not in result.output
+
+
+@pytest.mark.parametrize("name", ["bad.zip", "bad.tar.gz"])
+@pytest.mark.parametrize("options", [[], ["--stats"], ["--format", "jsonl"]])
+def test_cli_with_broken_archive(temp_dir, mock_clipboard, name, options):
+    """Test that a file named like an archive but not one is reported."""
+    path = temp_dir / name
+    path.write_text("not an archive\n")
+    runner = click.testing.CliRunner()
+
+    result = runner.invoke(main.cli, [str(path), *options])
+
+    assert result.exit_code == 0
+    assert f"Error: could not read archive '{path}'" in result.output
+
+
+def test_render_path_tree_compact():
+    """Test compact rendering of flat path lists."""
+    structure = render_path_tree(
+        "project",
+        ["src/pkg/mod/a.py", "src/pkg/mod/b.py", "setup.py"],
+        5,
+        style="compact",
+    )
+
+    assert structure == [
+        "project/",
+        "├── src/pkg/mod/",
+        "│   ├── a.py",
+        "│   └── b.py",
+        "└── setup.py",
+    ]
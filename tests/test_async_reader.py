@@ -0,0 +1,156 @@
+import asyncio
+import sys
+import threading
+from pathlib import Path
+import click.testing
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_project_translator import async_reader, main
+
+
+def test_async_matches_sync(sample_project_structure):
+    """Test that the async engine returns the same files as the sync walk."""
+    sync_files = main.get_code_files_with_content(
+        sample_project_structure, exclude_files=set()
+    )
+    async_files = asyncio.run(
+        main.aget_code_files_with_content(sample_project_structure, exclude_files=set())
+    )
+
+    assert [f["path"] for f in async_files] == [f["path"] for f in sync_files]
+    assert [f["content"] for f in async_files] == [f["content"] for f in sync_files]
+    assert [f["size"] for f in async_files] == [f["size"] for f in sync_files]
+
+
+def test_async_with_minimal_limits(temp_dir):
+    """Test that a queue of one and a single reader still read every file."""
+    for i in range(30):
+        sub = temp_dir / f"pkg{i % 3}"
+        sub.mkdir(exist_ok=True)
+        (sub / f"mod{i}.py").write_text(f"value = {i}\n")
+
+    code_files = asyncio.run(
+        main.aget_code_files_with_content(
+            temp_dir, meta_concurrency=1, read_concurrency=1, queue_size=1
+        )
+    )
+
+    assert len(code_files) == 30
+    assert [f["path"] for f in code_files] == sorted(f["path"] for f in code_files)
+
+
+def test_async_reads_in_flight(temp_dir, mocker):
+    """Test that read_concurrency reads run at once, beyond the default executor."""
+    readers = 40
+    for i in range(readers):
+        (temp_dir / f"mod{i}.py").write_text(f"value = {i}\n")
+    barrier = threading.Barrier(readers, timeout=10)
+    read_text = async_reader._read_text
+
+    def wait_for_all(file_path):
+        barrier.wait()
+        return read_text(file_path)
+
+    mocker.patch.object(async_reader, "_read_text", wait_for_all)
+    code_files = asyncio.run(
+        main.aget_code_files_with_content(temp_dir, read_concurrency=readers)
+    )
+
+    assert [f["error"] for f in code_files] == [None] * readers
+
+
+def test_async_large_file(temp_dir, large_file):
+    """Test that the async engine applies max_size."""
+    code_files = asyncio.run(
+        main.aget_code_files_with_content(temp_dir, max_file_size=5000)
+    )
+
+    assert len(code_files) == 1
+    assert code_files[0]["content"] is None
+    assert "too large" in code_files[0]["error"]
+    assert code_files[0]["size"] == 10000
+
+
+def test_cli_async(sample_project_structure, mock_clipboard):
+    """Test CLI with the --async read engine."""
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, [str(sample_project_structure), "--async"])
+
+    assert result.exit_code == 0
+    assert "CODE FILES:" in result.output
+    assert "**File:** src/main.py" in result.output
+    assert "def hello():" in result.output
+
+
+@pytest.mark.parametrize(
+    "limits",
+    [{"max_depth": 1}, {"max_files": 7}, {"max_bytes": 120}],
+)
+def test_async_budget_matches_sync(temp_dir, limits):
+    """Test that a budget takes the same files as in the sync walk."""
+    for i in range(12):
+        sub = temp_dir / f"pkg{i % 3}" / f"sub{i % 2}"
+        sub.mkdir(parents=True, exist_ok=True)
+        (sub / f"mod{i}.py").write_text("x" * (i + 10))
+        (temp_dir / f"top{i}.py").write_text("y" * i)
+    sync_budget = main.TraversalBudget(**limits)
+    async_budget = main.TraversalBudget(**limits)
+
+    sync_files = main.get_code_files_with_content(temp_dir, budget=sync_budget)
+    async_files = asyncio.run(
+        main.aget_code_files_with_content(
+            temp_dir, budget=async_budget, meta_concurrency=4, read_concurrency=4
+        )
+    )
+
+    assert [(f["path"], f["error"]) for f in async_files] == [
+        (f["path"], f["error"]) for f in sync_files
+    ]
+    assert async_budget.report() == sync_budget.report()
+
+
+def test_cli_async_honors_limits(temp_dir, mock_clipboard):
+    """Test that --async reports what --max-files and --max-bytes left out."""
+    for name in ["a.py", "b.py", "c.py"]:
+        (temp_dir / name).write_text(f"# {name}\n")
+    runner = click.testing.CliRunner()
+
+    result = runner.invoke(
+        main.cli, [str(temp_dir), "--async", "--no-git", "--max-files", "1"]
+    )
+
+    assert "# a.py" in result.output
+    assert "# b.py" not in result.output
+    assert "file limit of 1 reached at b.py" in result.output
+
+    result = runner.invoke(
+        main.cli, [str(temp_dir), "--async", "--no-git", "--max-bytes", "1"]
+    )
+
+    assert "# a.py" not in result.output
+    assert "Total size limit of 1 bytes reached at a.py" in result.output
+
+
+def test_async_stops_opening_files_at_byte_cap(temp_dir, mocker):
+    """Test that --async does not open the files past the total size limit."""
+    for name in ["a.py", "b.py", "c.py", "d.py"]:
+        (temp_dir / name).write_text("x" * 100)
+    read_text = mocker.patch.object(
+        async_reader, "_read_text", wraps=async_reader._read_text
+    )
+    budget = main.TraversalBudget(max_bytes=250)
+
+    code_files = asyncio.run(
+        main.aget_code_files_with_content(
+            temp_dir, budget=budget, meta_concurrency=4, read_concurrency=4
+        )
+    )
+
+    assert [f["content"] is not None for f in code_files] == [True, True, False, False]
+    assert sorted(call.args[0].name for call in read_text.call_args_list) == [
+        "a.py",
+        "b.py",
+    ]
+    assert "content of 2 files was not read" in budget.report()[0]
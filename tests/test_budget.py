@@ -0,0 +1,136 @@
+import sys
+from pathlib import Path
+import click.testing
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_project_translator import main
+
+
+@pytest.fixture
+def deep_project(temp_dir):
+    """Create a project with one file per level, five levels deep."""
+    current = temp_dir
+    (current / "root.py").write_text("x = 0\n")
+    for i in range(5):
+        current = current / f"level{i}"
+        current.mkdir()
+        (current / f"file{i}.py").write_text(f"x = {i + 1}\n")
+    return temp_dir
+
+
+def test_files_honor_max_depth(deep_project):
+    """Test that the file walk does not visit directories below max_depth."""
+    budget = main.TraversalBudget(max_depth=1)
+    code_files = main.get_code_files_with_content(deep_project, budget=budget)
+
+    assert [f["path"] for f in code_files] == ["level0/file0.py", "root.py"]
+    assert budget.pruned_dirs == ["level0/level1"]
+    assert "below depth 1" in budget.report()[0]
+
+
+def test_files_stop_at_max_files(deep_project, mocker):
+    """Test that no file beyond the file limit is read."""
+    read = mocker.spy(main, "read_file_content")
+    budget = main.TraversalBudget(max_files=2)
+
+    code_files = main.get_code_files_with_content(deep_project, budget=budget)
+
+    assert len(code_files) == 2
+    assert read.call_count == 2
+    assert budget.exhausted.startswith("file limit of 2 reached")
+    assert "stopped early" in budget.report()[0]
+
+
+def test_files_stop_reading_at_max_bytes(temp_dir, mocker):
+    """Test that files past the byte limit are returned without being read."""
+    for name in ["a.py", "b.py", "c.py", "d.py"]:
+        (temp_dir / name).write_text("x" * 100)
+    read = mocker.spy(main, "read_file_content")
+
+    budget = main.TraversalBudget(max_bytes=250)
+    code_files = main.get_code_files_with_content(temp_dir, budget=budget)
+
+    assert [f["path"] for f in code_files] == ["a.py", "b.py", "c.py", "d.py"]
+    assert read.call_count == 2
+    for file_info in code_files[2:]:
+        assert file_info["content"] is None
+        assert file_info["error"] == main.TOTAL_SIZE_LIMIT_ERROR
+        assert file_info["size"] == 100
+    assert "Total size limit of 250 bytes reached at c.py" in budget.report()[0]
+    assert "content of 2 files was not read" in budget.report()[0]
+
+
+def test_large_files_do_not_use_byte_budget(temp_dir):
+    """Test that files over max_size count as files but not as bytes."""
+    (temp_dir / "a.py").write_text("x" * 10000)
+    (temp_dir / "b.py").write_text("x" * 100)
+
+    budget = main.TraversalBudget(max_bytes=200)
+    code_files = main.get_code_files_with_content(
+        temp_dir, max_file_size=5000, budget=budget
+    )
+
+    assert [f["path"] for f in code_files] == ["a.py", "b.py"]
+    assert budget.exhausted is None
+
+
+def test_structure_honors_max_files(temp_dir):
+    """Test that the tree stops listing once the file limit is reached."""
+    for i in range(5):
+        (temp_dir / f"file{i}.txt").write_text("x")
+
+    budget = main.TraversalBudget(max_files=3)
+    structure = main.get_directory_structure(temp_dir, budget=budget)
+
+    assert len(structure) == 4
+    assert budget.exhausted is not None
+
+
+def test_cli_reports_budget(deep_project, mock_clipboard):
+    """Test that the CLI output says what the budgets left out."""
+    runner = click.testing.CliRunner()
+    result = runner.invoke(
+        main.cli, [str(deep_project), "--max-depth", "1", "--max-files", "1"]
+    )
+
+    assert result.exit_code == 0
+    # Files are taken in path order, by the tree and the file walk alike
+    assert "**File:** level0/file0.py" in result.output
+    assert "**File:** root.py" not in result.output
+    assert "── file0.py" in result.output
+    assert "── root.py" not in result.output
+    note = "*Note: Traversal stopped early: file limit of 1 reached at root.py;"
+    assert result.output.count(note) == 2
+
+
+def test_cli_tree_agrees_with_files(temp_dir, mock_clipboard):
+    """Test that the tree and the files keep the same files under --max-files."""
+    (temp_dir / "a").mkdir()
+    (temp_dir / "a" / "x.py").write_text("x = 1\n")
+    (temp_dir / "a" / "notes.bin").write_text("not code\n")
+    (temp_dir / "b.py").write_text("b = 1\n")
+    runner = click.testing.CliRunner()
+
+    result = runner.invoke(main.cli, [str(temp_dir), "--max-files", "1", "--no-git"])
+
+    tree, files = result.output.split("CODE FILES:")
+    assert result.exit_code == 0
+    assert "└── a/\n    ├── notes.bin\n    └── x.py" in tree
+    assert "── b.py" not in tree
+    assert "**File:** a/x.py" in files
+    assert "**File:** b.py" not in files
+    note = "*Note: Traversal stopped early: file limit of 1 reached at b.py;"
+    assert tree.count(note) == files.count(note) == 1
+
+
+def test_config_budget_environment_variables(monkeypatch):
+    """Test setting the file and byte limits via environment variables."""
+    monkeypatch.setenv("AI_PT_MAX_FILES", "10")
+    monkeypatch.setenv("AI_PT_MAX_TOTAL_BYTES", "")
+
+    config = main.Config()
+
+    assert config.max_files == 10
+    assert config.max_total_bytes is None
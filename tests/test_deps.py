@@ -0,0 +1,129 @@
+import sys
+from pathlib import Path
+import click.testing
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_project_translator import deps, main
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(temp_dir, monkeypatch):
+    """Keep the import cache out of the home directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(temp_dir / "cache"))
+
+
+@pytest.fixture
+def python_project(temp_dir):
+    """Create a package whose modules import each other."""
+    pkg = temp_dir / "project" / "pkg"
+    (pkg / "sub").mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "sub" / "__init__.py").write_text("")
+    (pkg / "app.py").write_text(
+        "import os\nfrom . import models\nfrom pkg.sub import helpers\n"
+    )
+    (pkg / "models.py").write_text("from .sub.base import Base\n")
+    (pkg / "sub" / "helpers.py").write_text("import json\n")
+    (pkg / "sub" / "base.py").write_text("from pkg import unused\n")
+    (pkg / "unused.py").write_text("x = 1\n")
+    (pkg / "other.py").write_text("y = 2\n")
+    return pkg
+
+
+def test_parse_js_imports():
+    """Test that relative imports and requires are found, packages are not."""
+    source = (
+        "import React from 'react';\n"
+        'import { a, b } from "./util";\n'
+        "import './styles.css';\n"
+        "export * from '../lib/index';\n"
+        "const c = require('./c');\n"
+        "const d = await import('./lazy');\n"
+    )
+
+    specs = [spec for _, spec, _ in deps.parse_imports(source, "javascript")]
+
+    assert specs == ["./util", "./styles.css", "../lib/index", "./c", "./lazy"]
+
+
+def test_python_closure_by_depth(python_project):
+    """Test the transitive closure and its depth limit."""
+    closure = deps.dependency_closure(python_project / "app.py", max_depth=2)
+
+    names = [path.relative_to(python_project).as_posix() for path in closure]
+    assert names == [
+        "app.py",
+        "__init__.py",
+        "models.py",
+        "sub/__init__.py",
+        "sub/helpers.py",
+        "sub/base.py",
+    ]
+
+    closure = deps.dependency_closure(python_project / "app.py", max_depth=5)
+    assert python_project / "unused.py" in closure
+    assert python_project / "other.py" not in closure
+
+
+def test_js_closure(temp_dir):
+    """Test extension and index resolution for relative JS/TS imports."""
+    src = temp_dir / "src"
+    (src / "components").mkdir(parents=True)
+    (src / "main.ts").write_text("import { App } from './components';\n")
+    (src / "components" / "index.tsx").write_text("export * from './App';\n")
+    (src / "components" / "App.tsx").write_text("import x from 'react';\n")
+
+    closure = deps.dependency_closure(src / "main.ts")
+
+    assert closure == [
+        src / "main.ts",
+        src / "components" / "index.tsx",
+        src / "components" / "App.tsx",
+    ]
+
+
+def test_imports_are_cached_by_content(python_project, mocker):
+    """Test that unchanged files are not parsed again."""
+    deps.dependency_closure(python_project / "app.py")
+    parse = mocker.spy(deps, "parse_imports")
+
+    deps.dependency_closure(python_project / "app.py")
+    assert parse.call_count == 0
+
+    (python_project / "models.py").write_text("from . import other\n")
+    closure = deps.dependency_closure(python_project / "app.py")
+    # The changed module and the newly reached one
+    assert parse.call_count == 2
+    assert python_project / "other.py" in closure
+
+
+def test_cli_with_deps(python_project, mock_clipboard):
+    """Test that --with-deps shows the closure as a small project."""
+    runner = click.testing.CliRunner()
+    result = runner.invoke(
+        main.cli,
+        [
+            str(python_project / "app.py"),
+            "--with-deps",
+            "--deps-depth",
+            "1",
+            "--no-copy",
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert "Path: pkg" in result.output
+    assert "from .sub.base import Base" in result.output
+    assert "import json" in result.output
+    assert "from pkg import unused" not in result.output
+    assert "y = 2" not in result.output
+
+
+def test_cli_with_deps_requires_file(python_project, mock_clipboard):
+    """Test that --with-deps rejects directories."""
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, [str(python_project), "--with-deps"])
+
+    assert "Error: --with-deps requires PATH to be a file" in result.output
@@ -80,3 +80,61 @@ def test_get_directory_structure_max_depth(temp_dir):
     assert "dir1/" in structure_text
     # Should not show beyond depth 2
     assert "dir3/" not in structure_text
+
+
+def test_get_directory_structure_deeper_than_recursion_limit(temp_dir):
+    """Test that trees deeper than the recursion limit render."""
+    depth = 200
+    deepest = temp_dir.joinpath(*["d"] * depth)
+    deepest.mkdir(parents=True)
+    (deepest / "leaf.py").write_text("")
+    frame, frames = sys._getframe(), 0
+    while frame:
+        frame, frames = frame.f_back, frames + 1
+
+    # Leave room for the calls of the renderer, but not one per directory
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(frames + 50)
+    try:
+        structure = main.get_directory_structure(temp_dir, max_depth=depth + 1)
+    finally:
+        sys.setrecursionlimit(limit)
+
+    assert len(structure) == depth + 2
+    assert structure[-1].endswith("└── leaf.py")
+
+
+def test_get_directory_structure_compact_style(temp_dir):
+    """Test that compact style collapses single-directory chains."""
+    package = temp_dir / "src" / "main" / "java" / "com" / "acme"
+    package.mkdir(parents=True)
+    (package / "App.java").write_text("")
+    (package / "util").mkdir()
+    (package / "util" / "Strings.java").write_text("")
+    (temp_dir / "README.md").write_text("")
+
+    structure = main.get_directory_structure(
+        temp_dir, max_depth=10, tree_style="compact"
+    )
+
+    assert structure == [
+        f"{temp_dir.name}/",
+        "├── src/main/java/com/acme/",
+        "│   ├── util/",
+        "│   │   └── Strings.java",
+        "│   └── App.java",
+        "└── README.md",
+    ]
+
+
+def test_iter_directory_structure_is_lazy(temp_dir, mocker):
+    """Test that directories are listed as lines are consumed."""
+    (temp_dir / "a").mkdir()
+    (temp_dir / "b").mkdir()
+    spy = mocker.spy(main.os, "scandir")
+
+    lines = main.iter_directory_structure(temp_dir)
+    assert next(lines) == f"{temp_dir.name}/"
+    assert spy.call_count == 0
+    assert next(lines) == "├── a/"
+    assert spy.call_count == 2
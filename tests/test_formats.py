@@ -0,0 +1,124 @@
+import io
+import json
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+import click.testing
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_project_translator import formats, main
+
+
+def test_jsonl_writer_records():
+    """Test JSON Lines records for files with content and with errors."""
+    stream = io.StringIO()
+    writer = formats.JsonLinesWriter(stream, "project")
+    writer.question("Why?")
+    writer.file(
+        {
+            "path": "a.py",
+            "language": "python",
+            "size": 12,
+            "content": 'print("\\n")\n',
+            "error": None,
+        }
+    )
+    writer.file(
+        {
+            "path": "big.py",
+            "language": "python",
+            "size": 10000,
+            "content": None,
+            "error": "File too large (10000 bytes), skipping content",
+        }
+    )
+    writer.close()
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert records[0] == {"type": "question", "text": "Why?"}
+    assert records[1]["content"] == 'print("\\n")\n'
+    assert records[1]["size"] == 12
+    assert "content" not in records[2]
+    assert "too large" in records[2]["error"]
+
+
+def test_xml_writer_escapes_content():
+    """Test that XML output stays well-formed with markup and control chars."""
+    stream = io.StringIO()
+    writer = formats.XmlWriter(stream, 'a "quoted" <name>')
+    writer.structure(["project/", "└── a.html"])
+    writer.file(
+        {
+            "path": "a&b.html",
+            "language": "html",
+            "size": 30,
+            "content": "<p>1 < 2 && 3 > 2</p>\x00\x1b]]>\n",
+            "error": None,
+        }
+    )
+    writer.close()
+
+    root = ET.fromstring(stream.getvalue().encode("utf-8"))
+    assert root.get("name") == 'a "quoted" <name>'
+    file_element = root.find("file")
+    assert file_element.get("path") == "a&b.html"
+    assert file_element.get("size") == "30"
+    assert file_element.find("content").text == "<p>1 < 2 && 3 > 2</p>]]>\n"
+    assert "└── a.html" in root.find("structure").text
+
+
+def test_cli_jsonl(sample_project_structure, mock_clipboard):
+    """Test CLI --format jsonl output."""
+    runner = click.testing.CliRunner()
+    result = runner.invoke(
+        main.cli,
+        [str(sample_project_structure), "--format", "jsonl", "-q", "What is this?"],
+    )
+
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert records[0]["type"] == "question"
+    assert records[1]["type"] == "structure"
+    files = {r["path"]: r for r in records if r["type"] == "file"}
+    assert files["src/main.py"]["content"] == "def hello():\n    return 'world'\n"
+    assert files["src/main.py"]["language"] == "python"
+    mock_clipboard.copy.assert_not_called()
+
+
+def test_cli_xml_single_file(temp_dir, mock_clipboard):
+    """Test CLI --format xml for a single file."""
+    file_path = temp_dir / "test.py"
+    file_path.write_text("if a < b:\n    pass\n")
+
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, [str(file_path), "--format", "xml"])
+
+    assert result.exit_code == 0
+    root = ET.fromstring(result.stdout.encode("utf-8"))
+    assert root.find("file").find("content").text == "if a < b:\n    pass\n"
+
+
+def test_cli_jsonl_streams_records(temp_dir, mocker):
+    """Test that each record is written before the next file is read."""
+    for name in ["a.py", "b.py", "c.py"]:
+        (temp_dir / name).write_text(f"# {name}\n")
+    events = []
+    original_read = main.read_file_content
+    original_write = formats.JsonLinesWriter.file
+
+    def read(file_path, max_size=None):
+        events.append("read")
+        return original_read(file_path, max_size)
+
+    def write(self, file_info):
+        events.append("write")
+        original_write(self, file_info)
+
+    mocker.patch.object(main, "read_file_content", side_effect=read)
+    mocker.patch.object(formats.JsonLinesWriter, "file", write)
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, [str(temp_dir), "--format", "jsonl"])
+
+    assert result.exit_code == 0
+    assert events == ["read", "write"] * 3
@@ -0,0 +1,91 @@
+import sys
+from pathlib import Path
+import click.testing
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_project_translator import generated, main
+
+
+@pytest.mark.parametrize(
+    "name, head, kind",
+    [
+        ("uv.lock", b"", "lockfile"),
+        ("package-lock.json", b"{\n", "lockfile"),
+        ("app.min.js", b"", "minified"),
+        ("api_pb2.py", b"", "generated"),
+        (
+            "models.py",
+            b"# Code generated by sqlc. DO NOT EDIT.\nimport x\n",
+            "generated",
+        ),
+        ("bundle.js", b"var a=1;" * 1024, "minified"),
+        ("data.json", b'{"k": "' + b"x" * 5000 + b'"}\n', "minified"),
+        ("app.py", b"import os\n" * 1000, None),
+        ("notes.md", b"Some prose. " * 40 + b"\n\n" + b"More. " * 50, None),
+    ],
+)
+def test_classify(name, head, kind):
+    """Test classification by name, header marker and line length."""
+    assert generated.classify(name, head) == kind
+
+
+def test_marker_below_header_is_ignored():
+    """Test that markers are only looked for in the first lines."""
+    head = b"import os\n" * 10 + b"# this tool writes files marked DO NOT EDIT\n"
+
+    assert generated.classify("codegen.py", head) is None
+
+
+def test_lockfile_is_not_read(temp_dir, mocker):
+    """Test that a record recognized by its name is counted, not read."""
+    (temp_dir / "uv.lock").write_text("version = 1\n" * 3412)
+    reader = mocker.Mock()
+    record = main.FileRecord(str(temp_dir), "uv.lock", "text", 0, 0.0, reader)
+
+    note = generated.summarize_file(record)
+
+    assert note == "Lockfile, 3,412 lines, skipping content"
+    assert record["content"] is None
+    assert record["error"] == note
+    reader.assert_not_called()
+
+
+def test_large_lockfile_is_not_counted(temp_dir, mocker):
+    """Test that a lockfile above the size limit is left to the reader."""
+    (temp_dir / "package-lock.json").write_text("{}\n" * 1000)
+    count_lines = mocker.patch.object(generated, "count_lines")
+    reader = mocker.Mock(return_value=(None, "File too large (3000 bytes)"))
+    record = main.FileRecord(
+        str(temp_dir), "package-lock.json", "json", 3000, 0.0, reader
+    )
+
+    note = generated.summarize_file(record, max_size=1000)
+
+    assert note is None
+    assert record["error"] == "File too large (3000 bytes)"
+    count_lines.assert_not_called()
+
+
+def test_cli_summarizes_generated_files(temp_dir, mock_clipboard):
+    """Test that summarized files stay in the tree with a one-line note."""
+    (temp_dir / "package-lock.json").write_text('{\n  "lockfileVersion": 3\n}\n')
+    (temp_dir / "app.min.js").write_text("var a=1;" * 100)
+    (temp_dir / "app.py").write_text("print('hello')\n")
+    runner = click.testing.CliRunner()
+
+    result = runner.invoke(main.cli, [str(temp_dir), "--no-git"])
+
+    assert result.exit_code == 0
+    assert "├── app.min.js" in result.output
+    assert "*Note: Lockfile, 3 lines, skipping content*" in result.output
+    assert "*Note: Minified, 1 line, skipping content*" in result.output
+    assert "lockfileVersion" not in result.output
+    assert "print('hello')" in result.output
+
+    result = runner.invoke(
+        main.cli, [str(temp_dir), "--no-summarize-generated", "--no-copy"]
+    )
+
+    assert "lockfileVersion" in result.output
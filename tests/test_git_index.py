@@ -0,0 +1,170 @@
+import shutil
+import sys
+from pathlib import Path
+import click.testing
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_project_translator import ProjectScanner, git, git_index, main
+from tests.test_git_revision import run
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not found")
+
+
+@pytest.fixture
+def working_copy(temp_dir):
+    """Create a repository with tracked sources and ignored build output."""
+    run(temp_dir, "init", "-q", "-b", "main")
+    (temp_dir / "src" / "pkg").mkdir(parents=True)
+    (temp_dir / "src" / "pkg" / "app.py").write_text("APP = 1\n")
+    (temp_dir / "src" / "main.py").write_text("MAIN = 1\n")
+    (temp_dir / "README.md").write_text("# Project\n")
+    run(temp_dir, "add", "-A")
+    (temp_dir / ".git" / "info" / "exclude").write_text("build/\n")
+    (temp_dir / "build" / "lib").mkdir(parents=True)
+    (temp_dir / "build" / "lib" / "app.py").write_text("BUILD = 1\n")
+    (temp_dir / "src" / "scratch.py").write_text("SCRATCH = 1\n")
+    return temp_dir
+
+
+@pytest.mark.parametrize("version", ["2", "3", "4"])
+def test_read_index_versions(working_copy, version):
+    """Test that every index version lists the tracked files."""
+    run(working_copy, "update-index", "--index-version", version)
+
+    files = git_index.read_index(working_copy / ".git")
+
+    assert sorted(files) == ["README.md", "src/main.py", "src/pkg/app.py"]
+
+
+def test_tracked_files_below_subdirectory(working_copy):
+    """Test that paths are relative to the analyzed directory."""
+    tracked = git_index.list_tracked_files(working_copy / "src")
+
+    assert tracked.listdir(".") == (["pkg"], ["main.py", "scratch.py"])
+    assert [files for _, _, files in tracked.walk(str(working_copy))] == [
+        ["main.py", "scratch.py"],
+        ["app.py"],
+    ]
+
+
+def test_outside_repository(temp_dir):
+    """Test that directories outside a repository are walked."""
+    assert git_index.list_tracked_files(temp_dir) is None
+
+
+def test_nothing_tracked_is_walked(working_copy, temp_dir, mock_clipboard):
+    """Test that new repositories list their files and ignored directories are walked."""
+    fresh = temp_dir / "fresh"
+    fresh.mkdir()
+    run(fresh, "init", "-q")
+    (fresh / "a.py").write_text("A = 1\n")
+
+    assert sorted(git_index.list_tracked_files(fresh).files) == ["a.py"]
+    assert git_index.list_tracked_files(working_copy / "build") is None
+
+    runner = click.testing.CliRunner()
+    for path, content in [(fresh, "A = 1"), (working_copy / "build", "BUILD = 1")]:
+        result = runner.invoke(main.cli, [str(path), "--no-copy"])
+
+        assert result.exit_code == 0
+        assert content in result.output
+
+
+def test_ls_files_fallback(working_copy, mocker):
+    """Test that an unreadable index falls back to git ls-files."""
+    mocker.patch.object(
+        git_index, "read_index", side_effect=git.GitError("split index")
+    )
+
+    tracked = git_index.list_tracked_files(working_copy)
+
+    assert sorted(tracked.files) == [
+        "README.md",
+        "src/main.py",
+        "src/pkg/app.py",
+        "src/scratch.py",
+    ]
+
+
+def test_records_without_walk(working_copy, mocker):
+    """Test that records come from git, without listing directories."""
+    tracked = git_index.list_tracked_files(working_copy)
+    walk = mocker.spy(main.os, "scandir")
+
+    records = list(main.iter_file_records(working_copy, tracked=tracked))
+
+    assert [record.path for record in records] == [
+        "README.md",
+        str(Path("src", "main.py")),
+        str(Path("src", "pkg", "app.py")),
+        str(Path("src", "scratch.py")),
+    ]
+    assert records[2].size == 8
+    assert walk.call_count == 0
+    assert records[2]["content"] == "APP = 1\n"
+
+
+def test_records_of_changed_files(working_copy, mock_clipboard):
+    """Test that sizes come from disk and deleted files are left out."""
+    (working_copy / "src" / "main.py").write_text("MAIN = 1\n" * 10)
+    (working_copy / "README.md").unlink()
+    tracked = git_index.list_tracked_files(working_copy)
+
+    records = list(main.iter_file_records(working_copy, tracked=tracked))
+
+    assert [record.path for record in records] == [
+        str(Path("src", "main.py")),
+        str(Path("src", "pkg", "app.py")),
+        str(Path("src", "scratch.py")),
+    ]
+    assert records[0].size == 90
+
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, [str(working_copy), "--no-copy"])
+
+    assert result.exit_code == 0
+    assert "README.md" not in result.output
+    assert "Error reading file" not in result.output
+
+
+def test_cli_uses_git_index(working_copy, mock_clipboard):
+    """Test that ignored files are only shown with --no-git."""
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, [str(working_copy), "--no-copy"])
+
+    assert result.exit_code == 0
+    assert "APP = 1" in result.output
+    assert "build" not in result.output
+    # Not added yet, but not ignored either
+    assert "SCRATCH = 1" in result.output
+
+    result = runner.invoke(main.cli, [str(working_copy), "--no-git", "--no-copy"])
+
+    assert result.exit_code == 0
+    assert "BUILD = 1" in result.output
+    assert "SCRATCH = 1" in result.output
+
+
+def test_cli_async_uses_git_index(working_copy, mock_clipboard):
+    """Test that --async reads the tracked files the tree shows."""
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, [str(working_copy), "--async", "--no-copy"])
+
+    assert result.exit_code == 0
+    assert "APP = 1" in result.output
+    assert "BUILD = 1" not in result.output
+    assert "SCRATCH = 1" in result.output
+
+
+def test_scanner_lists_new_untracked_files(working_copy, mocker):
+    """Test that a scanner sees new files without reading the index again."""
+    scanner = ProjectScanner(working_copy)
+    assert "new.py" not in scanner.tracked_files().listdir("src")[1]
+    read_index = mocker.spy(git_index, "read_index")
+
+    (working_copy / "src" / "new.py").write_text("NEW = 1\n")
+
+    assert "new.py" in scanner.tracked_files().listdir("src")[1]
+    assert read_index.call_count == 0
@@ -0,0 +1,228 @@
+import shutil
+import subprocess
+import sys
+import threading
+from pathlib import Path
+import click.testing
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_project_translator import git, main
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not found")
+
+
+def run(cwd, *args):
+    subprocess.run(
+        ["git", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        env={
+            "GIT_AUTHOR_NAME": "test",
+            "GIT_AUTHOR_EMAIL": "test@example.com",
+            "GIT_COMMITTER_NAME": "test",
+            "GIT_COMMITTER_EMAIL": "test@example.com",
+            "HOME": str(cwd),
+            "PATH": "/usr/bin:/bin:/usr/local/bin",
+        },
+    )
+
+
+@pytest.fixture
+def git_repo(temp_dir):
+    """Create a repository with two commits."""
+    run(temp_dir, "init", "-q", "-b", "main")
+    (temp_dir / "src").mkdir()
+    (temp_dir / "src" / "main.py").write_text("def hello():\n    return 'v1'\n")
+    (temp_dir / "README.md").write_text("# Project\n")
+    (temp_dir / "big.py").write_text("x" * 10000)
+    run(temp_dir, "add", "-A")
+    run(temp_dir, "commit", "-q", "-m", "first")
+    run(temp_dir, "tag", "v1")
+
+    (temp_dir / "src" / "main.py").write_text("def hello():\n    return 'v2'\n")
+    (temp_dir / "src" / "new.py").write_text("NEW = True\n")
+    run(temp_dir, "add", "-A")
+    run(temp_dir, "commit", "-q", "-m", "second")
+
+    # Uncommitted change that must not show up for any revision
+    (temp_dir / "src" / "main.py").write_text("def hello():\n    return 'dirty'\n")
+    return temp_dir
+
+
+def test_list_revision(git_repo):
+    """Test listing blobs and sizes at a revision."""
+    entries = git.list_revision(git_repo, "v1")
+
+    by_path = {e.path: e for e in entries}
+    assert set(by_path) == {"README.md", "big.py", "src/main.py"}
+    assert by_path["big.py"].size == 10000
+
+
+def test_list_revision_subdirectory(git_repo):
+    """Test that paths are relative to a subdirectory PATH."""
+    entries = git.list_revision(git_repo / "src", "main")
+
+    assert sorted(e.path for e in entries) == ["main.py", "new.py"]
+
+
+def test_list_revision_unknown(git_repo):
+    """Test that unknown revisions raise GitError."""
+    with pytest.raises(git.GitError):
+        git.list_revision(git_repo, "does-not-exist")
+
+
+def test_cat_file_batch_reads_objects(git_repo):
+    """Test streaming several objects through one cat-file process."""
+    entries = git.list_revision(git_repo, "main")
+
+    with git.CatFileBatch(git_repo) as batch:
+        contents = {e.path: batch.read(e.object_id) for e in entries}
+        with pytest.raises(git.GitError):
+            batch.read("0" * 40)
+
+    assert contents["src/new.py"] == b"NEW = True\n"
+    assert contents["src/main.py"] == b"def hello():\n    return 'v2'\n"
+
+
+def test_revision_files_skip_large_without_reading(git_repo, mocker):
+    """Test that max_size is applied from ls-tree sizes before reading."""
+    read = mocker.spy(git.CatFileBatch, "read")
+    entries = git.list_revision(git_repo, "v1")
+
+    code_files = git.get_revision_files_with_content(
+        git_repo,
+        entries,
+        extensions={".py", ".md"},
+        max_file_size=5000,
+        exclude_dirs=set(),
+        exclude_files=set(),
+        extension_map=main.config.extension_map,
+    )
+
+    assert [f["path"] for f in code_files] == ["README.md", "big.py", "src/main.py"]
+    assert "too large" in code_files[1]["error"]
+    assert "'v1'" in code_files[2]["content"]
+    assert read.call_count == 2
+
+
+def test_cli_with_rev(git_repo, mock_clipboard):
+    """Test CLI --rev output comes from the revision, not the working copy."""
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, [str(git_repo), "--rev", "v1"])
+
+    assert result.exit_code == 0
+    assert "return 'v1'" in result.output
+    assert "dirty" not in result.output
+    assert "new.py" not in result.output
+    assert (git_repo / "src" / "main.py").read_text().endswith("'dirty'\n")
+
+
+def test_cli_with_unknown_rev(git_repo):
+    """Test CLI --rev with a revision that does not exist."""
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, [str(git_repo), "--rev", "nope", "--no-copy"])
+
+    assert result.exit_code == 0
+    assert "Error: could not read revision 'nope'" in result.output
+
+
+def test_cli_with_option_as_rev(git_repo, mock_clipboard):
+    """Test that a revision starting with a dash is rejected before git runs."""
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, [str(git_repo), "--rev=--help", "--no-copy"])
+
+    assert "Error: could not read revision '--help': invalid revision" in result.output
+
+
+def test_iter_diff(git_repo):
+    """Test parsing changed, added, deleted and renamed files from one diff."""
+    (git_repo / "src" / "new.py").unlink()
+    (git_repo / "docs").mkdir()
+    (git_repo / "docs" / "guide.md").write_text("# Guide\n")
+    run(git_repo, "add", "-A")
+    run(git_repo, "mv", "README.md", "README2.md")
+
+    files = {f.path: f for f in git.iter_diff(git_repo, "HEAD", context=0)}
+
+    assert set(files) == {"README2.md", "docs/guide.md", "src/main.py", "src/new.py"}
+    assert files["src/main.py"].hunks.splitlines() == [
+        "@@ -2 +2 @@ def hello():",
+        "-    return 'v2'",
+        "+    return 'dirty'",
+    ]
+    assert files["src/new.py"].hunks.endswith("-NEW = True")
+    assert files["README2.md"].old_path == "README.md"
+    assert files["README2.md"].hunks == ""
+
+
+def test_iter_diff_with_many_warnings(temp_dir, mocker):
+    """Test that warnings beyond a pipe buffer do not block the diff."""
+    script = (
+        "import sys\n"
+        "sys.stderr.write('warning: LF will be replaced by CRLF\\n' * 10000)\n"
+        "sys.stderr.flush()\n"
+        "sys.stdout.write('diff --git a/x.py b/x.py\\n--- a/x.py\\n+++ b/x.py\\n"
+        "@@ -1 +1 @@\\n-a\\n+b\\n')\n"
+    )
+    popen = subprocess.Popen
+    mocker.patch.object(
+        git.subprocess,
+        "Popen",
+        lambda args, **kwargs: popen([sys.executable, "-c", script], **kwargs),
+    )
+    files = []
+    reader = threading.Thread(
+        target=lambda: files.extend(git.iter_diff(temp_dir, "HEAD")), daemon=True
+    )
+
+    reader.start()
+    reader.join(timeout=30)
+
+    assert not reader.is_alive()
+    assert [f.path for f in files] == ["x.py"]
+
+
+def test_cli_diff(git_repo, mock_clipboard):
+    """Test that --diff shows only the changed files as hunks."""
+    runner = click.testing.CliRunner()
+    result = runner.invoke(
+        main.cli, [str(git_repo), "--diff", "v1", "--context", "1", "--no-copy"]
+    )
+
+    assert result.exit_code == 0
+    assert (
+        "\n".join(
+            [f"{git_repo.name}/", "└── src/", "    ├── main.py", "    └── new.py"]
+        )
+        in result.output
+    )
+    assert "**File:** src/main.py" in result.output
+    assert "```diff" in result.output
+    assert "-    return 'v1'\n+    return 'dirty'" in result.output
+    assert "+NEW = True" in result.output
+    assert "README.md" not in result.output
+    assert "big.py" not in result.output
+
+
+def test_cli_diff_bad_revision(git_repo, mock_clipboard):
+    """Test that an unknown revision is reported."""
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, [str(git_repo), "--diff", "nope", "--no-copy"])
+
+    assert "Error: could not diff against 'nope'" in result.output
+
+
+def test_cli_diff_option_as_revision(git_repo, temp_dir, mock_clipboard):
+    """Test that a revision starting with a dash is not passed to git as an option."""
+    target = temp_dir / "written.patch"
+    runner = click.testing.CliRunner()
+    result = runner.invoke(
+        main.cli, [str(git_repo), f"--diff=--output={target}", "--no-copy"]
+    )
+
+    assert "Error: could not diff against '--output=" in result.output
+    assert "invalid revision" in result.output
+    assert not target.exists()
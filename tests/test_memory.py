@@ -0,0 +1,254 @@
+import subprocess
+import sys
+import textwrap
+import tracemalloc
+from pathlib import Path
+import click.testing
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_project_translator import main
+
+FILE_SIZE = 100_000
+FILE_COUNT = 200
+TOTAL_BYTES_CAP = 2_000_000
+# Interpreter, records and one file being read, independent of project size
+OVERHEAD = 4_000_000
+
+
+@pytest.fixture
+def big_project(temp_dir):
+    """Create a project of 20 MB in files just under the size limit."""
+    for i in range(FILE_COUNT):
+        sub = temp_dir / f"pkg{i % 10}"
+        sub.mkdir(exist_ok=True)
+        (sub / f"module{i}.py").write_text("x" * FILE_SIZE)
+    return temp_dir
+
+
+def test_total_size_cap_bounds_python_allocations(big_project):
+    """Test that traced memory stays below the cap plus a constant."""
+    budget = main.TraversalBudget(max_bytes=TOTAL_BYTES_CAP)
+
+    tracemalloc.start()
+    try:
+        code_files = main.get_code_files_with_content(big_project, budget=budget)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(code_files) == FILE_COUNT
+    assert budget.bytes <= TOTAL_BYTES_CAP
+    assert peak < TOTAL_BYTES_CAP + OVERHEAD
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="resource is POSIX only")
+def test_total_size_cap_bounds_peak_rss(big_project):
+    """Test that peak RSS grows by at most the cap plus a constant."""
+    script = textwrap.dedent(
+        f"""
+        import resource, sys
+        from pathlib import Path
+        from ai_project_translator import main
+
+        scale = 1 if sys.platform == "darwin" else 1024
+        before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+        budget = main.TraversalBudget(max_bytes={TOTAL_BYTES_CAP})
+        files = main.get_code_files_with_content(Path(sys.argv[1]), budget=budget)
+        after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+        print(len(files), after - before)
+        """
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script, str(big_project)],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).parent.parent,
+    )
+
+    count, growth = map(int, result.stdout.split())
+    assert count == FILE_COUNT
+    assert growth < TOTAL_BYTES_CAP + OVERHEAD
+
+
+# Projects of increasing size for the CLI runs: the same largest file, more
+# small files
+SMALL_FILE = 20_000
+LARGEST_FILE = 400_000
+PROJECT_FILES = (50, 100, 200)
+# Interpreter state of a CLI run, independent of the project
+CLI_OVERHEAD = 1_000_000
+# Path, record and tree line of a file, besides its content
+PER_FILE = 1_000
+# The largest file read, escaped or encoded and written
+FILE_COPIES = 4
+# Streamed outputs grow with the project by much less than its bytes
+MAX_GROWTH_SHARE = 0.1
+
+
+@pytest.fixture
+def make_project(temp_dir):
+    """Return a function that creates a project with the given file count."""
+
+    def make(files: int) -> tuple[Path, int]:
+        root = temp_dir / f"project{files}"
+        for i in range(files):
+            sub = root / f"pkg{i % 10}"
+            sub.mkdir(parents=True, exist_ok=True)
+            (sub / f"module{i}.py").write_text("x = 1\n" * (SMALL_FILE // 6))
+        (root / "largest.py").write_text("y = 2\n" * (LARGEST_FILE // 6))
+        total = sum(path.stat().st_size for path in root.rglob("*.py"))
+        return root, total
+
+    return make
+
+
+class PhasePeaks:
+    """Peak traced memory of each phase of a CLI run."""
+
+    def __init__(self):
+        self.phase = "setup"
+        self.peaks = {}
+
+    def start(self, phase: str) -> None:
+        _, peak = tracemalloc.get_traced_memory()
+        self.peaks[self.phase] = max(self.peaks.get(self.phase, 0), peak)
+        tracemalloc.reset_peak()
+        self.phase = phase
+
+    def wrap(self, func, phase: str):
+        def wrapper(*args, **kwargs):
+            self.start(phase)
+            yield from func(*args, **kwargs)
+            self.start("output")
+
+        return wrapper
+
+
+def profile_cli(project: Path, args: list[str], mocker) -> dict[str, int]:
+    """
+    Run cli on project under tracemalloc and return the peak of each phase:
+    setup, tree, files (the walk, and for streamed formats the output of
+    each file) and output
+    """
+    phases = PhasePeaks()
+    mocker.patch.object(
+        main,
+        "iter_directory_structure",
+        phases.wrap(main.iter_directory_structure, "tree"),
+    )
+    mocker.patch.object(
+        main, "iter_file_records", phases.wrap(main.iter_file_records, "files")
+    )
+    output_file = project.parent / f"{project.name}.out"
+    runner = click.testing.CliRunner()
+
+    tracemalloc.start()
+    try:
+        result = runner.invoke(main.cli, [str(project), "-O", str(output_file), *args])
+        phases.start("done")
+    finally:
+        tracemalloc.stop()
+        mocker.stopall()
+
+    assert result.exit_code == 0, result.output
+    assert "largest.py" in output_file.read_text()
+    return phases.peaks
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--format", "jsonl"],
+        ["--format", "xml"],
+        ["--zero-copy", "--no-copy", "--no-redact"],
+    ],
+)
+def test_streamed_output_bounded_by_largest_file(make_project, mocker, args):
+    """Test that streamed outputs hold about one file at a time."""
+    peaks = []
+    totals = []
+    for files in PROJECT_FILES:
+        project, total = make_project(files)
+        phases = profile_cli(project, args, mocker)
+
+        bound = CLI_OVERHEAD + FILE_COPIES * LARGEST_FILE + PER_FILE * files
+        assert {phase: peak for phase, peak in phases.items() if peak >= bound} == {}
+        peaks.append(max(phases.values()))
+        totals.append(total)
+
+    assert peaks[-1] - peaks[0] < MAX_GROWTH_SHARE * (totals[-1] - totals[0])
+
+
+@pytest.mark.parametrize("copy, text_copies", [(False, 1), (True, 3)])
+def test_markdown_output_bounded_by_project_bytes(
+    make_project, mocker, mock_clipboard, copy, text_copies
+):
+    """
+    Test that markdown output keeps the contents once, plus the joined text
+    for the clipboard
+
+    The joined text takes two bytes a character, for the box drawing
+    characters of the tree.
+    """
+    args = [] if copy else ["--no-copy"]
+    for files in PROJECT_FILES:
+        project, total = make_project(files)
+        phases = profile_cli(project, args, mocker)
+
+        bound = (
+            CLI_OVERHEAD
+            + text_copies * total
+            + FILE_COPIES * LARGEST_FILE
+            + PER_FILE * files
+        )
+        assert {phase: peak for phase, peak in phases.items() if peak >= bound} == {}
+        assert mock_clipboard.copy.called == copy
+
+
+@pytest.mark.skipif(
+    not Path("/proc/self/status").exists(), reason="VmHWM is Linux only"
+)
+def test_streamed_output_bounds_peak_rss(make_project):
+    """
+    Test that peak RSS of a streamed CLI run does not follow project size
+
+    ru_maxrss of a child starts at the peak of the forking process, so the
+    peak of the child's own memory is read from VmHWM.
+    """
+    script = textwrap.dedent(
+        """
+        import re, sys
+        import click.testing
+        from ai_project_translator import main
+
+        def peak_rss():
+            with open("/proc/self/status") as f:
+                return int(re.search(r"VmHWM:\\s+(\\d+) kB", f.read())[1]) * 1024
+
+        args = [sys.argv[1], "--format", "jsonl", "-O", sys.argv[2]]
+        before = peak_rss()
+        result = click.testing.CliRunner().invoke(main.cli, args)
+        print(result.exit_code, peak_rss() - before)
+        """
+    )
+    growths = []
+    totals = []
+    for files in (PROJECT_FILES[0], PROJECT_FILES[-1]):
+        project, total = make_project(files)
+        result = subprocess.run(
+            [sys.executable, "-c", script, str(project), f"{project}.out"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent.parent,
+        )
+        exit_code, growth = map(int, result.stdout.split())
+        assert exit_code == 0
+        growths.append(growth)
+        totals.append(total)
+
+    assert max(growths) < OVERHEAD + FILE_COPIES * LARGEST_FILE
+    assert growths[-1] - growths[0] < MAX_GROWTH_SHARE * (totals[-1] - totals[0])
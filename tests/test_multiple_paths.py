@@ -0,0 +1,157 @@
+import io
+import os
+import sys
+from pathlib import Path
+import click.testing
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_project_translator import main
+
+
+@pytest.fixture
+def project(temp_dir, monkeypatch):
+    """Create a project and run from its directory."""
+    (temp_dir / "api" / "routes").mkdir(parents=True)
+    (temp_dir / "web" / "src").mkdir(parents=True)
+    (temp_dir / "node_modules" / "lib").mkdir(parents=True)
+    (temp_dir / "api" / "routes" / "users.py").write_text("users = []\n")
+    (temp_dir / "api" / "routes" / "items.py").write_text("items = []\n")
+    (temp_dir / "api" / "models.py").write_text("class User: ...\n")
+    (temp_dir / "web" / "src" / "app.ts").write_text("export const app = 1;\n")
+    (temp_dir / "web" / "src" / "logo.png").write_bytes(b"\x89PNG")
+    (temp_dir / "node_modules" / "lib" / "index.ts").write_text("// vendored\n")
+    monkeypatch.chdir(temp_dir)
+    return temp_dir
+
+
+def test_expand_paths_dedupes_and_sorts(project):
+    """Test that files, directories and globs select each file once."""
+    files, unmatched = main.expand_paths(
+        ["api/routes", "api/routes/users.py", "**/*.ts", "docs/*.md"]
+    )
+
+    assert [f.relative_to(project).as_posix() for f in files] == [
+        "api/routes/items.py",
+        "api/routes/users.py",
+        "web/src/app.ts",
+    ]
+    assert unmatched == ["docs/*.md"]
+
+
+def test_expand_paths_literal_file_in_excluded_dir(project):
+    """Test that explicitly named files are kept even in excluded directories."""
+    files, _ = main.expand_paths([os.path.join("node_modules", "lib", "index.ts")])
+
+    assert files == [project / "node_modules" / "lib" / "index.ts"]
+
+
+def test_cli_multiple_paths(project, mock_clipboard, mocker):
+    """Test the shared tree and a single read per selected file."""
+    spy = mocker.spy(main, "read_file_content")
+    runner = click.testing.CliRunner()
+    result = runner.invoke(
+        main.cli,
+        ["api/models.py", "api/routes/*.py", "web/src/app.ts", "--no-copy"],
+    )
+
+    assert result.exit_code == 0
+    assert f"Path: {project.name}" in result.output
+    assert (
+        "\n".join(
+            [
+                f"{project.name}/",
+                "├── api/",
+                "│   ├── routes/",
+                "│   │   ├── items.py",
+                "│   │   └── users.py",
+                "│   └── models.py",
+                "└── web/",
+                "    └── src/",
+                "        └── app.ts",
+            ]
+        )
+        in result.output
+    )
+    assert "export const app = 1;" in result.output
+    assert "vendored" not in result.output
+    assert spy.call_count == 4
+
+
+def test_existing_path_with_wildcards(project, mock_clipboard):
+    """Test that an existing path with glob characters is taken literally."""
+    route = project / "app" / "[id]"
+    route.mkdir(parents=True)
+    (route / "page.tsx").write_text("export default function Page() {}\n")
+    (project / "app" / "i").mkdir()
+    (project / "app" / "i" / "page.tsx").write_text("// not the route\n")
+
+    files, unmatched = main.expand_paths(["app/[id]/page.tsx"])
+
+    assert files == [route / "page.tsx"]
+    assert unmatched == []
+
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, ["app/[id]/page.tsx", "--no-copy"])
+
+    assert result.exit_code == 0
+    assert "**Single File Analysis:**" in result.output
+    assert "export default function Page()" in result.output
+
+
+def test_cli_glob_without_matches(project, mock_clipboard):
+    """Test the error when nothing matches."""
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, ["docs/*.md", "missing.py"])
+
+    assert "Error: no code files matched the given paths" in result.output
+
+
+def test_read_file_list():
+    """Test newline and NUL-separated file lists."""
+    assert main.read_file_list(io.BytesIO(b"a.py\r\nb c.py\n\n")) == ["a.py", "b c.py"]
+    assert main.read_file_list(io.BytesIO(b"a.py\0b\nc.py\0"), True) == [
+        "a.py",
+        "b\nc.py",
+    ]
+
+
+def test_cli_files_from_stdin(project, mock_clipboard, mocker):
+    """Test that a listed selection is used without walking the tree."""
+    walk = mocker.spy(main.os, "scandir")
+    records = mocker.spy(main, "iter_file_records")
+    runner = click.testing.CliRunner()
+    result = runner.invoke(
+        main.cli,
+        ["--files-from", "-", "-0", "--no-copy"],
+        input=b"web/src/app.ts\0api/models.py\0web/src/logo.png\0gone.py\0",
+    )
+
+    assert result.exit_code == 0
+    assert (
+        "\n".join(
+            [
+                f"{project.name}/",
+                "├── api/",
+                "│   └── models.py",
+                "└── web/",
+                "    └── src/",
+                "        └── app.ts",
+            ]
+        )
+        in result.output
+    )
+    assert "class User: ..." in result.output
+    assert "users = []" not in result.output
+    assert "'gone.py' is not a file" in result.output
+    assert walk.call_count == 0
+    assert records.call_count == 0
+
+
+def test_cli_files_from_with_paths(project, mock_clipboard):
+    """Test that a file list and PATHS are exclusive."""
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, ["api", "--files-from", "-"], input=b"")
+
+    assert "Error: PATHS cannot be combined with --files-from" in result.output
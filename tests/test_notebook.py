@@ -0,0 +1,97 @@
+import json
+import sys
+from pathlib import Path
+import click.testing
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_project_translator import main, notebook
+
+IMAGE = "iVBORw0KGgo" * 200_000
+
+
+def make_notebook(path: Path) -> Path:
+    """Write a notebook with markdown, code, a long stream and an image."""
+    cells = [
+        {"cell_type": "markdown", "metadata": {}, "source": ["# Analysis\n", "Load"]},
+        {
+            "cell_type": "code",
+            "metadata": {},
+            "execution_count": 1,
+            "source": ["for i in range(100):\n", "    print(i)"],
+            "outputs": [
+                {
+                    "output_type": "stream",
+                    "name": "stdout",
+                    "text": [f"{i}\n" for i in range(100)],
+                },
+                {
+                    "output_type": "display_data",
+                    "metadata": {},
+                    "data": {"image/png": IMAGE},
+                },
+            ],
+        },
+        {"cell_type": "raw", "metadata": {}, "source": "raw text"},
+    ]
+    path.write_text(
+        json.dumps(
+            {
+                "cells": cells,
+                "metadata": {"kernelspec": {"language": "python", "name": "python3"}},
+                "nbformat": 4,
+                "nbformat_minor": 5,
+            }
+        )
+    )
+    return path
+
+
+def test_render_notebook_drops_outputs(temp_dir):
+    """Test that only markdown and code cells are kept by default."""
+    data = make_notebook(temp_dir / "analysis.ipynb").read_bytes()
+
+    content, error = notebook.read_notebook(data, max_size=1000)
+
+    assert error is None
+    assert content == (
+        "# Analysis\nLoad\n\n```python\nfor i in range(100):\n    print(i)\n```\n"
+    )
+
+
+def test_render_notebook_truncates_outputs(temp_dir):
+    """Test that outputs are truncated and non-text outputs only named."""
+    data = make_notebook(temp_dir / "analysis.ipynb").read_bytes()
+
+    content, _ = notebook.read_notebook(data, max_size=1000, output_lines=2)
+
+    assert "Output:\n```text\n0\n1\n... (98 more lines)\n```" in content
+    assert "[image/png output]" in content
+    assert IMAGE not in content
+
+
+def test_read_invalid_notebook():
+    """Test that a notebook that is not JSON is reported."""
+    content, error = notebook.read_notebook(b"{not json", max_size=1000)
+
+    assert content is None
+    assert error.startswith("Error reading notebook")
+
+
+def test_cli_large_notebook(temp_dir, mock_clipboard):
+    """Test that a notebook over the size limit is sent as its cells."""
+    make_notebook(temp_dir / "analysis.ipynb")
+    runner = click.testing.CliRunner()
+
+    result = runner.invoke(main.cli, [str(temp_dir), "--max-size", "10000"])
+
+    assert result.exit_code == 0
+    assert "````markdown\n# Analysis" in result.output
+    assert "```python\nfor i in range(100):" in result.output
+    assert "iVBORw0KGgo" not in result.output
+
+    result = runner.invoke(
+        main.cli, [str(temp_dir), "--notebook-outputs", "3", "--no-copy"]
+    )
+
+    assert "... (97 more lines)" in result.output
@@ -0,0 +1,156 @@
+import os
+import sys
+from pathlib import Path
+import click.testing
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_project_translator import main, project_config
+
+
+@pytest.fixture(autouse=True)
+def isolated_config(temp_dir, monkeypatch):
+    """Keep the cache out of the home directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(temp_dir / "cache"))
+
+
+@pytest.fixture
+def configured_project(temp_dir):
+    """Create a project with settings in pyproject.toml and .ai-pt.toml."""
+    project = temp_dir / "project"
+    (project / "src" / "pkg").mkdir(parents=True)
+    (project / "pyproject.toml").write_text(
+        '[project]\nname = "demo"\n\n'
+        "[tool.ai-pt]\n"
+        'exclude-dirs = [".git", "generated"]\n'
+        "max-depth = 7\n"
+        "max-size = 1000\n"
+    )
+    (project / ".ai-pt.toml").write_text("max-size = 2000\n")
+    return project
+
+
+def test_settings_from_nearest_config(configured_project):
+    """Test the upward search and the priority of .ai-pt.toml."""
+    config, files = project_config.load_project_config(
+        configured_project / "src" / "pkg", main.Config
+    )
+
+    assert files == [
+        configured_project / "pyproject.toml",
+        configured_project / ".ai-pt.toml",
+    ]
+    assert config.exclude_dirs == {".git", "generated"}
+    assert config.max_depth == 7
+    assert config.max_size == 2000
+    assert "max_depth" in config.model_fields_set
+
+
+def test_environment_overrides_files(configured_project, monkeypatch):
+    """Test that AI_PT_* variables win over the config files."""
+    monkeypatch.setenv("AI_PT_MAX_SIZE", "3000")
+
+    config, _ = project_config.load_project_config(configured_project, main.Config)
+
+    assert config.max_size == 3000
+    assert config.max_depth == 7
+
+
+def test_cached_settings_skip_parsing(configured_project, mocker):
+    """Test that an unchanged project is loaded from the cache."""
+    first, _ = project_config.load_project_config(configured_project, main.Config)
+    parse = mocker.spy(project_config.tomllib, "load")
+
+    second, files = project_config.load_project_config(configured_project, main.Config)
+
+    assert parse.call_count == 0
+    assert second == first
+    assert len(files) == 2
+
+
+def test_cache_invalidated_by_changes(configured_project):
+    """Test that editing a config file is picked up."""
+    project_config.load_project_config(configured_project, main.Config)
+    local = configured_project / ".ai-pt.toml"
+    local.write_text("max-size = 4000\n")
+    stat = local.stat()
+    # Make sure the mtime differs even on coarse-grained filesystems
+    os.utime(local, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    config, _ = project_config.load_project_config(configured_project, main.Config)
+
+    assert config.max_size == 4000
+
+
+def test_invalid_settings(configured_project, mock_clipboard):
+    """Test that unknown settings are reported by the CLI."""
+    (configured_project / ".ai-pt.toml").write_text("max-sise = 1\n")
+
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, [str(configured_project), "--no-copy"])
+
+    assert result.exit_code == 0
+    assert "Error: invalid configuration" in result.output
+    assert "max_sise" in result.output
+
+
+def test_cli_uses_project_config(configured_project, mock_clipboard):
+    """Test that the CLI excludes directories from the project config."""
+    (configured_project / "generated").mkdir()
+    (configured_project / "generated" / "api.py").write_text("x = 1\n")
+    (configured_project / "src" / "pkg" / "mod.py").write_text("y = 2\n")
+
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, [str(configured_project), "--no-copy"])
+
+    assert result.exit_code == 0
+    assert "y = 2" in result.output
+    assert "api.py" not in result.output
+
+
+def test_cli_uses_project_exclude_files(configured_project, mock_clipboard):
+    """Test that files excluded by the project config are left out."""
+    (configured_project / ".ai-pt.toml").write_text('exclude-files = ["top.py"]\n')
+    (configured_project / "top.py").write_text("top = 1\n")
+    (configured_project / "other.py").write_text("other = 1\n")
+    (configured_project / "src" / "pkg" / "mod.py").write_text("mod = 1\n")
+    runner = click.testing.CliRunner()
+
+    result = runner.invoke(main.cli, [str(configured_project), "--no-copy"])
+
+    assert result.exit_code == 0
+    assert "mod = 1" in result.output
+    assert "── top.py" not in result.output
+    assert "top = 1" not in result.output
+
+    result = runner.invoke(
+        main.cli,
+        [str(configured_project), "--no-copy", "--exclude-files", "other.py"],
+    )
+
+    assert result.exit_code == 0
+    assert "mod = 1" in result.output
+    assert "── top.py" not in result.output
+    assert "top = 1" not in result.output
+    assert "other = 1" not in result.output
+
+    result = runner.invoke(main.cli, [str(configured_project), "--show-config"])
+
+    assert "Exclude files: top.py" in result.output
+
+
+def test_cli_leaves_global_config(configured_project, mock_clipboard):
+    """Test that the project settings only apply during the CLI run."""
+    (configured_project / ".ai-pt.toml").write_text("max-size = 5\n")
+    runner = click.testing.CliRunner()
+
+    result = runner.invoke(
+        main.cli, [str(configured_project), "--no-copy", "--notebook-outputs", "3"]
+    )
+
+    assert result.exit_code == 0
+    assert "[tool.ai-pt]" not in result.output
+    assert main.config.max_size == 600000
+    assert main.config.notebook_outputs == 0
+    assert main.read_file_content(configured_project / "pyproject.toml")[1] is None
@@ -0,0 +1,124 @@
+import sys
+from pathlib import Path
+import click.testing
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_project_translator import main
+from ai_project_translator.records import FileRecord
+from ai_project_translator.transforms import run_transforms
+
+
+def test_records_read_content_on_access(sample_project_structure, mocker):
+    """Test that a walk only stats files and reads them when accessed."""
+    spy = mocker.spy(main, "read_file_content")
+    records = list(main.iter_file_records(sample_project_structure))
+
+    assert spy.call_count == 0
+    record = next(r for r in records if r.path == str(Path("src", "main.py")))
+    assert record.size == len("def hello():\n    return 'world'\n")
+    assert record.mtime > 0
+    assert record["content"] == "def hello():\n    return 'world'\n"
+    assert record["content"] == "def hello():\n    return 'world'\n"
+    assert spy.call_count == 1
+
+    record.release()
+    assert not record.loaded
+
+
+def test_record_to_dict_matches_file_info(sample_project_structure):
+    """Test that records convert to the usual file info dicts."""
+    record = next(
+        r
+        for r in main.iter_file_records(sample_project_structure)
+        if r.path == "README.md"
+    )
+    info = record.to_dict()
+
+    assert set(info) == {"path", "full_path", "language", "content", "error", "size"}
+    assert info["full_path"] == sample_project_structure / "README.md"
+    assert info["language"] == "markdown"
+    assert info["error"] is None
+
+
+def test_records_have_no_instance_dict():
+    """Test that records use slots instead of a per-instance dict."""
+    record = FileRecord("/", "a.py", "python", 0, 0.0, lambda path: ("", None))
+    assert not hasattr(record, "__dict__")
+
+
+def test_records_accept_transform_results(temp_dir):
+    """Test that transforms can add keys to records."""
+    (temp_dir / "a.py").write_text("x = 1  # one\n")
+    records = list(main.iter_file_records(temp_dir))
+    run_transforms(records, ["strip-comments", "hash"], workers=1)
+
+    assert records[0]["content"] == "x = 1\n"
+    assert len(records[0]["sha256"]) == 64
+    assert "sha256" in records[0].to_dict()
+
+
+def test_size_limit_error_set_without_reading(temp_dir, mocker):
+    """Test that records past the byte budget are never read."""
+    (temp_dir / "a.py").write_text("a" * 10)
+    (temp_dir / "b.py").write_text("b" * 10)
+    spy = mocker.spy(main, "read_file_content")
+    budget = main.TraversalBudget(max_bytes=15)
+    records = list(main.iter_file_records(temp_dir, budget=budget))
+
+    assert records[1]["error"] == main.TOTAL_SIZE_LIMIT_ERROR
+    assert records[1]["content"] is None
+    assert spy.call_count == 0
+
+
+def test_records_in_path_order(temp_dir, mocker):
+    """Test that records come out sorted, each one as soon as it is reached."""
+    for name in ["b.py", "a.py", "a-b.py", "a0.py", "a/z.py", "a/b/c.py", "c/d.py"]:
+        (temp_dir / name).parent.mkdir(parents=True, exist_ok=True)
+        (temp_dir / name).write_text("x = 1\n")
+    scandir = mocker.spy(main.os, "scandir")
+
+    records = main.iter_file_records(temp_dir)
+    first = next(records)
+
+    assert first.path == "a-b.py"
+    # Only the directories before the first file have been listed
+    assert scandir.call_count == 1
+    paths = [first.path] + [record.path for record in records]
+    assert paths == sorted(paths)
+    assert paths == [
+        "a-b.py",
+        "a.py",
+        str(Path("a", "b", "c.py")),
+        str(Path("a", "z.py")),
+        "a0.py",
+        "b.py",
+        str(Path("c", "d.py")),
+    ]
+
+
+def test_cli_reads_records_as_they_are_formatted(sample_project_structure, mocker):
+    """Test that each record is read right before it is formatted."""
+    events = []
+    read = main.read_file_content
+    format_lines = main.format_file_lines
+    mocker.patch.object(
+        main,
+        "read_file_content",
+        lambda path, *args, **kwargs: (
+            events.append("read") or read(path, *args, **kwargs)
+        ),
+    )
+    mocker.patch.object(
+        main,
+        "format_file_lines",
+        lambda info, *args: events.append("format") or format_lines(info, *args),
+    )
+
+    result = click.testing.CliRunner().invoke(
+        main.cli, [str(sample_project_structure), "--no-copy", "--no-git"]
+    )
+
+    assert result.exit_code == 0
+    assert events == ["read", "format"] * (len(events) // 2)
+    assert len(events) > 2
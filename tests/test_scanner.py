@@ -0,0 +1,90 @@
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import click.testing
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_project_translator import ProjectScanner, main
+
+
+def test_scanner_uses_its_own_config(sample_project_structure):
+    """Test that a scanner's settings do not leak into the global config."""
+    scanner = ProjectScanner(sample_project_structure, main.Config(max_size=10))
+
+    files = {info["path"]: info for info in scanner.iter_files()}
+
+    assert "too large" in files["README.md"]["error"]
+    assert main.config.max_size == 600000
+    assert main.read_file_content(sample_project_structure / "README.md")[1] is None
+
+
+def test_scanners_in_threads(sample_project_structure):
+    """Test that scanners with different settings can run at the same time."""
+
+    def scan(extensions: set[str]) -> list[str]:
+        scanner = ProjectScanner(
+            sample_project_structure, main.Config(extensions=extensions)
+        )
+        return [info["path"] for info in scanner.iter_files()]
+
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(scan, [{".py"}, {".md"}] * 4))
+
+    assert all(path.endswith(".py") for path in results[0])
+    assert results[1] == ["README.md"]
+    assert results == results[:2] * 4
+
+
+def test_scanner_reuses_contents(sample_project_structure, mocker):
+    """Test that a second scan only reads the files that changed."""
+    scanner = ProjectScanner(sample_project_structure, main.Config())
+    list(scanner.iter_files())
+    read = mocker.spy(main, "read_file_content")
+
+    list(scanner.iter_files())
+    assert read.call_count == 0
+
+    path = sample_project_structure / "src" / "main.py"
+    path.write_text("def hello():\n    return 'changed'\n")
+    os.utime(path, ns=(0, 10**9))
+    files = {info["path"]: info for info in scanner.iter_files()}
+
+    assert read.call_count == 1
+    assert "changed" in files[str(Path("src", "main.py"))]["content"]
+
+
+def test_render_matches_cli(sample_project_structure, mock_clipboard):
+    """Test that render writes what the CLI prints."""
+    runner = click.testing.CliRunner()
+    for output_format in ["markdown", "jsonl"]:
+        sink = io.StringIO()
+        ProjectScanner(sample_project_structure).render(sink, output_format)
+
+        result = runner.invoke(
+            main.cli, [str(sample_project_structure), "--format", output_format]
+        )
+
+        assert sink.getvalue() == result.output.replace(
+            "✅ Output copied to clipboard!\n", ""
+        )
+
+
+def test_render_with_limits_matches_cli(temp_dir, mock_clipboard):
+    """Test that render applies the depth and file limits like the CLI."""
+    (temp_dir / "a" / "b").mkdir(parents=True)
+    (temp_dir / "a" / "b" / "c.py").write_text("c = 1\n")
+    (temp_dir / "a" / "x.py").write_text("x = 1\n")
+    (temp_dir / "z.py").write_text("z = 1\n")
+    (temp_dir / ".ai-pt.toml").write_text("max-depth = 1\nmax-files = 2\n")
+    sink = io.StringIO()
+    ProjectScanner(temp_dir).render(sink)
+
+    result = click.testing.CliRunner().invoke(main.cli, [str(temp_dir)])
+
+    assert "reached at z.py" in sink.getvalue()
+    assert sink.getvalue() == result.output.replace(
+        "✅ Output copied to clipboard!\n", ""
+    )
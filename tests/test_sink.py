@@ -0,0 +1,111 @@
+import io
+import sys
+from pathlib import Path
+import click.testing
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_project_translator import main, sink
+
+
+def test_join_lines_matches_text_join(temp_dir):
+    """Test that joined parts produce the same bytes as a text join."""
+    body_path = temp_dir / "body.py"
+    body_path.write_text("print('héllo')\n")
+    body = sink.FileBody(body_path, body_path.stat().st_size)
+
+    parts = sink.join_lines(["```python", body, "```", ""])
+
+    assert parts[1] is body
+    out = io.BytesIO()
+    sink.write_parts(out, parts)
+    expected = "\n".join(["```python", body_path.read_text(), "```", ""])
+    assert out.getvalue() == expected.encode("utf-8")
+
+
+def test_write_parts_to_real_file(temp_dir):
+    """Test writing to a file descriptor with writev and sendfile."""
+    bodies = []
+    for i in range(3):
+        path = temp_dir / f"f{i}.txt"
+        path.write_bytes(bytes([65 + i]) * (sink.COPY_CHUNK_SIZE + 10))
+        bodies.append(sink.FileBody(path, path.stat().st_size))
+
+    target = temp_dir / "out.bin"
+    with open(target, "wb") as f:
+        sink.write_parts(f, [b"head\n", bodies[0], b"\n", bodies[1], bodies[2], b"!"])
+
+    data = target.read_bytes()
+    assert data.startswith(b"head\nAAA")
+    assert data.endswith(b"CCC!")
+    assert len(data) == 5 + 3 * (sink.COPY_CHUNK_SIZE + 10) + 2
+
+
+def test_read_file_body(temp_dir, large_file):
+    """Test that read_file_body applies max_size without reading."""
+    small = temp_dir / "small.py"
+    small.write_text("x = 1\n")
+
+    body, error = main.read_file_body(small)
+    assert error is None
+    assert body.size == 6
+    assert body.text() == "x = 1\n"
+
+    body, error = main.read_file_body(large_file, max_size=5000)
+    assert body is None
+    assert "too large" in error
+
+
+@pytest.mark.parametrize("redact", ["--redact", "--no-redact"])
+def test_cli_zero_copy_matches_text_output(sample_project_structure, tmp_path, redact):
+    """Test that --zero-copy writes exactly the same output as the text path."""
+    text_file = tmp_path / "text.md"
+    bytes_file = tmp_path / "bytes.md"
+    (sample_project_structure / "src" / "unicode.py").write_text("s = 'ñandú'\n")
+    (sample_project_structure / "docs" / "guide.md").write_text(
+        "# Guide\n\n```bash\nai-pt .\n```\n"
+    )
+
+    runner = click.testing.CliRunner()
+    base = [str(sample_project_structure), "--no-copy", "-q", "Why?", redact]
+    result = runner.invoke(main.cli, [*base, "-O", str(text_file)])
+    assert result.exit_code == 0
+    result = runner.invoke(main.cli, [*base, "--zero-copy", "-O", str(bytes_file)])
+    assert result.exit_code == 0
+
+    assert bytes_file.read_bytes() == text_file.read_bytes()
+    assert "ñandú" in bytes_file.read_text(encoding="utf-8")
+    assert "````markdown\n# Guide" in bytes_file.read_text(encoding="utf-8")
+
+
+def test_code_fence_of_file_body(temp_dir, mocker):
+    """Test that runs of backticks are found across the chunks of a body."""
+    mocker.patch.object(main, "COPY_CHUNK_SIZE", 4)
+    path = temp_dir / "notes.md"
+    path.write_bytes(b"ab``" + b"``" + b"`x``")
+
+    assert main.code_fence(sink.FileBody(path, 10)) == "``````"
+    assert main.code_fence(path.read_bytes()) == "``````"
+    assert main.code_fence("no fences") == "```"
+
+
+def test_cli_zero_copy_stdout(sample_project_structure, mock_clipboard):
+    """Test --zero-copy printing to stdout and skipping the clipboard."""
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, [str(sample_project_structure), "--zero-copy"])
+
+    assert result.exit_code == 0
+    assert "def hello():" in result.output
+    mock_clipboard.copy.assert_not_called()
+
+
+def test_cli_zero_copy_with_transform(sample_project_structure, mock_clipboard):
+    """Test that transforms still get decoded text in --zero-copy mode."""
+    runner = click.testing.CliRunner()
+    result = runner.invoke(
+        main.cli, [str(sample_project_structure), "--zero-copy", "-t", "hash"]
+    )
+
+    assert result.exit_code == 0
+    assert "**SHA-256:**" in result.output
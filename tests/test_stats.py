@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+import click.testing
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_project_translator import main, stats
+
+
+def test_count_file_across_chunks(temp_dir):
+    """Test that line counts do not depend on the chunk size."""
+    path = temp_dir / "a.py"
+    path.write_text("x = 1\n" * 100 + "y = 2")
+
+    assert stats.count_file(path, chunk_size=7)[0] == 101
+    assert stats.count_file(path)[0] == 101
+
+
+def test_count_file_empty(temp_dir):
+    """Test that an empty file has no lines."""
+    path = temp_dir / "empty.py"
+    path.write_text("")
+
+    assert stats.count_file(path) == (0, 0)
+
+
+def test_project_stats_keeps_largest_files():
+    """Test the totals per language and the bounded largest files list."""
+    report = stats.ProjectStats(largest=2)
+    report.add("a.py", "python", 10, 1, 3)
+    report.add("b.py", "python", 30, 2, 5)
+    report.add("c.js", "javascript", 20, 4, 8)
+
+    assert report.languages["python"] == {
+        "files": 2,
+        "bytes": 40,
+        "lines": 3,
+        "tokens": 8,
+    }
+    assert report.largest_files() == [(30, "b.py"), (20, "c.js")]
+
+
+def test_cli_stats(sample_project_structure, mock_clipboard):
+    """Test the --stats report for a project."""
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, [str(sample_project_structure), "--stats"])
+
+    assert result.exit_code == 0
+    assert "**Project Statistics:**" in result.output
+    assert "| python | 4 | 74 | 6 | 18 |" in result.output
+    assert "def hello" not in result.output
+    assert "2. README.md (39 bytes)" in result.output
+
+
+def test_cli_stat_only_does_not_read(sample_project_structure, mocker, mock_clipboard):
+    """Test that --stat-only never opens the files."""
+    count = mocker.patch.object(main, "count_file")
+    read = mocker.spy(main, "read_file_content")
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, [str(sample_project_structure), "--stat-only"])
+
+    assert result.exit_code == 0
+    assert "| python | 4 | 74 | - | ~18 |" in result.output
+    count.assert_not_called()
+    assert read.call_count == 0
@@ -0,0 +1,132 @@
+import asyncio
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+import click.testing
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_project_translator import ProjectScanner, main
+
+
+@pytest.fixture
+def project_with_data(temp_dir):
+    """Create a project with a small src directory and a large data directory."""
+    (temp_dir / "src").mkdir()
+    (temp_dir / "src" / "main.py").write_text("print('main')\n")
+    data = temp_dir / "data"
+    data.mkdir()
+    for i in range(30):
+        (data / f"row{i:02}.json").write_text("{}")
+    for i in range(5):
+        (data / f"raw{i}.csv").write_text("a,b\n")
+    (data / "nested").mkdir()
+    (data / "nested" / "deep.py").write_text("x = 1\n")
+    return temp_dir
+
+
+def test_large_directory_is_summarized(project_with_data):
+    """Test that the tree shows the first names and a summary line."""
+    structure = main.get_directory_structure(project_with_data, summarize_dirs=10)
+
+    assert structure[:7] == [
+        f"{project_with_data.name}/",
+        "├── data/",
+        "│   ├── nested/",
+        "│   ├── raw0.csv",
+        "│   ├── raw1.csv",
+        "│   ├── raw2.csv",
+        "│   ├── raw3.csv",
+    ]
+    assert structure[7] == (
+        "│   └── ... 31 more entries (35 files, 1 directories, 80 bytes; "
+        ".json 30, .csv 5)"
+    )
+    assert "deep.py" not in "\n".join(structure)
+    assert structure[-2:] == ["└── src/", "    └── main.py"]
+
+
+def test_summarized_directory_files_are_not_read(project_with_data):
+    """Test that the file walk skips summarized directories and reports them."""
+    budget = main.TraversalBudget()
+    files = main.get_code_files_with_content(
+        project_with_data, summarize_dirs=10, budget=budget
+    )
+
+    assert [f["path"] for f in files] == [str(Path("src", "main.py"))]
+    assert budget.summarized_dirs == ["data"]
+    assert "1 large directories were summarized" in budget.report()[0]
+
+
+@pytest.mark.parametrize("use_git", [False, True])
+def test_async_skips_summarized_directories(project_with_data, use_git):
+    """Test that --async leaves out the files of summarized directories too."""
+    tracked = None
+    if use_git:
+        if shutil.which("git") is None:
+            pytest.skip("git not found")
+        subprocess.run(["git", "init", "-q"], cwd=project_with_data, check=True)
+        tracked = main.list_tracked_files(project_with_data)
+    sync_budget = main.TraversalBudget()
+    async_budget = main.TraversalBudget()
+
+    sync_files = main.get_code_files_with_content(
+        project_with_data, summarize_dirs=10, budget=sync_budget, tracked=tracked
+    )
+    async_files = asyncio.run(
+        main.aget_code_files_with_content(
+            project_with_data, summarize_dirs=10, budget=async_budget, tracked=tracked
+        )
+    )
+
+    assert [f["path"] for f in async_files] == [f["path"] for f in sync_files]
+    assert async_budget.summarized_dirs == sync_budget.summarized_dirs == ["data"]
+
+
+def test_summarize_disabled(project_with_data):
+    """Test that 0 lists and reads every directory."""
+    structure = main.get_directory_structure(project_with_data, summarize_dirs=0)
+    files = main.get_code_files_with_content(project_with_data, summarize_dirs=0)
+
+    assert "│   └── row29.json" in structure
+    assert str(Path("data", "nested", "deep.py")) in [f["path"] for f in files]
+
+
+def test_library_does_not_summarize_by_default(project_with_data, monkeypatch):
+    """Test that the setting only applies to the CLI and scanners."""
+    monkeypatch.setenv("AI_PT_SUMMARIZE_DIRS", "10")
+    settings = main.Config()
+    deep = str(Path("data", "nested", "deep.py"))
+
+    files = main.config_context(settings).run(
+        main.get_code_files_with_content, project_with_data
+    )
+
+    assert deep in [f["path"] for f in files]
+
+    scanner = ProjectScanner(project_with_data, config=settings)
+
+    assert deep not in [f["path"] for f in scanner.iter_files()]
+
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, [str(project_with_data), "--no-copy"])
+
+    assert "... 31 more entries" in result.output
+    assert "x = 1" not in result.output
+
+
+@pytest.mark.parametrize("options", [[], ["--async"]])
+def test_cli_summarize_dirs(project_with_data, mock_clipboard, options):
+    """Test the --summarize-dirs option."""
+    runner = click.testing.CliRunner()
+    result = runner.invoke(
+        main.cli,
+        [str(project_with_data), "--no-copy", "--summarize-dirs", "10", *options],
+    )
+
+    assert result.exit_code == 0
+    assert "... 31 more entries" in result.output
+    assert "x = 1" not in result.output
+    assert "were summarized and their files not read: data" in result.output
@@ -0,0 +1,114 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+import click.testing
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_project_translator import main
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="symlinks need privileges on Windows"
+)
+
+
+@pytest.fixture
+def linked_project(temp_dir):
+    """Create a project with a symlink loop, a linked directory and a hardlink."""
+    (temp_dir / "src").mkdir()
+    (temp_dir / "src" / "main.py").write_text("print('main')\n")
+    (temp_dir / "src" / "loop").symlink_to(temp_dir, target_is_directory=True)
+    (temp_dir / "src_link").symlink_to(temp_dir / "src", target_is_directory=True)
+    os.link(temp_dir / "src" / "main.py", temp_dir / "hard.py")
+    return temp_dir
+
+
+def test_structure_does_not_follow_symlinks_by_default(linked_project):
+    """Test that symlinked directories are listed but not descended into."""
+    structure = main.get_directory_structure(linked_project, max_depth=10)
+
+    assert "│   ├── loop/ (symlink, not followed)" in structure
+    assert "├── src_link/ (symlink, not followed)" in structure
+    assert len([line for line in structure if "main.py" in line]) == 1
+
+
+def test_structure_follows_each_directory_once(linked_project):
+    """Test that followed links to listed directories are not expanded."""
+    structure = main.get_directory_structure(
+        linked_project, max_depth=10, follow_symlinks=True
+    )
+
+    assert "│   ├── loop/ (same directory as ./)" in structure
+    assert "├── src_link/ (same directory as src/)" in structure
+    assert len([line for line in structure if "main.py" in line]) == 1
+
+
+def test_files_are_read_once_per_inode(linked_project, mocker):
+    """Test that hardlinked copies are reported without being read again."""
+    spy = mocker.spy(main, "read_file_content")
+    files = {
+        f["path"]: f
+        for f in main.get_code_files_with_content(linked_project, follow_symlinks=True)
+    }
+
+    assert set(files) == {"hard.py", str(Path("src", "main.py"))}
+    assert files["hard.py"]["content"] == "print('main')\n"
+    assert files[str(Path("src", "main.py"))]["error"] == (
+        main.SAME_FILE_ERROR.format("hard.py")
+    )
+    assert spy.call_count == 1
+
+
+def test_file_symlinks_are_deduplicated(temp_dir):
+    """Test that a symlink to a file in the project is not read twice."""
+    (temp_dir / "a.py").write_text("a = 1\n")
+    (temp_dir / "b.py").symlink_to(temp_dir / "a.py")
+
+    files = main.get_code_files_with_content(temp_dir)
+
+    assert files[0]["content"] == "a = 1\n"
+    assert files[1]["error"] == main.SAME_FILE_ERROR.format("a.py")
+
+
+def test_async_files_are_read_once_per_inode(temp_dir, mock_clipboard):
+    """Test that --async reports hardlinks and file symlinks like the sync walk."""
+    (temp_dir / "src").mkdir()
+    (temp_dir / "src" / "hard.py").write_text("print('hard')\n")
+    os.link(temp_dir / "src" / "hard.py", temp_dir / "src" / "copy.py")
+    (temp_dir / "src" / "link.py").symlink_to(temp_dir / "src" / "hard.py")
+    for i in range(20):
+        (temp_dir / "src" / f"mod{i}.py").write_text(f"x = {i}\n")
+
+    sync_files = main.get_code_files_with_content(temp_dir)
+    async_files = asyncio.run(
+        main.aget_code_files_with_content(
+            temp_dir, meta_concurrency=8, read_concurrency=8
+        )
+    )
+
+    assert [(f["path"], f["error"]) for f in async_files] == [
+        (f["path"], f["error"]) for f in sync_files
+    ]
+    assert async_files[0]["content"] == "print('hard')\n"
+    assert async_files[1]["error"] == main.SAME_FILE_ERROR.format("src/copy.py")
+
+    runner = click.testing.CliRunner()
+    result = runner.invoke(main.cli, [str(temp_dir), "--no-copy", "--async"])
+
+    assert result.output.count("print('hard')") == 1
+    assert "Same file as src/copy.py" in result.output
+
+
+def test_cli_follow_symlinks(linked_project, mock_clipboard):
+    """Test that the tree and the files agree with --follow-symlinks."""
+    runner = click.testing.CliRunner()
+    result = runner.invoke(
+        main.cli, [str(linked_project), "--no-copy", "--follow-symlinks"]
+    )
+
+    assert result.exit_code == 0
+    assert "src_link/ (same directory as src/)" in result.output
+    assert result.output.count("print('main')") == 1
+    assert "Same file as hard.py" in result.output
@@ -0,0 +1,108 @@
+import hashlib
+import sys
+from pathlib import Path
+import click.testing
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_project_translator import main, transforms
+
+
+PYTHON_SOURCE = '''# module comment
+import os  # trailing comment
+
+
+class Greeter(object):
+    """Say hello."""
+
+    def greet(self, name: str) -> str:
+        return "# not a comment " + name
+'''
+
+
+def test_strip_comments_python_keeps_strings():
+    """Test that Python comments are removed but string literals are kept."""
+    result = transforms.strip_comments(PYTHON_SOURCE, "python")["content"]
+
+    assert "module comment" not in result
+    assert "trailing comment" not in result
+    assert "import os\n" in result
+    assert '"# not a comment "' in result
+
+
+def test_strip_comments_c_style():
+    """Test removing line and block comments from C-like languages."""
+    source = 'const url = "http://example.com"; // note\n/* block */ run();\n'
+    result = transforms.strip_comments(source, "javascript")["content"]
+
+    assert "note" not in result
+    assert "block" not in result
+    assert '"http://example.com"' in result
+    assert "run();" in result
+
+
+def test_strip_comments_unknown_language():
+    """Test that unknown languages are left untouched."""
+    assert transforms.strip_comments("# heading", "text") == {}
+
+
+def test_outline_python():
+    """Test outlining classes and functions with their docstrings."""
+    result = transforms.outline(PYTHON_SOURCE, "python")["content"]
+
+    assert "class Greeter(object):" in result
+    assert '"""Say hello."""' in result
+    assert "def greet(self, name: str) -> str:" in result
+    assert "import os" not in result
+
+
+def test_outline_invalid_python():
+    """Test that unparsable code is not outlined."""
+    assert transforms.outline("def broken(:", "python") == {}
+
+
+def test_make_batches_by_bytes():
+    """Test that batches are split by total size and keep order."""
+    batches = transforms.make_batches([5, 5, 5, 20, 1], batch_bytes=10)
+
+    assert [list(b) for b in batches] == [[0, 1], [2], [3], [4]]
+
+
+def test_run_transforms_in_process_pool(monkeypatch):
+    """Test running transforms in worker processes keeps results in order."""
+    monkeypatch.setattr(transforms, "MIN_PARALLEL_BYTES", 0)
+    file_infos = [
+        {"path": f"f{i}.py", "language": "python", "content": f"x = {i}\n"}
+        for i in range(20)
+    ]
+    file_infos.append({"path": "big.py", "language": "python", "content": None})
+
+    transforms.run_transforms(file_infos, ["hash", "tokens"], workers=2, batch_bytes=16)
+
+    for i, info in enumerate(file_infos[:20]):
+        expected = hashlib.sha256(f"x = {i}\n".encode()).hexdigest()
+        assert info["sha256"] == expected
+        assert info["tokens"] > 0
+    assert "sha256" not in file_infos[-1]
+
+
+def test_run_transforms_unknown_name():
+    """Test that unknown transform names are rejected."""
+    with pytest.raises(ValueError, match="nope"):
+        transforms.run_transforms([], ["nope"])
+
+
+def test_cli_with_transforms(temp_dir, mock_clipboard):
+    """Test CLI applying transforms to the files."""
+    (temp_dir / "app.py").write_text(PYTHON_SOURCE)
+
+    runner = click.testing.CliRunner()
+    result = runner.invoke(
+        main.cli,
+        [str(temp_dir), "--transform", "strip-comments", "-t", "hash", "-j", "1"],
+    )
+
+    assert result.exit_code == 0
+    assert "trailing comment" not in result.output
+    assert "**SHA-256:**" in result.output